@@ -11,7 +11,9 @@ DEFAULT = {
     'maven_timeout': 3600,
     'output': 'hunor-output',
     'coverage_threshold': 1.0,
-    'suites_number': 1
+    'suites_number': 1,
+    'jobs': 1,
+    'suite_cache_quota': 2048
 }
 
 
@@ -25,7 +27,13 @@ class Options:
                  coverage_threshold=DEFAULT['coverage_threshold'],
                  no_compile=False, suites_evosuite=DEFAULT['suites_number'],
                  suites_randoop=DEFAULT['suites_number'],
-                 is_enable_reduce=False, is_enable_new_mutations=False):
+                 is_enable_reduce=False, is_enable_new_mutations=False,
+                 is_enable_junit_worker=False, jobs=DEFAULT['jobs'],
+                 suite_cache=None,
+                 suite_cache_quota=DEFAULT['suite_cache_quota'],
+                 is_test_selection_disabled=False,
+                 is_enable_maven_daemon=False, is_maven_offline=False,
+                 is_enable_incremental_build=False, is_enable_schemata=False):
 
         if maven_home:
             self.maven_home = os.path.abspath(maven_home)
@@ -54,6 +62,16 @@ class Options:
         self.is_minimal_testsuite_disabled = is_minimal_testsuite_disabled
         self.is_enable_reduce = is_enable_reduce
         self.is_enable_new_mutations = is_enable_new_mutations
+        self.is_enable_junit_worker = is_enable_junit_worker
+        self.jobs = jobs
+        self.suite_cache = (os.path.abspath(suite_cache) if suite_cache
+                            else None)
+        self.suite_cache_quota = suite_cache_quota
+        self.is_test_selection_disabled = is_test_selection_disabled
+        self.is_enable_maven_daemon = is_enable_maven_daemon
+        self.is_maven_offline = is_maven_offline
+        self.is_enable_incremental_build = is_enable_incremental_build
+        self.is_enable_schemata = is_enable_schemata
 
     def __str__(self):
         return json.dumps({
@@ -75,7 +93,17 @@ class Options:
                 'is_minimal_testsuite_disabled':
                 self.is_minimal_testsuite_disabled,
                 'is_enable_reduce': self.is_enable_reduce,
-                'is_enable_new_mutations': self.is_enable_new_mutations
+                'is_enable_new_mutations': self.is_enable_new_mutations,
+                'is_enable_junit_worker': self.is_enable_junit_worker,
+                'jobs': self.jobs,
+                'suite_cache': self.suite_cache,
+                'suite_cache_quota': self.suite_cache_quota,
+                'is_test_selection_disabled': self.is_test_selection_disabled,
+                'is_enable_maven_daemon': self.is_enable_maven_daemon,
+                'is_maven_offline': self.is_maven_offline,
+                'is_enable_incremental_build':
+                self.is_enable_incremental_build,
+                'is_enable_schemata': self.is_enable_schemata
         }, indent=2)
 
 
@@ -125,8 +153,16 @@ def _to_options(parser):
         suites_randoop=int(o.suites_randoop),
         is_minimal_testsuite_disabled=o.is_minimal_testsuite_disabled,
         is_enable_reduce=o.is_enable_reduce,
-        is_enable_new_mutations=o.is_enable_new_mutations
-
+        is_enable_new_mutations=o.is_enable_new_mutations,
+        is_enable_junit_worker=o.is_enable_junit_worker,
+        jobs=int(o.jobs),
+        suite_cache=o.suite_cache,
+        suite_cache_quota=int(o.suite_cache_quota),
+        is_test_selection_disabled=o.is_test_selection_disabled,
+        is_enable_maven_daemon=o.is_enable_maven_daemon,
+        is_maven_offline=o.is_maven_offline,
+        is_enable_incremental_build=o.is_enable_incremental_build,
+        is_enable_schemata=o.is_enable_schemata
     )
 
 
@@ -238,4 +274,42 @@ def _default_arg_parser():
                         action='store_true',
                         dest='is_enable_new_mutations')
 
+    parser.add_argument('--enable-junit-worker',
+                        action='store_true',
+                        dest='is_enable_junit_worker')
+
+    parser.add_argument('--jobs',
+                        action='store',
+                        dest='jobs',
+                        default=DEFAULT['jobs'])
+
+    parser.add_argument('--suite-cache',
+                        action='store',
+                        dest='suite_cache')
+
+    parser.add_argument('--suite-cache-quota',
+                        action='store',
+                        dest='suite_cache_quota',
+                        default=DEFAULT['suite_cache_quota'])
+
+    parser.add_argument('--disable-test-selection',
+                        action='store_true',
+                        dest='is_test_selection_disabled')
+
+    parser.add_argument('--enable-maven-daemon',
+                        action='store_true',
+                        dest='is_enable_maven_daemon')
+
+    parser.add_argument('--maven-offline',
+                        action='store_true',
+                        dest='is_maven_offline')
+
+    parser.add_argument('--enable-incremental-build',
+                        action='store_true',
+                        dest='is_enable_incremental_build')
+
+    parser.add_argument('--enable-schemata',
+                        action='store_true',
+                        dest='is_enable_schemata')
+
     return parser
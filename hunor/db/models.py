@@ -1,4 +1,5 @@
 from peewee import *
+from peewee import SelectBase
 from playhouse.sqlite_ext import JSONField
 
 from hunor.mutation.mutant import Mutant as HunorMutant
@@ -10,6 +11,16 @@ from hunor.utils import write_json
 
 database_proxy = Proxy()
 
+HYDRATE_BATCH_SIZE = 100
+
+DEFAULT_PRAGMAS = {
+    'cache_size': -64 * 1024,
+    'temp_store': 'memory'
+}
+
+# Opt-in, WAL leaves -wal and -shm files next to the database.
+WAL_PRAGMAS = dict(DEFAULT_PRAGMAS, journal_mode='wal', synchronous='normal')
+
 
 class BaseModel(Model):
     class Meta:
@@ -18,8 +29,10 @@ class BaseModel(Model):
 
 class Database:
 
-    def __init__(self, database_dir):
-        self.db = SqliteDatabase(database_dir)
+    def __init__(self, database_dir, pragmas=None):
+        self.db = SqliteDatabase(
+            database_dir,
+            pragmas=DEFAULT_PRAGMAS if pragmas is None else pragmas)
         database_proxy.initialize(self.db)
 
 
@@ -47,26 +60,22 @@ class Target(BaseModel):
     directory = CharField(null=True)
     prefix_operator = BooleanField(null=False, default=False)
 
-    def save_dmsg(self, output_dir, format='png'):
-        mutants = self.mutants_to_hunor()
+    def save_dmsg(self, output_dir, format='png', mutants=None):
+        if mutants is None:
+            mutants = self.mutants_to_hunor()
         create_dmsg(subsuming(mutants), export_dir=output_dir,
                     format=format, filename=self.tid)
 
-    def get_dmsg(self):
-        mutants = self.mutants_to_hunor()
+    def get_dmsg(self, mutants=None):
+        if mutants is None:
+            mutants = self.mutants_to_hunor()
         return dmsg_dot_elements(subsuming(mutants))
 
     def mutants_to_hunor(self):
-        mutants = {}
-        for m in self.mutants:
-            mutants[m.mid] = to_hunor_mutant(m)
-        return mutants
+        return mutants_to_hunor_in_targets([self]).get(self.id, {})
 
     def get_a_minimal_test_set(self, shuffle=True):
-        mutants = {}
-        for m in self.mutants:
-            mutants[m.id] = to_hunor_mutant(m)
-        _, minimal = minimize(mutants, shuffle_tests=shuffle)
+        _, minimal = minimize(self.mutants_to_hunor(), shuffle_tests=shuffle)
 
         return minimal
 
@@ -107,8 +116,8 @@ class Target(BaseModel):
         if not os.path.exists(output_dir):
             os.makedirs(output_dir)
 
-        for target in targets:
-            target.save_dmsg(output_dir=output_dir)
+        for target, mutants in Target.iter_mutants_to_hunor(targets):
+            target.save_dmsg(output_dir=output_dir, mutants=mutants)
 
     @staticmethod
     def save_all_dmsg_in_one(targets, output_dir, format='svg',
@@ -116,12 +125,22 @@ class Target(BaseModel):
         if not os.path.exists(output_dir):
             os.makedirs(output_dir)
         dots = []
-        for target in targets:
-            dots.append((target.tid, target.get_dmsg()))
+        for target, mutants in Target.iter_mutants_to_hunor(targets):
+            dots.append((target.tid, target.get_dmsg(mutants=mutants)))
 
         return multiple_dmsgs(dots, export_dir=output_dir, format=format,
                               filename=filename)
 
+    @staticmethod
+    def iter_mutants_to_hunor(targets, batch_size=HYDRATE_BATCH_SIZE):
+        if isinstance(targets, SelectBase):
+            targets = targets.iterator()
+
+        for batch in chunked(targets, batch_size):
+            mutants = mutants_to_hunor_in_targets(batch)
+            for target in batch:
+                yield target, mutants.get(target.id, {})
+
 
 class Mutant(BaseModel):
 
@@ -145,6 +164,13 @@ class Mutant(BaseModel):
     statement_operator = CharField(null=True)
     target = ForeignKeyField(Target, null=True, backref='mutants')
 
+    class Meta:
+        indexes = (
+            # Covers the abstract queries, which never touch the table.
+            (('target', 'mutation', 'belongs_to_minimal', 'has_brother',
+              'is_redundant'), False),
+        )
+
     def subsumes(self):
         return [s.subsumes for s in
                 Subsumption.select().where(
@@ -252,35 +278,89 @@ class Mutant(BaseModel):
             & (Mutant.has_brother == True)
         ).group_by(Mutant.mutation))
 
+    @staticmethod
+    def state_in_targets_group_by_mutation(targets):
+        return _abstract_dict(Mutant.select(
+            Mutant.mutation,
+            *_count_columns(_state_conditions())
+        ).where(
+            (Mutant.target.in_(targets))
+        ).group_by(Mutant.mutation), STATE_COLUMNS)
 
-def redundant_abstract(targets, output_dir=None):
-    red = Mutant.is_redundant_in_targets_group_by_mutation(targets)
-    not_red = Mutant.is_not_redundant_in_targets_group_by_mutation(targets)
-    min = Mutant.belongs_to_minimal_in_targets_group_by_mutation(targets)
-    not_min = Mutant.doesnt_belongs_to_minimal_in_targets_group_by_mutation(
-        targets)
-
-    abstract = {}
-    total = _group_by_dict(
-        Mutant.select(
+    @staticmethod
+    def redundant_in_targets_group_by_mutation(targets):
+        return _abstract_dict(Mutant.select(
             Mutant.mutation,
-            fn.COUNT(Mutant.id)
+            *_count_columns(_redundant_conditions())
         ).where(
             (Mutant.target.in_(targets))
-        ).group_by(Mutant.mutation))
+        ).group_by(Mutant.mutation), REDUNDANT_COLUMNS)
+
+    @staticmethod
+    def state_in_target_sets_group_by_mutation(target_sets):
+        targets = None
+        for t in target_sets:
+            ids = Target.select(Target.id).where(Target.id.in_(t))
+            targets = ids if targets is None else targets + ids
+
+        if targets is None:
+            return {}
+
+        # UNION ALL: a target in many sets is counted once for each set.
+        targets = targets.alias('targets')
+
+        return _abstract_dict(Mutant.select(
+            Mutant.mutation,
+            *_count_columns(_state_conditions())
+        ).join(
+            targets, on=(Mutant.target == targets.c.id)
+        ).group_by(Mutant.mutation), STATE_COLUMNS)
+
+
+STATE_COLUMNS = ['kdm', 'kim', 'kds', 'kis', 'total']
+REDUNDANT_COLUMNS = ['redundant', 'not_redundant', 'dominant', 'subsumed',
+                     'total']
+
+
+def _state_conditions():
+    return [
+        (Mutant.belongs_to_minimal == True) & (Mutant.has_brother == False),
+        (Mutant.belongs_to_minimal == True) & (Mutant.has_brother == True),
+        (Mutant.belongs_to_minimal == False) & (Mutant.has_brother == False),
+        (Mutant.belongs_to_minimal == False) & (Mutant.has_brother == True)
+    ]
+
+
+def _redundant_conditions():
+    return [
+        (Mutant.is_redundant == True),
+        (Mutant.is_redundant == False),
+        (Mutant.belongs_to_minimal == True),
+        (Mutant.belongs_to_minimal == False)
+    ]
+
+
+def _count_columns(conditions):
+    return ([fn.SUM(Case(None, [(c, 1)], 0)) for c in conditions]
+            + [fn.COUNT(Mutant.id)])
+
+
+def _abstract_dict(query, columns):
+    abstract = {}
+
+    for r in query.tuples():
+        abstract[r[0]] = {c: int(r[i + 1] or 0)
+                          for i, c in enumerate(columns)}
+
+    return abstract
+
+
+def redundant_abstract(targets, output_dir=None):
+    abstract = Mutant.redundant_in_targets_group_by_mutation(targets)
 
     def _percent(d, key):
         return '{0:.2f}'.format(d[key]/d['total'])
 
-    for r in total:
-        abstract[r] = {
-            'redundant': red[r] if r in red.keys() else 0,
-            'not_redundant': not_red[r] if r in not_red.keys() else 0,
-            'dominant': min[r] if r in min.keys() else 0,
-            'subsumed': not_min[r] if r in not_min.keys() else 0,
-            'total': total[r]
-        }
-
     if output_dir is not None:
         write_json(abstract, output_dir=output_dir, name='abstract')
         with open(os.path.join(output_dir, 'abstract.csv'), 'w') as csv:
@@ -303,28 +383,7 @@ def redundant_abstract(targets, output_dir=None):
 
 def state_abstract(targets, output_dir=None, filename='states',
                    file_format='csv'):
-    kdm = Mutant.kdm_in_targets_group_by_mutation(targets)
-    kim = Mutant.kim_in_targets_group_by_mutation(targets)
-    kds = Mutant.kds_in_targets_group_by_mutation(targets)
-    kis = Mutant.kis_in_targets_group_by_mutation(targets)
-
-    abstract = {}
-    total = _group_by_dict(
-        Mutant.select(
-            Mutant.mutation,
-            fn.COUNT(Mutant.id)
-        ).where(
-            (Mutant.target.in_(targets))
-        ).group_by(Mutant.mutation))
-
-    for r in total:
-        abstract[r] = {
-            'kdm': kdm[r] if r in kdm.keys() else 0,
-            'kim': kim[r] if r in kim.keys() else 0,
-            'kds': kds[r] if r in kds.keys() else 0,
-            'kis': kis[r] if r in kis.keys() else 0,
-            'total': total[r]
-        }
+    abstract = Mutant.state_in_targets_group_by_mutation(targets)
 
     if output_dir is not None:
         if file_format == 'csv':
@@ -357,6 +416,19 @@ def sum_state_abstract(abstracts):
     return abstract
 
 
+def sum_state_abstract_in_targets(target_sets, output_dir=None,
+                                  filename='states', file_format='csv'):
+    abstract = Mutant.state_in_target_sets_group_by_mutation(target_sets)
+
+    if output_dir is not None:
+        if file_format == 'csv':
+            write_state_csv(abstract, output_dir, filename)
+        elif file_format == 'tex':
+            write_state_tex(abstract, output_dir, filename)
+
+    return abstract
+
+
 def _percent(d, key, decimal=True):
     p = d[key] / d['total']
     return '{0:.1f}'.format(p if decimal else p * 100).replace('.', ',')
@@ -524,6 +596,21 @@ def dict_to_test_suite(name, d):
     return test_suite
 
 
+def mutants_to_hunor_in_targets(targets):
+    mutants = Mutant.select().where(
+        Mutant.target.in_(targets)).order_by(Mutant.id)
+    test_suites = TestSuite.select(
+        TestSuite.id, TestSuite.name, TestSuite.coverage,
+        TestSuite.tests_total, TestSuite.fail_tests_total,
+        TestSuite.fail_tests, TestSuite.coverage_tests, TestSuite.mutant)
+
+    result = {}
+    for m in prefetch(mutants, test_suites):
+        result.setdefault(m.target_id, {})[m.mid] = to_hunor_mutant(m)
+
+    return result
+
+
 def to_hunor_mutant(mutant):
 
     hunor_mutant = HunorMutant(
@@ -1,9 +1,14 @@
+from peewee import chunked
+
 from hunor.db.models import Mutant, Brotherhood, Subsumption
 from hunor.db.models import dict_to_mutant
 from hunor.db.models import TestSuite, dict_to_test_suite
 from hunor.db.models import Target, dict_to_target
 
 
+SQLITE_MAX_VARIABLES = 999
+
+
 class Queries:
 
     def __init__(self, database):
@@ -21,45 +26,64 @@ class Queries:
     def close(self):
         self.db.close()
 
-    @staticmethod
-    def save_target_and_mutants(target, mutants):
-        t = dict_to_target(target)
-
-        coverage = 0
-        if len(mutants) > 0:
-            for test_suite in mutants[0]['test_suites']:
-                coverage += mutants[0]['test_suites'][test_suite]['coverage']
-
-        t.coverage = coverage
-        t.save()
-
-        mid_to_id = {}
-
-        for mutant in mutants:
-            m = dict_to_mutant(mutant)
-            m.target = t
-            m.save()
-
-            mid_to_id[mutant['id']] = m.id
-
-            for test_suite in mutant['test_suites']:
-                t_s = dict_to_test_suite(test_suite,
-                                         mutant['test_suites'][test_suite])
-                t_s.mutant = m
-                t_s.save()
-
-        for mutant in mutants:
-            m = Mutant.get(Mutant.id == mid_to_id[mutant['id']])
-            for brother in mutant['brothers']:
-                b = Mutant.get(Mutant.id == mid_to_id[brother])
-                brotherhood = Brotherhood()
-                brotherhood.mutant = m
-                brotherhood.brother = b
-                brotherhood.save()
-
-            for subsume in mutant['subsumes_id']:
-                s = Mutant.get(Mutant.id == mid_to_id[subsume])
-                subsumption = Subsumption()
-                subsumption.subsumed_by = m
-                subsumption.subsumes = s
-                subsumption.save()
+    def save_target_and_mutants(self, target, mutants):
+        with self.db.atomic():
+            t = dict_to_target(target)
+
+            coverage = 0
+            if len(mutants) > 0:
+                for test_suite in mutants[0]['test_suites']:
+                    coverage += (mutants[0]['test_suites'][test_suite]
+                                 ['coverage'])
+
+            t.coverage = coverage
+            t.save()
+
+            rows = []
+            for mutant in mutants:
+                m = dict_to_mutant(mutant)
+                m.target = t
+                rows.append(m.__data__)
+
+            _insert_many(Mutant, rows)
+
+            # Looked up instead of derived from lastrowid, rowids of a
+            # multi-row insert are not guaranteed to be consecutive.
+            mid_to_id = dict(Mutant.select(Mutant.mid, Mutant.id)
+                             .where(Mutant.target == t).tuples())
+
+            test_suites = []
+            brotherhoods = []
+            subsumptions = []
+
+            for mutant in mutants:
+                m = mid_to_id[mutant['id']]
+
+                for test_suite in mutant['test_suites']:
+                    t_s = dict_to_test_suite(
+                        test_suite, mutant['test_suites'][test_suite])
+                    t_s.mutant = m
+                    test_suites.append(t_s.__data__)
+
+                for brother in mutant['brothers']:
+                    brotherhoods.append({'mutant': m,
+                                         'brother': mid_to_id[brother]})
+
+                for subsume in mutant['subsumes_id']:
+                    subsumptions.append({'subsumed_by': m,
+                                         'subsumes': mid_to_id[subsume]})
+
+            _insert_many(TestSuite, test_suites)
+            _insert_many(Brotherhood, brotherhoods)
+            _insert_many(Subsumption, subsumptions)
+
+        return t
+
+
+def _batch_size(model):
+    return max(SQLITE_MAX_VARIABLES // len(model._meta.sorted_fields), 1)
+
+
+def _insert_many(model, rows):
+    for batch in chunked(rows, _batch_size(model)):
+        model.insert_many(batch).execute()
@@ -6,6 +6,7 @@ from hunor.tools.maven import Maven
 from hunor.tools.junit import JUnit
 from hunor.args import arg_parser, to_options
 from hunor.tools.testsuite import generate_test_suites
+from hunor.tools.suite_cache import SuiteCache
 from hunor.mutation.nimrod import equivalence_analysis
 from hunor.mutation.subsuming import subsuming, create_dmsg, minimize
 from hunor.utils import write_json
@@ -30,7 +31,8 @@ class Hunor:
             jdk=jdk,
             sut_class=self.options.sut_class,
             classpath=classpath,
-            source_dir=self.options.source
+            source_dir=self.options.source,
+            select_tests=not self.options.is_test_selection_disabled
         )
 
         test_suites = generate_test_suites(
@@ -44,7 +46,9 @@ class Hunor:
             project_dir=self.options.source,
             suites_evosuite=self.options.suites_evosuite,
             suites_randoop=self.options.suites_randoop,
-            junit=junit
+            junit=junit,
+            jobs=self.options.jobs,
+            suite_cache=self._suite_cache()
         )
 
         mutants = equivalence_analysis(
@@ -58,7 +62,10 @@ class Hunor:
             coverage_threshold=self.options.coverage_threshold,
             output=self.options.output,
             mutants_dir=self.options.mutants,
-            using_target=self.using_target
+            using_target=self.using_target,
+            jobs=self.options.jobs,
+            schemata=self.options.is_enable_schemata,
+            java_src=self.options.java_src
         )
 
         if mutants is not None:
@@ -98,6 +105,12 @@ class Hunor:
 
         return {}, {}
 
+    def _suite_cache(self):
+        if self.options.suite_cache:
+            return SuiteCache(self.options.suite_cache,
+                              self.options.suite_cache_quota * 1024 * 1024)
+        return None
+
 
 def main():
     Hunor(to_options(arg_parser())).run()
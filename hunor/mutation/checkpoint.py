@@ -0,0 +1,103 @@
+import json
+import sqlite3
+
+from hunor.tools.suite_generator import Suite
+
+
+CHECKPOINT_FILE = 'checkpoint.db'
+
+SCHEMA = [
+    'CREATE TABLE IF NOT EXISTS file ('
+    '  name TEXT PRIMARY KEY, targets TEXT NOT NULL, reduced INTEGER)',
+    'CREATE TABLE IF NOT EXISTS target ('
+    '  directory TEXT PRIMARY KEY, error INTEGER)',
+    'CREATE TABLE IF NOT EXISTS suite ('
+    '  directory TEXT, mutant TEXT, suite TEXT, killed INTEGER,'
+    '  PRIMARY KEY (directory, mutant))',
+    'CREATE TABLE IF NOT EXISTS kill ('
+    '  directory TEXT, mutant TEXT, killed INTEGER, equivalent INTEGER,'
+    '  PRIMARY KEY (directory, mutant))'
+]
+
+
+class Checkpoint:
+
+    def __init__(self, path):
+        # Autocommit, every record is durable as soon as it is written.
+        self.conn = sqlite3.connect(path, isolation_level=None)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        for statement in SCHEMA:
+            self.conn.execute(statement)
+
+    def close(self):
+        self.conn.close()
+
+    def files(self):
+        return [(name, json.loads(targets), reduced)
+                for name, targets, reduced in self.conn.execute(
+                    'SELECT name, targets, reduced FROM file ORDER BY rowid')]
+
+    def finish_file(self, name, targets, reduced):
+        self.conn.execute(
+            'INSERT OR REPLACE INTO file (name, targets, reduced) '
+            'VALUES (?, ?, ?)', (name, json.dumps(targets), reduced))
+
+    def is_target_done(self, target):
+        return self.conn.execute(
+            'SELECT 1 FROM target WHERE directory = ?',
+            (target['directory'],)).fetchone() is not None
+
+    def finish_target(self, target, error=False):
+        self.conn.execute('INSERT OR REPLACE INTO target (directory, error) '
+                          'VALUES (?, ?)', (target['directory'], int(error)))
+
+    def target_error(self, target):
+        row = self.conn.execute(
+            'SELECT error FROM target WHERE directory = ?',
+            (target['directory'],)).fetchone()
+
+        if row is None:
+            return None
+
+        return bool(row[0])
+
+    def suite(self, target, mutant):
+        row = self.conn.execute(
+            'SELECT suite, killed FROM suite '
+            'WHERE directory = ? AND mutant = ?',
+            (target['directory'], str(mutant.id))).fetchone()
+
+        if row is None:
+            return None
+
+        return Suite(**json.loads(row[0])), bool(row[1])
+
+    def save_suite(self, target, mutant, suite, killed):
+        self.conn.execute(
+            'INSERT OR REPLACE INTO suite (directory, mutant, suite, killed) '
+            'VALUES (?, ?, ?, ?)',
+            (target['directory'], str(mutant.id),
+             json.dumps(suite._asdict()), int(killed)))
+
+    def reset_kills(self, target):
+        self.conn.execute('DELETE FROM kill WHERE directory = ?',
+                          (target['directory'],))
+
+    def kill(self, target, mutant):
+        row = self.conn.execute(
+            'SELECT killed, equivalent FROM kill '
+            'WHERE directory = ? AND mutant = ?',
+            (target['directory'], str(mutant.id))).fetchone()
+
+        if row is None:
+            return None
+
+        return bool(row[0]), bool(row[1])
+
+    def save_kill(self, target, mutant, killed, equivalent):
+        self.conn.execute(
+            'INSERT OR REPLACE INTO kill (directory, mutant, killed, '
+            'equivalent) VALUES (?, ?, ?, ?)',
+            (target['directory'], str(mutant.id), int(killed),
+             int(equivalent)))
@@ -1,15 +1,19 @@
 import os
 import copy
+import shutil
 import logging
+import threading
 
 from coloredlogs import ColoredFormatter
 from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
 
 from hunor.args import arg_parser_gen, to_options_gen
+from hunor.mutation.checkpoint import Checkpoint, CHECKPOINT_FILE
 from hunor.mutation.generate import _recover_state
 from hunor.mutation.generate import _create_mutants_dir
-from hunor.mutation.generate import _save_state
-from hunor.tools.hunor_plugin import HunorPlugin
+from hunor.mutation.generate import _save_targets
+from hunor.tools.hunor_plugin import HunorPlugin, class_name
 from hunor.tools.mujava import MuJava
 from hunor.tools.evosuite2 import Evosuite
 from hunor.tools.java_factory import JavaFactory
@@ -20,6 +24,7 @@ from hunor.tools.tce import TCE
 from hunor.utils import sort_files
 from hunor.utils import get_java_files
 from hunor.utils import config
+from hunor.utils import write_json
 
 
 logger = logging.getLogger()
@@ -60,7 +65,8 @@ def main():
 
     build = maven.compile(project_dir, clean=True)
 
-    junit = JUnit(java=java, classpath=build.classes_dir)
+    junit = JUnit(java=java, classpath=build.classes_dir,
+                  use_worker=options.is_enable_junit_worker)
 
     _create_mutants_dir(options)
 
@@ -74,13 +80,36 @@ def main():
     targets = state[0]
     analysed_files = state[1]
 
-    files = get_java_files(options.java_src)
-
-    for i, file in enumerate(sort_files(files)):
+    # Progress is journaled per target and per mutant, a restart resumes
+    # where the last run stopped.
+    checkpoint = Checkpoint(os.path.join(options.mutants, CHECKPOINT_FILE))
+    for file, t, reduced in checkpoint.files():
+        if file not in analysed_files['files']:
+            targets += t
+            analysed_files['files'].append(file)
+            analysed_files['targets'] += reduced
+
+    files = sort_files(get_java_files(options.java_src))
+    pending = [file for file in files
+               if file not in analysed_files['files']
+               and include(project_dir, file)]
+
+    # Each plugin generates the mutants of every pending file in a single
+    # Maven execution.
+    plugin_targets = {}
+    plugin_targets_reduced = {}
+    if pending:
+        plugin_targets = tool.generate_all(pending)
+        plugin_targets_reduced = tool_reduced.generate_all(pending)
+
+    for i, file in enumerate(files):
         logger.info('EVALUATING {0} {1}/{2}'.format(file, i + 1, len(files)))
-        if file not in analysed_files['files'] and include(project_dir, file):
-            t = tool.generate(file, len(targets))
-            t_r = tool_reduced.generate(file, len(targets))
+        if file in plugin_targets and file in plugin_targets_reduced:
+            t = tool.to_targets(class_name(file), plugin_targets[file],
+                                len(targets))
+            t_r = tool_reduced.to_targets(class_name(file),
+                                          plugin_targets_reduced[file],
+                                          len(targets))
 
             logger.info('\ttargets found: {0}, in reduced: {1}'
                         .format(len(t), len(t_r)))
@@ -91,6 +120,13 @@ def main():
                     logger.info("skipping target {0}.".format(target['oid']))
                     continue
 
+                if checkpoint.is_target_done(target):
+                    logger.info("target {0} already evaluated{1}.".format(
+                        target['oid'], ' with errors'
+                        if checkpoint.target_error(target) else ''))
+                    count += 1
+                    continue
+
                 log = '| RUNNING FOR: {0} {1}/{2} {3} (#{4})|'.format(
                     target['directory'], count, len(t_r),
                     target['target_repr'], target['oid'])
@@ -105,37 +141,12 @@ def main():
                 mutants = mutation_tool.read_log()
                 tce = TCE(options, build, target)
 
-                suites = []
-                count_assertions = 0
-                has_error = False
-                for mutant in mutants:
-                    if not has_error:
-                        mutant = mutants[mutant]
-                        evosuite = Evosuite(
-                            java=java,
-                            classpath=os.path.join(build.classes_dir),
-                            tests_src=os.path.join(mutants_dir, 'suites'),
-                            sut_class=target['class'],
-                            params=['-Dsearch_budget=60']
-                        )
-
-                        suite = evosuite.generate_differential(mutant.path)
-
-                        logger.debug('Test suite created to %s mutation with'
-                                     ' %i assertions.', mutant.mutation,
-                                     suite.tests_with_assertion)
-
-                        r = junit.exec_suite_with_mutant(
-                            suite, target['class'], mutant)
-
-                        if not JUnit.check_pass(r):
-                            count_assertions += suite.tests_with_assertion
-                            suites.append(suite)
-                        else:
-                            logger.info('The suite not kill the mutant, %s '
-                                        'EvosuiteR fail. :(', mutant.mutation)
-                            has_error = True
+                suites, count_assertions, has_error = (
+                    _generate_differential_suites(java, junit, build, target,
+                                                  mutants_dir, mutants,
+                                                  checkpoint, options.jobs))
 
+                rows = []
                 if not has_error:
                     result = True
 
@@ -167,27 +178,55 @@ def main():
                         killed_mutants = set()
                         not_killed_mutants = set()
 
+                        verdicts = {}
+                        survivors = []
+
                         for mutant in all_mutants:
                             mutant = all_mutants[mutant]
                             if not os.path.exists(mutant.path):
+                                continue
+
+                            saved = checkpoint.kill(target, mutant)
+
+                            if saved is not None:
+                                verdicts[mutant.id] = saved
+                            elif JUnit.check_pass(
+                                    junit.exec_suites_with_mutant(
+                                        suites, target['class'], mutant,
+                                        fail_fast=True)):
+                                survivors.append(mutant)
+                            else:
+                                verdicts[mutant.id] = (True, False)
+                                checkpoint.save_kill(target, mutant, True,
+                                                     False)
+
+                        # One Soot run checks every survivor for TCE.
+                        equivalents = tce.run_all(survivors)
+                        for mutant in survivors:
+                            verdicts[mutant.id] = (
+                                False, mutant.id in equivalents)
+                            checkpoint.save_kill(target, mutant,
+                                                 *verdicts[mutant.id])
+
+                        for mutant in all_mutants:
+                            mutant = all_mutants[mutant]
+                            if mutant.id not in verdicts:
                                 total_mutants -= 1
                                 continue
 
-                            result = junit.exec_suites_with_mutant(
-                                suites, target['class'], mutant)
+                            killed, equivalent = verdicts[mutant.id]
 
-                            if not JUnit.check_pass(result):
+                            if killed:
                                 logger.debug(
-                                    'Mutation %s (%s) was killed by %i tests.',
-                                    mutant.mutation, mutant.id,
-                                    result.fail_tests)
+                                    'Mutation %s (%s) was killed.',
+                                    mutant.mutation, mutant.id)
                                 killed_mutants.add(mutant)
                             else:
                                 logger.debug(
                                     'Mutation %s (%s) was not killed.',
                                     mutant.mutation, mutant.id)
 
-                                if tce.run(mutant):
+                                if equivalent:
                                     equivalent_mutants.add(mutant)
                                     logger.debug('\tBut it is equivalent.')
                                 not_killed_mutants.add(mutant)
@@ -224,7 +263,7 @@ def main():
                             'operator'
                         ]
 
-                        write_to_csv(headers, [
+                        rows.append(('evaluation.csv', headers, [
                             str(target['id']),
                             target['target_repr'],
                             str(len(mutants)),
@@ -247,20 +286,137 @@ def main():
                             str(target['column']),
                             target['statement'],
                             target['operator']
-                        ], output_dir=options.mutants)
+                        ]))
 
                     if mutants and len(suites) < len(mutants):
                         headers = ['id', 'class', 'method', 'line', 'column',
                                    'statement', 'operator']
-                        write_to_csv(headers, [str(target['id']), target['class'],
-                                               target['method'], str(target['line']),
-                                               str(target['column']),
-                                               target['statement'],
-                                               target['operator']],
-                                     output_dir=options.mutants,
-                                     filename='not_tested.csv')
-
-                _save_state(options, state, t_r, file)
+                        rows.append(('not_tested.csv', headers, [
+                            str(target['id']), target['class'],
+                            target['method'], str(target['line']),
+                            str(target['column']), target['statement'],
+                            target['operator']]))
+
+                # Done before the rows are written, a restart never writes
+                # them twice. Targets with a failed suite are done too.
+                checkpoint.finish_target(target, error=has_error)
+                for filename, headers, row in rows:
+                    write_to_csv(headers, row, output_dir=options.mutants,
+                                 filename=filename)
+
+            # Once every target of the file is done or skipped.
+            checkpoint.finish_file(file, t, len(t_r))
+            analysed_files['files'].append(file)
+            analysed_files['targets'] += len(t_r)
+
+    # The JSON files are exported once, the checkpoint is the journal.
+    _save_targets(options, targets)
+    write_json(analysed_files, 'save_status', options.mutants)
+
+    checkpoint.close()
+    junit.close()
+
+
+def _generate_differential_suites(java, junit, build, target, mutants_dir,
+                                  mutants, checkpoint, jobs=1):
+    lock = threading.Lock()
+    survivor = len(mutants)
+
+    def _stopped(i):
+        # Only mutants after a survivor are dropped, the ones before it are
+        # still consumed, as in a sequential run.
+        with lock:
+            return i > survivor
+
+    def _survived(i):
+        nonlocal survivor
+        with lock:
+            survivor = min(survivor, i)
+
+    def _generate(i, mutant, evosuite):
+        if _stopped(i):
+            _discard(evosuite)
+            return None
+
+        suite = evosuite.generate_differential(mutant.path)
+
+        logger.debug('Test suite created to %s mutation with %i assertions.',
+                     mutant.mutation, suite.tests_with_assertion)
+
+        # A running EvoSuite search is not interrupted, but its mutant run
+        # is skipped once a survivor before it is known.
+        if _stopped(i):
+            _discard(evosuite)
+            return None
+
+        killed = not JUnit.check_pass(junit.exec_suite_with_mutant(
+            suite, target['class'], mutant, fail_fast=True))
+
+        if not killed:
+            _survived(i)
+
+        return suite, killed
+
+    suites = []
+    count_assertions = 0
+    has_error = False
+    pending = []
+
+    with ThreadPoolExecutor(max_workers=max(jobs, 1)) as executor:
+        for i, mutant in enumerate([mutants[m] for m in mutants]):
+            saved = checkpoint.suite(target, mutant)
+
+            if saved is not None and os.path.exists(
+                    saved[0].suite_classes_dir):
+                logger.debug('Test suite to %s mutation recovered from '
+                             'checkpoint.', mutant.mutation)
+                pending.append((mutant, saved, None, None))
+                if not saved[1]:
+                    break
+            else:
+                # Suite directories are reserved here, in the mutants order,
+                # not in the order the threads start.
+                evosuite = Evosuite(
+                    java=java,
+                    classpath=os.path.join(build.classes_dir),
+                    tests_src=os.path.join(mutants_dir, 'suites'),
+                    sut_class=target['class'],
+                    params=['-Dsearch_budget=60']
+                )
+                pending.append((mutant, None, executor.submit(
+                    _generate, i, mutant, evosuite), evosuite))
+
+        # Suites are consumed in the mutants order, as in a sequential run.
+        for i, (mutant, saved, future, _) in enumerate(pending):
+            if future is not None:
+                saved = future.result()
+                if saved is None:
+                    break
+                # Kills recorded against a lost suite are stale.
+                checkpoint.reset_kills(target)
+                checkpoint.save_suite(target, mutant, *saved)
+
+            suite, killed = saved
+
+            if killed:
+                count_assertions += suite.tests_with_assertion
+                suites.append(suite)
+            else:
+                logger.info('The suite not kill the mutant, %s EvosuiteR '
+                            'fail. :(', mutant.mutation)
+                has_error = True
+                _survived(i)
+                for _, _, f, evosuite in pending[i + 1:]:
+                    if f is not None and f.cancel():
+                        _discard(evosuite)
+                break
+
+    return suites, count_assertions, has_error
+
+
+def _discard(evosuite):
+    shutil.rmtree(os.path.join(evosuite.tests_src, evosuite.suite_name),
+                  ignore_errors=True)
 
 
 def include(project_dir, file, target=None):
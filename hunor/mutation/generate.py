@@ -1,6 +1,8 @@
 import os
 import copy
 
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
 from hunor.tools.mujava import MuJava
 from hunor.tools.java import JDK
 from hunor.tools.maven import Maven
@@ -27,27 +29,90 @@ def main():
     targets = state[0]
     analysed_files = state[1]
 
-    count = 1
     files = get_java_files(options.java_src)
 
+    pending = []
+    count = len(targets)
     for i, file in enumerate(sort_files(files)):
         print('PROCESSING {0} {1}/{2}'.format(file, i + 1, len(files)))
         if file not in analysed_files['files']:
-            t = tool.generate(classes_dir, options.java_src, file, len(targets))
+            t = tool.generate(classes_dir, options.java_src, file, count)
             print('\ttargets found: {0}'.format(len(t)))
-            targets += t
-            for target in t:
-                target['mutants'] = _run_hunor(options, target)
-
-            _persist_targets(db, t)
-            _save_state(options, state, t, file)
-
-            count += 1
-
-
-def _run_hunor(options, target):
-    mutants, _ = Hunor(_create_hunor_options(options, target),
-                       using_target=True).run()
+            count += len(t)
+            pending.append((file, t))
+
+    # Targets of every file run in a pool, only this process writes the
+    # database and the state files, a file at a time once it is complete.
+    remaining = {file: len(t) for file, t in pending}
+    for file, t in pending:
+        if remaining[file] == 0:
+            _finish_file(options, state, db, file, t)
+
+    files_by_target = {target['id']: (file, t) for file, t in pending
+                       for target in t}
+    for target in _run_targets(options, [target for _, t in pending
+                                         for target in t]):
+        file, t = files_by_target[target['id']]
+        remaining[file] -= 1
+        if remaining[file] == 0:
+            _finish_file(options, state, db, file, t)
+
+
+def _finish_file(options, state, db, file, t):
+    state[0].extend(t)
+    _persist_targets(db, t)
+    _save_state(options, state, t, file)
+
+
+def _run_targets(options, targets):
+    # Longest first, the pool picks the cheap ones up at the end.
+    targets = sorted(targets, key=lambda t: _estimated_cost(options, t),
+                     reverse=True)
+
+    if options.jobs <= 1:
+        for target in targets:
+            target['mutants'] = _run_hunor(options, target)
+            yield target
+        return
+
+    error = None
+    with ProcessPoolExecutor(max_workers=options.jobs) as executor:
+        futures = {executor.submit(_run_hunor, options, target, 1): target
+                   for target in targets}
+        for future in as_completed(futures):
+            target = futures[future]
+            try:
+                target['mutants'] = future.result()
+            except Exception as e:
+                # The other targets still finish and get written, the
+                # failed one stays pending for the next run.
+                print('# ERROR: target {0} failed: {1}'.format(
+                    target['id'], e))
+                error = error or e
+                continue
+            yield target
+
+    if error is not None:
+        raise error
+
+
+def _estimated_cost(options, target):
+    suites = ((0 if options.is_evosuite_disabled
+               else options.suites_evosuite)
+              + (0 if options.is_randoop_disabled
+                 else options.suites_randoop))
+    mutants = MuJava(_create_hunor_options(options, target).mutants)
+
+    return len(mutants.read_log()) * max(suites, 1)
+
+
+def _run_hunor(options, target, jobs=None):
+    o = _create_hunor_options(options, target)
+    if jobs is not None:
+        # Targets already run in parallel, one each per process.
+        o.jobs = jobs
+
+    mutants, _ = Hunor(o, using_target=True).run()
     return mutants
 
 
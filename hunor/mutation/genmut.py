@@ -12,7 +12,7 @@ from hunor.utils import get_java_files
 from hunor.utils import write_json
 from hunor.utils import read_json
 
-from hunor.tools.hunor_plugin import HunorPlugin
+from hunor.tools.hunor_plugin import HunorPlugin, class_name
 
 
 def main():
@@ -25,7 +25,11 @@ def main():
     targets = state[0]
     analysed_files = state[1]
 
-    files = get_java_files(options.java_src)
+    files = sort_files(get_java_files(options.java_src))
+    pending = [file for file in files if file not in analysed_files['files']]
+
+    # A single Maven execution generates the mutants of every file.
+    plugin_targets = tool.generate_all(pending) if pending else {}
 
     targets_count = {}
     class_count = {}
@@ -36,10 +40,11 @@ def main():
     if os.path.exists('class_count.json'):
         class_count = read_json('class_count.json')
 
-    for i, file in enumerate(sort_files(files)):
+    for i, file in enumerate(files):
         print('PROCESSING {0} {1}/{2}'.format(file, i + 1, len(files)))
-        if file not in analysed_files['files']:
-            t = tool.generate(file, len(targets))
+        if file in plugin_targets:
+            t = tool.to_targets(class_name(file), plugin_targets[file],
+                                len(targets))
             print('\ttargets found: {0}'.format(len(t)))
             targets += t
             for target in t:
@@ -0,0 +1,108 @@
+class KillMatrix:
+
+    def __init__(self, mutants):
+        self.mutants = [mutants[m] for m in mutants]
+        self.tests = {}
+        self.kills = []
+
+        for mutant in self.mutants:
+            row = 0
+            for test in mutant.get_fail_tests():
+                if test not in self.tests:
+                    self.tests[test] = len(self.tests)
+                row |= 1 << self.tests[test]
+            self.kills.append(row)
+
+    @property
+    def full_mask(self):
+        return (1 << len(self.tests)) - 1
+
+    def mask(self, ignored_tests=None):
+        mask = self.full_mask
+
+        if ignored_tests is not None:
+            for test in ignored_tests:
+                if test in self.tests:
+                    mask &= ~(1 << self.tests[test])
+
+        return mask
+
+    def groups(self, mask):
+        groups = {}
+
+        for i, row in enumerate(self.kills):
+            groups.setdefault(row & mask, []).append(i)
+
+        return groups
+
+    def relations(self, ignored_tests=None):
+        mask = self.mask(ignored_tests)
+        groups = self.groups(mask)
+        subsumes = [[] for _ in self.mutants]
+        subsumed_by = [[] for _ in self.mutants]
+
+        for row_a, group_a in groups.items():
+            for row_b, group_b in groups.items():
+                if row_a != row_b and row_a & row_b == row_a:
+                    for a in group_a:
+                        subsumes[a] += group_b
+                    for b in group_b:
+                        subsumed_by[b] += group_a
+
+            # Ignoring tests may join mutants with different kill sets in
+            # the same group, they subsume each other.
+            if mask != self.full_mask:
+                for a in group_a:
+                    for b in group_a:
+                        if self.kills[a] != self.kills[b]:
+                            subsumes[a].append(b)
+                            subsumed_by[a].append(b)
+
+        return (list(groups.values()), [sorted(s) for s in subsumes],
+                [sorted(s) for s in subsumed_by])
+
+    def apply(self, ignored_tests=None):
+        groups, subsumes, subsumed_by = self.relations(ignored_tests)
+
+        for group in groups:
+            if len(group) > 1:
+                brothers = [self.mutants[i] for i in group]
+                for mutant in brothers:
+                    mutant.set_brothers(brothers)
+
+        for i, mutant in enumerate(self.mutants):
+            mutant.subsumes = [self.mutants[j] for j in subsumes[i]]
+            mutant.subsumed_by = [self.mutants[j] for j in subsumed_by[i]]
+
+        return self.mutants
+
+    def redundant_tests(self, tests):
+        rows = set(self.kills)
+        mask = self.full_mask
+        redundant = set()
+
+        for test in tests:
+            if test not in self.tests:
+                redundant.add(test)
+                continue
+
+            bit = 1 << self.tests[test]
+            if self._keeps_relations(rows, mask, bit):
+                mask &= ~bit
+                redundant.add(test)
+
+        return redundant
+
+    @staticmethod
+    def _keeps_relations(rows, mask, bit):
+        # Removing a test only adds subset relations: a row killed by it can
+        # become a subset of (or equal to) a row that is not.
+        killed = [row & mask & ~bit for row in rows if row & bit]
+        alive = [row & mask for row in rows if not row & bit]
+
+        for row_a in killed:
+            for row_b in alive:
+                if row_a & row_b == row_a:
+                    return False
+
+        return True
@@ -1,4 +1,5 @@
 import os
+import copy
 
 from hunor.utils import list_equal
 from difflib import ndiff
@@ -27,6 +28,7 @@ class Mutant:
         self.subsumes = list()
         self.subsumed_by = list()
         self.path = path
+        self.schemata = None
         self.result = Result()
         self.is_invalid = False
         self.label = mid
@@ -43,6 +45,15 @@ class Mutant:
     def __hash__(self):
         return hash(self.id)
 
+    def clone(self):
+        mutant = copy.copy(self)
+        mutant.brothers = list(self.brothers)
+        mutant.subsumes = list(self.subsumes)
+        mutant.subsumed_by = list(self.subsumed_by)
+        mutant.result = Result()
+        mutant.result.test_suites = dict(self.result.test_suites)
+        return mutant
+
     def get_fail_tests(self):
         fail_tests = set()
 
@@ -190,6 +201,12 @@ class Mutant:
         self.mutation_label = mutation_label
         brother.mutation_label = mutation_label
 
+    def set_brothers(self, brothers):
+        self.has_brother = True
+        self.brothers = [b for b in brothers if b != self]
+        self.label = _create_label({b.id for b in brothers})
+        self.mutation_label = _create_label({b.mutation for b in brothers})
+
     def is_redundant(self):
         return len(self.subsumed_by) > 0 or self.has_brother
 
@@ -1,22 +1,45 @@
 import os
+import copy
 import math
+import shutil
+import hashlib
+import tempfile
+import subprocess
 
 from datetime import datetime
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
 
-from hunor.utils import get_java_files
+from hunor.utils import get_files, get_java_files
 from hunor.tools.major import Major
 from hunor.tools.mujava import MuJava
 from hunor.tools.pit import Pit
+from hunor.tools.worker import Worker, WorkerException
+
+
+COMPILE_TIMEOUT = 60
+ORIGINAL = 'ORIGINAL'
+
+Version = namedtuple('Version', ['id', 'path'])
 
 
 def equivalence_analysis(jdk, junit, classpath, test_suites, mutants,
                          mutation_tool, sut_class, coverage_threshold,
-                         output, mutants_dir, using_target=False):
+                         output, mutants_dir, using_target=False, jobs=1,
+                         schemata=False, java_src=None):
+
+    # Only Major builds mutant schemata.
+    schemata = schemata and mutation_tool == 'major'
 
     if mutation_tool == 'pit':
         mutation_tool = Pit(mutants, sut_class)
     elif mutation_tool == 'major':
-        mutation_tool = Major(mutants)
+        mutation_tool = Major(mutants, jdk=jdk, classpath=classpath,
+                              schemata=schemata)
+        if schemata:
+            mutation_tool.compile_schemata(
+                sut_class.replace('.', os.sep) + '.java', java_src,
+                classpath)
     elif mutation_tool == 'mujava':
         mutation_tool = MuJava(mutants)
 
@@ -39,6 +62,7 @@ def equivalence_analysis(jdk, junit, classpath, test_suites, mutants,
                                                 line_coverage)
         for t in ori_test_suites:
             test_suites[t].elapsed_time = ori_test_suites[t].elapsed_time
+            test_suites[t].tests_total = ori_test_suites[t].tests_total
             ori_coverage += ori_test_suites[t].coverage
             ori_tests_total += ori_test_suites[t].tests_total
             if ori_test_suites[t].tests_total == 0:
@@ -59,76 +83,254 @@ def equivalence_analysis(jdk, junit, classpath, test_suites, mutants,
 
     print('RUNNING TEST SUITES FOR ALL MUTANTS...')
     begin = datetime.now()
-    for i, m in enumerate(mutants):
-        mutant_begin = datetime.now()
-        mutant = mutants[m]
-        print('\tmutant: {0}... {1}/{2}'.format(mutant, i + 1, len(mutants)))
-
-        if os.path.exists(mutant.path):
-            compile_success = True
-            for java_file in get_java_files(mutant.path):
-                compile_success = compile_success and jdk.run_javac(
-                    java_file, 60, mutant.path, "-classpath", classpath)
-
-            if compile_success:
-                mutant.result.test_suites = junit.run_test_suites(
-                    test_suites, mutant.path, mutant.line_number, original_dir)
-                coverage = 0
-                fail = False
-                maybe_in_loop = False
-                coverage_log = []
-                tests_total = 0
-                fail_tests_total = 0
-                fail_tests = set()
-
-                for r in mutant.result.test_suites:
-                    coverage += mutant.result.test_suites[r].coverage
-                    fail = fail or mutant.result.test_suites[r].fail
-                    maybe_in_loop = (maybe_in_loop
-                                     or mutant.result.test_suites[r].fail)
-                    tests_total += mutant.result.test_suites[r].tests_total
-                    fail_tests_total += (mutant.result.test_suites[r]
-                                         .fail_tests_total)
-                    fail_tests = fail_tests.union(
-                        mutant.result.test_suites[r].fail_tests)
-
-                    coverage_log.append('{0}: {1}'.format(
-                        r, mutant.result.test_suites[r].coverage))
-
-                print('\t\tcoverage: {0}/{4} ({1}) tests fail: {2}/{3}'.format(
-                    coverage, ', '.join(coverage_log), fail_tests_total,
-                    tests_total, coverage_threshold))
-
-                if tests_total > 0 or maybe_in_loop:
-                    with open(os.path.join(output,
-                                           'equivalents.csv'), 'a') as f:
-                        if coverage >= coverage_threshold and not fail:
-                            print('\t\t +++ THIS MUTANT MAY BE EQUIVALENT!')
-                            mutant.maybe_equivalent = True
-                            f.write('{0},{1},{2},{3}\n'.format(
-                                mutant.id, 'x', '', coverage))
-                        elif fail:
-                            print('\t\t --- THIS MUTANT IS NOT EQUIVALENT!')
-                            f.write('{0},{1},{2},{3}\n'.format(
-                                mutant.id, '', 'x', coverage))
-                        else:
-                            f.write('{0},{1},{2},{3}\n'.format(
-                                mutant.id, '', '', coverage))
+
+    all_mutants = [mutants[m] for m in mutants]
+
+    if schemata:
+        compiled, digests = _schemata_versions(all_mutants)
+        diagnostics = {}
+    else:
+        original = _copy_original(original_dir)
+        versions = all_mutants + ([original] if original is not None
+                                  else [])
+
+        try:
+            compiled, diagnostics = _compile_mutants(jdk, classpath,
+                                                     versions)
+            digests = _bytecode_digests(versions, compiled)
+        finally:
+            if original is not None:
+                shutil.rmtree(original.path)
+
+    original_digest = digests.pop(ORIGINAL, None)
+
+    # Mutants with the same bytecode are the same program, only the first of
+    # each group runs the tests.
+    groups = {}
+    for mutant in all_mutants:
+        if mutant.id in digests:
+            groups.setdefault((digests[mutant.id], mutant.line_number),
+                              mutant)
+
+    def _representative(mutant):
+        if mutant.id not in digests:
+            return mutant
+        return groups[(digests[mutant.id], mutant.line_number)]
+
+    def _analyse(mutant):
+        if _representative(mutant) is not mutant:
+            return None
+
+        return _analyse_mutant(jdk, junit, classpath, test_suites, mutant,
+                               original_dir, coverage_threshold,
+                               compiled.get(mutant.id, False),
+                               original_digest is not None
+                               and digests.get(mutant.id) == original_digest,
+                               diagnostics.get(mutant.id, []))
+
+    # Mutants are independent, the results are consumed in the original
+    # order so the log and equivalents.csv do not depend on scheduling.
+
+    rows = {}
+    with ThreadPoolExecutor(max_workers=max(jobs, 1)) as executor:
+        results = executor.map(_analyse, all_mutants)
+        for i, (mutant, result) in enumerate(zip(all_mutants, results)):
+            if result is None:
+                representative = _representative(mutant)
+                result = _share_result(representative, mutant,
+                                       rows.get(representative.id))
+            log, row = result
+            rows[mutant.id] = row
+
+            print('\tmutant: {0}... {1}/{2}'.format(
+                mutant, i + 1, len(mutants)))
+            for line in log:
+                print(line)
+
+            if row is not None:
+                with open(os.path.join(output, 'equivalents.csv'), 'a') as f:
+                    f.write(row)
+                    f.close()
+
+    print('############ END ANALYSIS ########### {0}'
+          .format(datetime.now() - begin))
+
+    return mutants
+
+
+def _compile_mutants(jdk, classpath, mutants):
+    compiled = {}
+    diagnostics = {}
+    worker = Worker(jdk)
+
+    try:
+        for mutant in mutants:
+            if not os.path.exists(mutant.path):
+                continue
+
+            java_files = get_java_files(mutant.path)
+
+            if worker is not None:
+                try:
+                    result = worker.compile(
+                        classpath, mutant.path,
+                        [os.path.join(mutant.path, f) for f in java_files],
+                        COMPILE_TIMEOUT)
+                    compiled[mutant.id] = result.success
+                    diagnostics[mutant.id] = result.diagnostics
+                    continue
+                except (OSError, subprocess.SubprocessError,
+                        WorkerException) as e:
+                    print('WARNING: compiler worker unavailable, '
+                          'using javac: {0}'.format(e))
+                    worker.close()
+                    worker = None
+
+            compiled[mutant.id] = all(
+                jdk.run_javac(java_file, COMPILE_TIMEOUT, mutant.path,
+                              "-classpath", classpath)
+                for java_file in java_files)
+    finally:
+        if worker is not None:
+            worker.close()
+
+    return compiled, diagnostics
+
+
+def _schemata_versions(mutants):
+    # Every mutant is in the schemata build, selected at run time, so none
+    # is compiled nor compared by bytecode. Each one only gets a directory
+    # to run its tests in.
+    for mutant in mutants:
+        os.makedirs(mutant.path, exist_ok=True)
+
+    return {mutant.id: True for mutant in mutants}, {}
+
+
+def _copy_original(original_dir):
+    if not os.path.exists(original_dir):
+        return None
+
+    # The original sources are compiled with the mutants, in a copy, so the
+    # bytecode is comparable.
+    copy_dir = tempfile.mkdtemp()
+    for java_file in get_java_files(original_dir):
+        os.makedirs(os.path.dirname(os.path.join(copy_dir, java_file)),
+                    exist_ok=True)
+        shutil.copy(os.path.join(original_dir, java_file),
+                    os.path.join(copy_dir, java_file))
+
+    return Version(ORIGINAL, copy_dir)
+
+
+def _bytecode_digests(mutants, compiled):
+    digests = {}
+
+    for mutant in mutants:
+        if compiled.get(mutant.id, False):
+            class_files = sorted(get_files(mutant.path, ext='.class'))
+            if class_files:
+                digest = hashlib.sha256()
+                for class_file in class_files:
+                    digest.update(class_file.encode('utf-8') + b'\0')
+                    with open(os.path.join(mutant.path, class_file),
+                              'rb') as f:
+                        digest.update(f.read())
                         f.close()
+                digests[mutant.id] = digest.hexdigest()
+
+    return digests
+
+
+def _share_result(representative, mutant, row):
+    mutant.result.test_suites = {
+        t: copy.copy(representative.result.test_suites[t])
+        for t in representative.result.test_suites
+    }
+    mutant.maybe_equivalent = representative.maybe_equivalent
+    mutant.is_invalid = representative.is_invalid
+
+    if row is not None:
+        row = '{0},{1}'.format(mutant.id, row.split(',', 1)[1])
+
+    return ['\t\tsame bytecode as mutant {0}.'.format(representative.id)], row
+
+
+def _analyse_mutant(jdk, junit, classpath, test_suites, mutant, original_dir,
+                    coverage_threshold, compile_success,
+                    same_as_original=False, diagnostics=()):
+    mutant_begin = datetime.now()
+    log = []
+    row = None
+
+    if os.path.exists(mutant.path):
+        if compile_success:
+            if same_as_original:
+                # Nothing to run, every test behaves as in the original.
+                log.append('\t\tsame bytecode as the original program.')
+                mutant.result.test_suites = junit.original_results(
+                    test_suites, mutant.line_number, original_dir)
+            else:
+                mutant.result.test_suites = junit.run_test_suites(
+                    test_suites, mutant.path, mutant.line_number,
+                    original_dir, schemata=mutant.schemata,
+                    mutant_id=mutant.id)
+            coverage = 0
+            fail = False
+            maybe_in_loop = False
+            coverage_log = []
+            tests_total = 0
+            fail_tests_total = 0
+            fail_tests = set()
+
+            for r in mutant.result.test_suites:
+                coverage += mutant.result.test_suites[r].coverage
+                fail = fail or mutant.result.test_suites[r].fail
+                maybe_in_loop = (maybe_in_loop
+                                 or mutant.result.test_suites[r].fail)
+                tests_total += mutant.result.test_suites[r].tests_total
+                fail_tests_total += (mutant.result.test_suites[r]
+                                     .fail_tests_total)
+                fail_tests = fail_tests.union(
+                    mutant.result.test_suites[r].fail_tests)
+
+                coverage_log.append('{0}: {1}'.format(
+                    r, mutant.result.test_suites[r].coverage))
+
+            log.append('\t\tcoverage: {0}/{4} ({1}) tests fail: {2}/{3}'
+                       .format(coverage, ', '.join(coverage_log),
+                               fail_tests_total, tests_total,
+                               coverage_threshold))
+
+            if tests_total > 0 or maybe_in_loop:
+                if same_as_original or (coverage >= coverage_threshold
+                                        and not fail):
+                    log.append('\t\t +++ THIS MUTANT MAY BE EQUIVALENT!')
+                    mutant.maybe_equivalent = True
+                    row = '{0},{1},{2},{3}\n'.format(
+                        mutant.id, 'x', '', coverage)
+                elif fail:
+                    log.append('\t\t --- THIS MUTANT IS NOT EQUIVALENT!')
+                    row = '{0},{1},{2},{3}\n'.format(
+                        mutant.id, '', 'x', coverage)
                 else:
-                    mutant.is_invalid = True
+                    row = '{0},{1},{2},{3}\n'.format(
+                        mutant.id, '', '', coverage)
             else:
-                print('\t\tWARNING: mutant not compile: {0}'.format(
-                    mutant.path))
                 mutant.is_invalid = True
         else:
-            print('\t\tWARNING: mutant directory not found: {0}'
-                  .format(mutant.path))
+            log.append('\t\tWARNING: mutant not compile: {0}'.format(
+                mutant.path))
+            for diagnostic in diagnostics:
+                log.extend('\t\t\t' + line
+                           for line in diagnostic.splitlines())
             mutant.is_invalid = True
+    else:
+        log.append('\t\tWARNING: mutant directory not found: {0}'
+                   .format(mutant.path))
+        mutant.is_invalid = True
 
-        print('\t********************************* {0}'
-              .format(datetime.now() - mutant_begin))
-    print('############ END ANALYSIS ########### {0}'
-          .format(datetime.now() - begin))
+    log.append('\t********************************* {0}'
+               .format(datetime.now() - mutant_begin))
 
-    return mutants
+    return log, row
@@ -1,29 +1,17 @@
 import os
-import copy
 
 from random import shuffle
 
-from itertools import combinations
 from graphviz import Digraph, ExecutableNotFound
 
+from hunor.mutation.kill_matrix import KillMatrix
+
 
 def subsuming(mutants, ignored_tests=None, clean=True, coverage_threshold=0):
-    mutants = copy.deepcopy(mutants)
+    mutants = _clone(mutants)
     mutants = _remove_invalid_and_equivalent(mutants, coverage_threshold)
 
-    for a, b in combinations(mutants, 2):
-        if mutants[a].is_brother(mutants[b], ignored_tests):
-            mutants[b].set_as_brother(mutants[a])
-            mutants[a].set_as_brother(mutants[b])
-
-    for a, b in combinations(mutants, 2):
-        if mutants[a].subsume(mutants[b], ignored_tests):
-            mutants[a].subsumes.append(mutants[b])
-            mutants[b].subsumed_by.append(mutants[a])
-
-        if mutants[a].is_subsumed_by(mutants[b], ignored_tests):
-            mutants[a].subsumed_by.append(mutants[b])
-            mutants[b].subsumes.append(mutants[a])
+    KillMatrix(mutants).apply(ignored_tests)
 
     if clean:
         d_mutants = {}
@@ -60,6 +48,10 @@ def _all_subsumed(mutants, mutant, subsumed):
     return subsumed
 
 
+def _clone(mutants):
+    return {key: mutants[key].clone() for key in mutants}
+
+
 def _remove_invalid_and_equivalent(mutants, coverage_threshold):
     r = dict(mutants)
     for key in mutants:
@@ -146,28 +138,20 @@ def render_dot(dot, export_dir='.', filename='DMSG', format='png'):
 
 
 def minimize(mutants, coverage_threshold=0, shuffle_tests=False):
-    mutants = copy.deepcopy(mutants)
+    mutants = _clone(mutants)
     all_tests = set()
 
     for m in mutants:
         for t in mutants[m].get_fail_tests():
             all_tests.add(t)
 
-    original = subsuming(mutants, clean=False,
-                         coverage_threshold=coverage_threshold)
-    excluded_tests = set()
-
     to_check = list(all_tests)
     if shuffle_tests:
         shuffle(to_check)
 
-    for t in to_check:
-        excluded_tests.add(t)
-        if not _subsuming_equals(
-                original,
-                subsuming(mutants, clean=False, ignored_tests=excluded_tests,
-                          coverage_threshold=coverage_threshold)):
-            excluded_tests.remove(t)
+    excluded_tests = KillMatrix(
+        _remove_invalid_and_equivalent(mutants, coverage_threshold)
+    ).redundant_tests(to_check)
 
     for key in mutants:
         for test_suite in mutants[key].result.test_suites:
@@ -178,14 +162,3 @@ def minimize(mutants, coverage_threshold=0, shuffle_tests=False):
     return (subsuming(mutants, coverage_threshold=coverage_threshold,
                       ignored_tests=excluded_tests),
             all_tests.difference(excluded_tests))
-
-
-def _subsuming_equals(mutants_a, mutants_b):
-    if len(mutants_a.keys()) != len(mutants_b.keys()):
-        return False
-
-    for key in mutants_a:
-        if not mutants_a[key].subsuming_equal(mutants_b[key]):
-            return False
-
-    return True
@@ -0,0 +1,30 @@
+def make_target(tid):
+    return {
+        'id': tid, 'ignore': False, 'class': 'br.ufal.Foo', 'method': 'sum',
+        'type_method': 'int', 'line': 10, 'column': 5, 'statement': 'a + b',
+        'statement_nodes': None, 'context': {}, 'context_full': {},
+        'method_ast': {}, 'operand_nodes': None, 'operator_kind': None,
+        'operator': '+'
+    }
+
+
+def make_mutant(mid, brothers=(), subsumes=()):
+    return {
+        'id': mid, 'operator': 'AOR', 'original_symbol': '+',
+        'replacement_symbol': '-', 'method': 'sum', 'line_number': 10,
+        'transformation': 'a - b', 'maybe_equivalent': False,
+        'has_brother': len(brothers) > 0, 'brothers': list(brothers),
+        'subsumes_id': list(subsumes), 'path': ['mutants', mid],
+        'is_invalid': False, 'label': mid, 'mutation': 'a - b',
+        'is_redundant': False, 'belongs_to_minimal': True,
+        'is_useless': False, 'mutation_label': 'a - b',
+        'statement_operator': 'AOR',
+        'test_suites': {
+            'evosuite_1': {
+                'coverage': 2, 'tests_total': 4, 'fail_tests_total': 1,
+                'fail_tests': ['E_1_test0'], 'coverage_tests': ['E_1_test0'],
+                'fail_coverage_tests': ['E_1_test0'],
+                'fail_coverage_tests_total': 1
+            }
+        }
+    }
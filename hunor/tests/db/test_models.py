@@ -0,0 +1,110 @@
+import os
+import tempfile
+
+from unittest import TestCase
+from unittest.mock import patch
+
+from hunor.db.models import Database, Target, Mutant, WAL_PRAGMAS
+from hunor.db.models import state_abstract, redundant_abstract
+from hunor.db.models import sum_state_abstract, sum_state_abstract_in_targets
+from hunor.db.models import mutants_to_hunor_in_targets, to_hunor_mutant
+from hunor.db.queries import Queries
+from hunor.tests.db import make_target, make_mutant
+
+
+def _flags(mutant, i):
+    mutant['mutation'] = ['a - b', 'a * b', 'a / b'][i % 3]
+    mutant['belongs_to_minimal'] = i % 2 == 0
+    mutant['has_brother'] = i % 5 == 0
+    mutant['is_redundant'] = i % 3 == 0
+    return mutant
+
+
+class TestModels(TestCase):
+
+    def setUp(self):
+        self.db = Queries(Database(':memory:'))
+        self.db.create_tables()
+        for t in range(4):
+            self.db.save_target_and_mutants(make_target(t), [
+                _flags(make_mutant(str(i)), i * (t + 1)) for i in range(20)])
+
+    def tearDown(self):
+        self.db.close()
+
+    def test_state_abstract(self):
+        targets = Target.find_all()
+        abstract = state_abstract(targets)
+
+        self.assertEqual(
+            {'a - b', 'a * b', 'a / b'}, set(abstract.keys()))
+        for r in abstract:
+            self.assertEqual(
+                Mutant.kdm_in_targets_group_by_mutation(targets).get(r, 0),
+                abstract[r]['kdm'])
+            self.assertEqual(
+                Mutant.kis_in_targets_group_by_mutation(targets).get(r, 0),
+                abstract[r]['kis'])
+            self.assertEqual(abstract[r]['total'], sum(
+                abstract[r][k] for k in ['kdm', 'kim', 'kds', 'kis']))
+        self.assertEqual(80, sum(a['total'] for a in abstract.values()))
+
+    def test_redundant_abstract(self):
+        targets = Target.select().where(Target.tid < 2)
+        abstract = redundant_abstract(targets)
+
+        for r in abstract:
+            self.assertEqual(
+                Mutant.is_redundant_in_targets_group_by_mutation(
+                    targets).get(r, 0),
+                abstract[r]['redundant'])
+            self.assertEqual(
+                Mutant.doesnt_belongs_to_minimal_in_targets_group_by_mutation(
+                    targets).get(r, 0),
+                abstract[r]['subsumed'])
+        self.assertEqual(40, sum(a['total'] for a in abstract.values()))
+
+    def test_sum_state_abstract_in_targets(self):
+        target_sets = [Target.select().where(Target.tid < 3),
+                       Target.select().where(Target.tid > 1),
+                       [Target.get(Target.tid == 0)]]
+
+        self.assertEqual(
+            sum_state_abstract([state_abstract(t) for t in target_sets]),
+            sum_state_abstract_in_targets(target_sets))
+
+    def test_mutants_to_hunor_in_targets(self):
+        targets = list(Target.find_all())
+
+        with patch.object(self.db.db, 'execute_sql',
+                          wraps=self.db.db.execute_sql) as execute_sql:
+            mutants = mutants_to_hunor_in_targets(targets)
+            self.assertEqual(2, execute_sql.call_count)
+
+        self.assertEqual({t.id for t in targets}, set(mutants.keys()))
+        for target in targets:
+            self.assertEqual(20, len(mutants[target.id]))
+            for m in target.mutants:
+                self.assertEqual(
+                    to_hunor_mutant(m).to_dict(),
+                    mutants[target.id][m.mid].to_dict())
+
+    def test_iter_mutants_to_hunor(self):
+        result = [(t.tid, len(m)) for t, m in Target.iter_mutants_to_hunor(
+            Target.find_all(), batch_size=3)]
+
+        self.assertEqual([(0, 20), (1, 20), (2, 20), (3, 20)], result)
+
+
+class TestDatabase(TestCase):
+
+    def _journal_mode(self, pragmas=None):
+        path = os.path.join(tempfile.mkdtemp(), 'mutation.db')
+        db = Database(path, pragmas=pragmas).db
+        mode = db.execute_sql('PRAGMA journal_mode').fetchone()[0]
+        db.close()
+        return mode
+
+    def test_journal_mode(self):
+        self.assertEqual('delete', self._journal_mode())
+        self.assertEqual('wal', self._journal_mode(WAL_PRAGMAS))
@@ -0,0 +1,39 @@
+from unittest import TestCase
+
+from hunor.db.models import Database, Target, Mutant, TestSuite
+from hunor.db.models import Brotherhood, Subsumption
+from hunor.db.queries import Queries
+from hunor.tests.db import make_target, make_mutant
+
+
+class TestQueries(TestCase):
+
+    def setUp(self):
+        self.db = Queries(Database(':memory:'))
+        self.db.create_tables()
+
+    def tearDown(self):
+        self.db.close()
+
+    def test_save_target_and_mutants(self):
+        self.db.save_target_and_mutants(make_target(1), [
+            make_mutant('1', brothers=['2']), make_mutant('2', brothers=['1']),
+            make_mutant('3')])
+        target = self.db.save_target_and_mutants(make_target(2), [
+            make_mutant(str(i), subsumes=[str(i + 1)] if i < 99 else [])
+            for i in range(100)])
+
+        self.assertEqual(2, Target.select().count())
+        self.assertEqual(103, Mutant.select().count())
+        self.assertEqual(103, TestSuite.select().count())
+        self.assertEqual(2, target.coverage)
+
+        mutant = Mutant.get((Mutant.target == target) & (Mutant.mid == '41'))
+        self.assertEqual(['42'], [m.mid for m in mutant.subsumes()])
+        self.assertEqual(['40'], [m.mid for m in mutant.subsumed_by()])
+        self.assertEqual(['E_1_test0'], mutant.test_suites[0].fail_tests)
+
+        mutant = Mutant.get(Mutant.mid == '1')
+        self.assertEqual(['2'], [m.mid for m in mutant.brothers()])
+        self.assertEqual(2, Brotherhood.select().count())
+        self.assertEqual(99, Subsumption.select().count())
@@ -0,0 +1,6 @@
+from hunor.mutation.mutant import Mutant
+
+
+def make_mutant(mid, path=None, line_number=10):
+    return Mutant(mid, 'AOR', '+', '-', 'sum()', line_number, 'a - b',
+                  path or 'mutants/{0}'.format(mid))
@@ -0,0 +1,51 @@
+import os
+import tempfile
+
+from unittest import TestCase
+
+from hunor.mutation.checkpoint import Checkpoint
+from hunor.mutation.mutant import Mutant
+from hunor.tools.suite_generator import Suite
+
+
+class TestCheckpoint(TestCase):
+
+    def setUp(self):
+        self.path = os.path.join(tempfile.mkdtemp(), 'checkpoint.db')
+        self.target = {'directory': 'br/ufal/Foo/sum/1', 'oid': 1}
+        self.mutant = Mutant('AOR_1', 'AOR', '+', '-', 'sum()', 10, 'a - b',
+                             'mutants/AOR_1')
+        self.suite = Suite('evosuite_1', 'suites/evosuite_1',
+                           'suites/evosuite_1/classes', ['br.ufal.Foo_ESTest'],
+                           'evosuite', 3)
+
+    def test_resume(self):
+        checkpoint = Checkpoint(self.path)
+        checkpoint.save_suite(self.target, self.mutant, self.suite, True)
+        checkpoint.save_kill(self.target, self.mutant, False, True)
+        checkpoint.close()
+
+        checkpoint = Checkpoint(self.path)
+
+        self.assertEqual((self.suite, True),
+                         checkpoint.suite(self.target, self.mutant))
+        self.assertEqual((False, True),
+                         checkpoint.kill(self.target, self.mutant))
+        self.assertFalse(checkpoint.is_target_done(self.target))
+
+    def test_finish(self):
+        checkpoint = Checkpoint(self.path)
+        error_target = {'directory': 'br/ufal/Foo/sum/2', 'oid': 2}
+        checkpoint.finish_target(self.target)
+        checkpoint.finish_target(error_target, error=True)
+        checkpoint.finish_file('br/ufal/Foo.java', [{'id': 0}], 1)
+        checkpoint.reset_kills(self.target)
+
+        self.assertTrue(checkpoint.is_target_done(self.target))
+        self.assertTrue(checkpoint.is_target_done(error_target))
+        self.assertEqual((False, True),
+                         (checkpoint.target_error(self.target),
+                          checkpoint.target_error(error_target)))
+        self.assertEqual([('br/ufal/Foo.java', [{'id': 0}], 1)],
+                         checkpoint.files())
+        self.assertIsNone(checkpoint.kill(self.target, self.mutant))
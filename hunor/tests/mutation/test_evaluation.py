@@ -0,0 +1,82 @@
+import os
+import time
+import tempfile
+
+from unittest import TestCase
+from unittest.mock import patch
+from collections import namedtuple
+
+from hunor.mutation.checkpoint import Checkpoint
+from hunor.mutation.evaluation import _generate_differential_suites
+from hunor.tools.junit2 import JUnitResult
+from hunor.tools.suite_generator import Suite
+from hunor.tests.mutation import make_mutant
+
+
+Build = namedtuple('Build', ['classes_dir'])
+
+
+class FakeEvosuite:
+
+    names = []
+
+    def __init__(self, tests_src, **kwargs):
+        # Reserves the next name, like SuiteGenerator._set_suite_name.
+        FakeEvosuite.names.append(str(len(FakeEvosuite.names) + 1))
+        self.tests_src = tests_src
+        self.suite_name = FakeEvosuite.names[-1]
+
+    def generate_differential(self, mutant_path):
+        # Later mutants finish first.
+        time.sleep(0.01 * (5 - int(os.path.basename(mutant_path))))
+        return Suite(self.suite_name, mutant_path,
+                     os.path.join(mutant_path, 'classes'), [], 'evosuite', 1)
+
+
+class FakeJUnit:
+
+    def __init__(self, survivors):
+        self.survivors = survivors
+
+    def exec_suite_with_mutant(self, suite, sut_class, mutant,
+                               fail_fast=False):
+        if mutant.id in self.survivors:
+            return JUnitResult(1, 0, set(), 0, None, False)
+        return JUnitResult(1, 1, {'Foo_ESTest#test0'}, 0, None, False)
+
+
+class TestDifferentialSuites(TestCase):
+
+    def setUp(self):
+        self.target = {'directory': 'br/ufal/Foo/sum/1', 'class': 'Foo'}
+        self.mutants = {
+            str(i): make_mutant(str(i)) for i in range(1, 5)
+        }
+        self.checkpoint = Checkpoint(
+            os.path.join(tempfile.mkdtemp(), 'checkpoint.db'))
+        FakeEvosuite.names = []
+
+    def _generate(self, survivors):
+        with patch('hunor.mutation.evaluation.Evosuite', FakeEvosuite):
+            return _generate_differential_suites(
+                None, FakeJUnit(survivors), Build('target/classes'),
+                self.target, 'mutants',
+                self.mutants, self.checkpoint, jobs=2)
+
+    def test_all_killed(self):
+        suites, count_assertions, has_error = self._generate(set())
+
+        self.assertEqual(['1', '2', '3', '4'],
+                         [s.suite_name for s in suites])
+        self.assertEqual(['mutants/1', 'mutants/2', 'mutants/3',
+                          'mutants/4'], [s.suite_dir for s in suites])
+        self.assertEqual(4, count_assertions)
+        self.assertFalse(has_error)
+
+    def test_stop_at_first_survivor(self):
+        suites, _, has_error = self._generate({'2'})
+
+        self.assertEqual(['1'], [s.suite_name for s in suites])
+        self.assertTrue(has_error)
+        self.assertFalse(
+            self.checkpoint.suite(self.target, self.mutants['2'])[1])
@@ -1,6 +1,9 @@
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
 from unittest import TestCase
+from unittest.mock import patch
 
-from hunor.mutation.generate import main
+from hunor.mutation.generate import main, _run_targets
 
 
 class TestGeneate(TestCase):
@@ -13,3 +16,40 @@ class TestGeneate(TestCase):
 
     def test_true(self):
         self.assertTrue(True)
+
+
+class TestRunTargets(TestCase):
+
+    def test_longest_first(self):
+        costs = {0: 10, 1: 40, 2: 20}
+        targets = [{'id': i} for i in costs]
+
+        with patch('hunor.mutation.generate._estimated_cost',
+                   lambda options, target: costs[target['id']]), \
+                patch('hunor.mutation.generate._run_hunor',
+                      lambda options, target: [target['id']]):
+            done = list(_run_targets(SimpleNamespace(jobs=1), targets))
+
+        self.assertEqual([1, 2, 0], [t['id'] for t in done])
+        self.assertEqual([[1], [2], [0]], [t['mutants'] for t in done])
+
+    def test_failed_target_keeps_others(self):
+        def run_hunor(options, target, jobs=None):
+            if target['id'] == 1:
+                raise RuntimeError('target 1')
+            return [target['id']]
+
+        targets = [{'id': i} for i in range(3)]
+        done = []
+
+        with patch('hunor.mutation.generate._estimated_cost',
+                   lambda options, target: target['id']), \
+                patch('hunor.mutation.generate._run_hunor', run_hunor), \
+                patch('hunor.mutation.generate.ProcessPoolExecutor',
+                      ThreadPoolExecutor):
+            with self.assertRaises(RuntimeError):
+                for target in _run_targets(SimpleNamespace(jobs=2),
+                                           targets):
+                    done.append(target['id'])
+
+        self.assertEqual([0, 2], sorted(done))
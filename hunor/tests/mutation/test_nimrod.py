@@ -0,0 +1,89 @@
+import os
+import tempfile
+
+from unittest import TestCase
+from unittest.mock import patch
+
+from hunor.mutation.nimrod import _compile_mutants, _bytecode_digests
+from hunor.mutation.nimrod import _share_result, _schemata_versions
+from hunor.tools.testsuite import TestSuiteResult
+from hunor.tests.mutation import make_mutant
+
+
+class FakeJDK:
+
+    def __init__(self, invalid):
+        self.java = '/nonexistent/jre/bin/java'
+        self.javac = '/nonexistent/bin/javac'
+        self.invalid = invalid
+        self.compiled = []
+
+    def run_javac(self, java_file, timeout, cwd, *args):
+        self.compiled.append(os.path.join(cwd, java_file))
+        return cwd not in self.invalid
+
+
+class TestNimrod(TestCase):
+
+    @patch('hunor.tools.worker.compiled_classes_dir', side_effect=OSError())
+    def test_compile_mutants_without_worker(self, _):
+        mutants_dir = tempfile.mkdtemp()
+        mutants = []
+
+        for i in range(3):
+            path = os.path.join(mutants_dir, str(i + 1))
+            os.makedirs(os.path.join(path, 'br', 'ufal'))
+            open(os.path.join(path, 'br', 'ufal', 'Foo.java'), 'w').close()
+            mutants.append(make_mutant(str(i + 1), path))
+        mutants.append(make_mutant('4', os.path.join(mutants_dir, '4')))
+
+        jdk = FakeJDK(invalid=[mutants[1].path])
+        compiled, diagnostics = _compile_mutants(jdk, 'classes', mutants)
+
+        self.assertEqual({'1': True, '2': False, '3': True}, compiled)
+        self.assertEqual({}, diagnostics)
+        self.assertEqual(3, len(jdk.compiled))
+
+    def test_bytecode_digests(self):
+        mutants_dir = tempfile.mkdtemp()
+        mutants = []
+
+        for i, content in enumerate([b'a', b'b', b'a', b'a']):
+            path = os.path.join(mutants_dir, str(i + 1))
+            os.makedirs(os.path.join(path, 'br', 'ufal'))
+            with open(os.path.join(path, 'br', 'ufal', 'Foo.class'),
+                      'wb') as f:
+                f.write(content)
+            mutants.append(make_mutant(str(i + 1), path))
+
+        digests = _bytecode_digests(mutants, {'1': True, '2': True,
+                                              '3': True, '4': False})
+
+        self.assertEqual({'1', '2', '3'}, set(digests))
+        self.assertEqual(digests['1'], digests['3'])
+        self.assertNotEqual(digests['1'], digests['2'])
+
+    def test_schemata_versions(self):
+        mutants_dir = tempfile.mkdtemp()
+        mutants = [make_mutant(str(i), os.path.join(mutants_dir, str(i)))
+                   for i in (1, 2)]
+
+        compiled, digests = _schemata_versions(mutants)
+
+        self.assertEqual({'1': True, '2': True}, compiled)
+        self.assertEqual({}, digests)
+        self.assertTrue(all(os.path.isdir(m.path) for m in mutants))
+
+    def test_share_result(self):
+        representative = make_mutant('1')
+        representative.result.test_suites['s'] = TestSuiteResult(
+            's', None, None, [])
+        representative.maybe_equivalent = True
+        mutant = make_mutant('7')
+
+        _, row = _share_result(representative, mutant, '1,x,,3\n')
+
+        self.assertEqual('7,x,,3\n', row)
+        self.assertTrue(mutant.maybe_equivalent)
+        self.assertIsNot(representative.result.test_suites['s'],
+                         mutant.result.test_suites['s'])
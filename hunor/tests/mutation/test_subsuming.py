@@ -0,0 +1,130 @@
+import copy
+import random
+
+from unittest import TestCase
+from itertools import combinations
+
+from hunor.mutation.kill_matrix import KillMatrix
+from hunor.mutation.subsuming import subsuming, minimize
+from hunor.tools.testsuite import TestSuiteResult
+from hunor.tests.mutation import make_mutant
+
+
+def _mutants(kill_sets):
+    mutants = {}
+
+    for i, kills in enumerate(kill_sets):
+        mutant = make_mutant(str(i + 1), line_number=i)
+        result = TestSuiteResult('s', None, None, [])
+        result.fail_tests = set(kills)
+        result.coverage_tests = set(kills)
+        mutant.result.test_suites['s'] = result
+        mutants[mutant.id] = mutant
+
+    return mutants
+
+
+def _pairwise(mutants, ignored_tests=None):
+    mutants = copy.deepcopy(mutants)
+
+    for a, b in combinations(mutants, 2):
+        if mutants[a].is_brother(mutants[b], ignored_tests):
+            mutants[b].set_as_brother(mutants[a])
+            mutants[a].set_as_brother(mutants[b])
+
+    for a, b in combinations(mutants, 2):
+        if mutants[a].subsume(mutants[b], ignored_tests):
+            mutants[a].subsumes.append(mutants[b])
+            mutants[b].subsumed_by.append(mutants[a])
+
+        if mutants[a].is_subsumed_by(mutants[b], ignored_tests):
+            mutants[a].subsumed_by.append(mutants[b])
+            mutants[b].subsumes.append(mutants[a])
+
+    return mutants
+
+
+def _pairwise_redundant_tests(mutants, tests):
+    original = _pairwise(mutants)
+    excluded_tests = set()
+
+    for t in tests:
+        excluded_tests.add(t)
+        reduced = _pairwise(mutants, excluded_tests)
+        for key in original:
+            if not original[key].subsuming_equal(reduced[key]):
+                excluded_tests.remove(t)
+                break
+
+    return excluded_tests
+
+
+def _relations(mutants):
+    return {
+        key: (mutants[key].label, mutants[key].mutation_label,
+              sorted(b.id for b in mutants[key].brothers),
+              [m.id for m in mutants[key].subsumes],
+              [m.id for m in mutants[key].subsumed_by])
+        for key in mutants
+    }
+
+
+class TestSubsuming(TestCase):
+
+    def setUp(self):
+        random.seed(42)
+        tests = ['T#test{0}'.format(i) for i in range(6)]
+        self.mutants = _mutants(
+            [random.sample(tests, random.randint(1, 4)) for _ in range(30)])
+
+    def test_subsuming_equals_pairwise(self):
+        self.assertEqual(_relations(_pairwise(self.mutants)),
+                         _relations(subsuming(self.mutants, clean=False)))
+
+    def test_subsuming_ignored_tests_equals_pairwise(self):
+        ignored_tests = {'T#test0', 'T#test3'}
+
+        self.assertEqual(
+            _relations(_pairwise(self.mutants, ignored_tests)),
+            _relations(subsuming(self.mutants, clean=False,
+                                 ignored_tests=ignored_tests)))
+
+    def test_subsuming_brothers(self):
+        mutants = subsuming(_mutants([['T#test0'], ['T#test0'],
+                                      ['T#test0', 'T#test1']]), clean=False)
+
+        self.assertEqual('1, 2', mutants['1'].label)
+        self.assertEqual(['2'], [m.id for m in mutants['1'].brothers])
+        self.assertEqual(['3'], [m.id for m in mutants['1'].subsumes])
+        self.assertEqual(['1', '2'], [m.id for m in mutants['3'].subsumed_by])
+
+    def test_redundant_tests_equals_pairwise(self):
+        tests = sorted({t for m in self.mutants.values()
+                        for t in m.get_fail_tests()})
+
+        for _ in range(5):
+            random.shuffle(tests)
+            self.assertEqual(
+                _pairwise_redundant_tests(self.mutants, tests),
+                KillMatrix(self.mutants).redundant_tests(tests))
+
+    def test_minimize(self):
+        minimized, minimal_tests = minimize(self.mutants)
+
+        self.assertEqual(subsuming(self.mutants).keys(), minimized.keys())
+        self.assertEqual(
+            set(), minimal_tests.difference(
+                {t for m in self.mutants.values()
+                 for t in m.get_fail_tests()}))
+
+    def test_minimize_keeps_mutants(self):
+        before = {key: self.mutants[key].result.test_suites['s'].to_dict()
+                  for key in self.mutants}
+
+        minimize(self.mutants)
+
+        for key in self.mutants:
+            self.assertEqual([], self.mutants[key].subsumes)
+            self.assertFalse(self.mutants[key].has_brother)
+            self.assertEqual(before[key], self.mutants[key].result
+                             .test_suites['s'].to_dict())
@@ -0,0 +1,28 @@
+import os
+import tempfile
+
+from unittest import TestCase
+from concurrent.futures import ThreadPoolExecutor
+
+from hunor.utils import update_json, read_json
+
+
+class TestUtils(TestCase):
+
+    def test_update_json(self):
+        path = os.path.join(tempfile.mkdtemp(), 'saved_suites.json')
+
+        def _update(i):
+            def _set(saved):
+                saved['br.ufal.Foo{0}'.format(i)] = [i]
+                return saved
+            return update_json(path, _set)
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(_update, range(32)))
+
+        saved = read_json(path)
+        self.assertEqual(32, len(saved))
+        self.assertEqual([7], saved['br.ufal.Foo7'])
+        self.assertEqual(['saved_suites.json', 'saved_suites.json.lock'],
+                         sorted(os.listdir(os.path.dirname(path))))
@@ -0,0 +1,63 @@
+from unittest import TestCase
+
+import os
+import shutil
+import tempfile
+
+from hunor.tools.coverage import read_report, read_coverage, write_coverage
+from hunor.tools.coverage import parse_dump
+
+
+REPORT = """<html><body><table class='listing'>
+<tr><td class='line'>10</td><td class='callpoints-count'>2</td>
+<td><pre class='prettyprint covered'>return a &gt;= b;</pre>
+<ol class='callpoints'>
+<li>GreaterOrEqualThan_ESTest#test0: 1</li>
+<li>GreaterOrEqualThan_ESTest#test3: 2</li>
+<li>GreaterOrEqualThanTest#returnsTrue_whenEqual: 1</li>
+</ol></td></tr>
+<tr><td class='line'>11</td><td class='count'></td>
+<td><pre class='prettyprint'>}</pre></td></tr>
+<tr><td class='line'>12</td><td class='callpoints-count'>1</td>
+<td><pre class='prettyprint covered'>x++;</pre>
+<ol class='callpoints'><li>RegressionTest0#test12: 1</li>
+<li>RegressionTest0#setUp: 1</li></ol></td></tr>
+</table></body></html>"""
+
+
+class TestCoverage(TestCase):
+
+    def setUp(self):
+        self.output_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.output_dir)
+
+    def test_read_report(self):
+        report = os.path.join(self.output_dir, 'Report.html')
+        with open(report, 'w') as f:
+            f.write(REPORT)
+
+        self.assertEqual({
+            10: {'GreaterOrEqualThan_ESTest#test0',
+                 'GreaterOrEqualThan_ESTest#test3',
+                 'GreaterOrEqualThanTest#returnsTrue_whenEqual'},
+            12: {'RegressionTest0#test12', 'RegressionTest0#setUp'}
+        }, read_report(report))
+
+    def test_parse_dump(self):
+        self.assertEqual({
+            10: {'GreaterOrEqualThan_ESTest#test0',
+                 'GreaterOrEqualThanTest#returnsTrue_whenEqual'},
+            12: {'RegressionTest0#setUp'}
+        }, parse_dump('10\tGreaterOrEqualThan_ESTest#test0\n'
+                      '10\tGreaterOrEqualThanTest#returnsTrue_whenEqual\n'
+                      '12\tRegressionTest0#setUp\n'))
+
+    def test_write_and_read_coverage(self):
+        lines = {10: {'A#test0'}, 12: {'A#test1', 'A#test2'}}
+
+        self.assertIsNone(read_coverage(self.output_dir))
+        write_coverage(self.output_dir, lines)
+
+        self.assertEqual(lines, read_coverage(self.output_dir))
@@ -0,0 +1,102 @@
+import os
+import json
+import tempfile
+import subprocess
+
+from types import SimpleNamespace
+from unittest import TestCase
+from unittest.mock import patch
+
+from hunor.tools.hunor_plugin import HunorPlugin, split_targets, TIMEOUT
+from hunor.tools.hunor_plugin import read_plugin_targets
+
+
+def _mutant(tid, target_class, method, mutant):
+    return {
+        'tid': tid,
+        'targetClass': target_class,
+        'methodSignature': 'int_{0}(int,int)'.format(method),
+        'lineNumber': 10,
+        'transformation': 'a + b => a - b',
+        'expOperator': '+',
+        'prefixExpOperator': None,
+        'targetRepr': 'a + b',
+        'children': [],
+        'directory': os.path.join(target_class, method, str(tid), mutant)
+    }
+
+
+# Two classes of one package and an inner class, ids repeat per class.
+PLUGIN_TARGETS = '''{{
+  "1": [{0}, {1}],
+  "2": [{2}],
+  "1": [{3}],
+  "3": [{4}]
+}}'''.format(*[json.dumps(m) for m in [
+    _mutant(1, 'br.ufal.Foo', 'sum', 'AORB_1'),
+    _mutant(1, 'br.ufal.Foo', 'sum', 'AORB_2'),
+    _mutant(2, 'br.ufal.Foo$Inner', 'sub', 'AORB_1'),
+    _mutant(1, 'br.ufal.FooBar', 'sum', 'AORB_1'),
+    _mutant(3, 'br.ufal.Baz', 'mul', 'AORB_1')
+]])
+
+
+class TestHunorPluginBatch(TestCase):
+
+    def test_includes(self):
+        self.assertEqual(
+            '-Dhunor.includes=**{0}br{0}Foo.java,**{0}Bar.java'.format(
+                os.sep),
+            HunorPlugin._includes([os.path.join('br', 'Foo.java'),
+                                   'Bar.java']))
+
+    def test_split_targets(self):
+        fd, path = tempfile.mkstemp(suffix='.json')
+        with os.fdopen(fd, 'w') as f:
+            f.write(PLUGIN_TARGETS)
+            f.close()
+
+        foo = os.path.join('br', 'ufal', 'Foo.java')
+        foo_bar = os.path.join('br', 'ufal', 'FooBar.java')
+        targets = split_targets(read_plugin_targets(path),
+                                [foo, foo_bar, 'Foo.java'])
+        os.remove(path)
+
+        self.assertEqual({'1': 2, '2': 1},
+                         {t: len(m) for t, m in targets[foo].items()})
+        self.assertEqual({'1': 1},
+                         {t: len(m) for t, m in targets[foo_bar].items()})
+        self.assertEqual({}, targets['Foo.java'])
+
+        foo_targets = HunorPlugin.to_targets('br.ufal.Foo', targets[foo])
+        self.assertEqual(
+            [os.path.join('br.ufal.Foo', 'sum', '1'),
+             os.path.join('br.ufal.Foo$Inner', 'sub', '2')],
+            [t['directory'] for t in foo_targets])
+
+    def test_generate_all_timeout(self):
+        mutants_dir = tempfile.mkdtemp()
+        with open(os.path.join(mutants_dir, 'plugin_targets.json'), 'w') as f:
+            f.write(PLUGIN_TARGETS)
+
+        foo = os.path.join('br', 'ufal', 'Foo.java')
+        files = [foo, os.path.join('br', 'ufal', 'FooBar.java'), 'Qux.java']
+        timeouts = []
+
+        def gen(class_files, timeout):
+            timeouts.append(timeout)
+            raise subprocess.TimeoutExpired('mvn', timeout)
+
+        plugin = HunorPlugin(SimpleNamespace(
+            source='.', mutants=mutants_dir, is_enable_reduce=True,
+            is_enable_new_mutations=False))
+
+        with patch.object(plugin, 'gen', gen), \
+                patch.object(plugin, '_analyse',
+                             lambda **kwargs: timeouts.append(
+                                 kwargs['timeout'])):
+            targets = plugin.generate_all(files)
+
+        # Qux.java was never reached, it is not reported as empty.
+        self.assertEqual(files[:2], sorted(targets))
+        self.assertEqual([3 * TIMEOUT, 3 * TIMEOUT], timeouts)
@@ -0,0 +1,137 @@
+import os
+import tempfile
+
+from unittest import TestCase
+from unittest.mock import patch
+
+from hunor.tools.bin import MAJOR_CONFIG
+from hunor.tools.coverage import write_coverage
+from hunor.tools.junit import JUnit
+from hunor.tools.testsuite import TestSuiteResult
+
+
+class TestJUnitTestSelection(TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.original = os.path.join(self.dir, 'ORIGINAL')
+        self.mutant = os.path.join(self.dir, '1')
+        os.makedirs(os.path.join(self.original, 'evosuite_1'))
+        write_coverage(os.path.join(self.original, 'evosuite_1'), {
+            10: {'Foo_ESTest#test1', 'Foo_ESTest#test3'},
+            12: {'Bar_ESTest#test0'}
+        })
+
+        self.suite = TestSuiteResult(
+            'evosuite_1', None, 'classes',
+            ['br.ufal.Foo_ESTest', 'br.ufal.Bar_ESTest'], prefix='EVO_1')
+        self.suite.tests_total = 10
+
+        self.junit = JUnit(None, 'br.ufal.Foo', 'target/classes', 'src')
+        self.runs = []
+
+        def _run_test(test_suite, test_classes_dir, test_class, **kwargs):
+            self.runs.append(test_class)
+            return (2, 1, {'Foo_ESTest#test3'}), 0.5
+
+        self.junit._run_test = _run_test
+
+    def test_run_only_covering_tests(self):
+        total, fail, fail_tests, coverage, coverage_tests, _ = (
+            self.junit._run_test_suite(self.suite, self.mutant, 10,
+                                       self.original))
+
+        self.assertEqual(['br.ufal.Foo_ESTest#test1,test3'], self.runs)
+        self.assertEqual((10, 1, {'Foo_ESTest#test3'}),
+                         (total, fail, fail_tests))
+        self.assertEqual(2, coverage)
+
+    def test_covering_method_with_any_name(self):
+        write_coverage(os.path.join(self.original, 'evosuite_1'), {
+            10: {'Foo_ESTest#sum_returnsZero_whenNegated'}
+        })
+
+        def _run_test(test_suite, test_classes_dir, test_class, **kwargs):
+            self.runs.append(test_class)
+            return (1, 1, {'Foo_ESTest#sum_returnsZero_whenNegated'}), 0.5
+
+        self.junit._run_test = _run_test
+
+        total, fail, fail_tests, _, _, _ = self.junit._run_test_suite(
+            self.suite, self.mutant, 10, self.original)
+
+        self.assertEqual(
+            ['br.ufal.Foo_ESTest#sum_returnsZero_whenNegated'], self.runs)
+        self.assertEqual(
+            (10, 1, {'Foo_ESTest#sum_returnsZero_whenNegated'}),
+            (total, fail, fail_tests))
+
+    def test_uncovered_mutant(self):
+        total, fail, fail_tests, coverage, _, _ = (
+            self.junit._run_test_suite(self.suite, self.mutant, 20,
+                                       self.original))
+
+        self.assertEqual([], self.runs)
+        self.assertEqual((10, 0, set(), 0),
+                         (total, fail, fail_tests, coverage))
+
+    def test_no_coverage_runs_all(self):
+        write_coverage(os.path.join(self.original, 'evosuite_1'), {})
+
+        total, _, _, _, _, _ = self.junit._run_test_suite(
+            self.suite, self.mutant, 10, self.original)
+
+        self.assertEqual(['br.ufal.Foo_ESTest', 'br.ufal.Bar_ESTest'],
+                         self.runs)
+        self.assertEqual(4, total)
+
+    def test_selection_disabled(self):
+        self.junit.select_tests = False
+
+        self.junit._run_test_suite(self.suite, self.mutant, 10, self.original)
+
+        self.assertEqual(['br.ufal.Foo_ESTest', 'br.ufal.Bar_ESTest'],
+                         self.runs)
+
+    def test_mutant_in_loop(self):
+        timeouts = []
+
+        def _run_test(test_suite, test_classes_dir, test_class, **kwargs):
+            timeouts.append(kwargs['timeout'])
+            return (0, 0, set()), kwargs['timeout']
+
+        self.junit._run_test = _run_test
+        self.junit.profile.record_class(('evosuite_1', 'br.ufal.Foo_ESTest'),
+                                        1)
+
+        self.junit._run_test_suite(self.suite, self.mutant, 10, self.original)
+
+        self.assertEqual([20], timeouts)
+        self.assertTrue(self.suite.maybe_in_loop)
+
+
+class FakeJDK:
+
+    java = 'java'
+
+
+class TestJUnitSchemata(TestCase):
+
+    def test_run_schemata_mutant(self):
+        commands = []
+        junit = JUnit(FakeJDK(), 'br.ufal.Foo', 'target/classes', 'src')
+
+        with patch('hunor.tools.junit.Worker.classes_dir',
+                   lambda java: 'worker'), \
+                patch('hunor.tools.junit.subprocess.run',
+                      lambda command, **kwargs: commands.append(command)):
+            junit._run_test(tempfile.mkdtemp(), 'classes',
+                            'br.ufal.Foo_ESTest', mutant_classpath='mutants/7',
+                            coverage=False, schemata='mutants/schemata',
+                            mutant_id=7)
+
+        classpath = commands[0][commands[0].index('-classpath') + 1]
+        self.assertLess(classpath.index('mutants/schemata'),
+                        classpath.index('target/classes'))
+        self.assertIn(MAJOR_CONFIG, classpath.split(os.pathsep))
+        self.assertIn('-Dhunor.mutant=7', commands[0])
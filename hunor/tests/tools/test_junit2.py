@@ -0,0 +1,192 @@
+import os
+import json
+
+from unittest import TestCase
+from unittest.mock import patch
+from collections import namedtuple
+
+from hunor.mutation.mutant import Mutant
+from hunor.tools.junit2 import JUnit
+from hunor.tools.worker import WorkerResult, WorkerTest
+
+
+class TestJUnitWorkerResult(TestCase):
+
+    def test_to_result_ok(self):
+        result = JUnit._to_result(WorkerResult(2, 0, [
+            WorkerTest('br.ufal.Foo_ESTest', 'test0', 'ok', 0.1, None),
+            WorkerTest('br.ufal.Foo_ESTest', 'test1', 'ok', 0.1, None)
+        ], 0.5, False))
+
+        self.assertEqual(2, result.ok_tests)
+        self.assertEqual(0, result.fail_tests)
+        self.assertEqual(set(), result.fail_test_set)
+        self.assertTrue(JUnit.check_pass(result))
+
+    def test_to_result_fail(self):
+        result = JUnit._to_result(WorkerResult(2, 1, [
+            WorkerTest('br.ufal.Foo_ESTest', 'test0', 'ok', 0.1, None),
+            WorkerTest('br.ufal.Foo_ESTest', 'test1', 'fail', 0.1,
+                       'java.lang.AssertionError')
+        ], 0.5, False))
+
+        self.assertEqual(2, result.ok_tests)
+        self.assertEqual(1, result.fail_tests)
+        self.assertEqual({'Foo_ESTest#test1'}, result.fail_test_set)
+        self.assertFalse(JUnit.check_pass(result))
+
+    def test_to_result_initialization_error(self):
+        result = JUnit._to_result(WorkerResult(1, 1, [
+            WorkerTest('br.ufal.Foo_ESTest', 'initializationError', 'fail',
+                       0, 'java.lang.ClassNotFoundException')
+        ], 0.5, False))
+
+        self.assertEqual((0, 0, set()), result[:3])
+
+    def test_to_result_watchdog_timeout(self):
+        result = JUnit._to_result(WorkerResult(2, 1, [
+            WorkerTest('br.ufal.Foo_ESTest', 'test0', 'ok', 0.1, None),
+            WorkerTest('br.ufal.Foo_ESTest', 'test1', 'timeout', 3,
+                       'java.lang.ThreadDeath')
+        ], 3.5, False))
+
+        self.assertEqual({'Foo_ESTest#test1'}, result.fail_test_set)
+        self.assertTrue(result.timeout)
+        self.assertFalse(JUnit.check_pass(result))
+
+    def test_to_result_timeout(self):
+        result = JUnit._to_result(WorkerResult(0, 0, [], 80, True))
+
+        self.assertTrue(result.timeout)
+        self.assertFalse(JUnit.check_pass(result))
+
+
+Suite = namedtuple('Suite', ['suite_dir', 'suite_classes_dir',
+                             'test_classes'])
+
+
+class FakeWorker:
+
+    def __init__(self, killers=()):
+        self.killers = killers
+        self.requests = []
+        self.timeouts = []
+
+    def run(self, classpath, test_classes, timeout, mutant=None,
+            fail_fast=False, test_timeout=None):
+        self.requests.append((classpath, test_classes, mutant))
+        self.timeouts.append((timeout, test_timeout))
+        status = 'fail' if test_classes[0] in self.killers else 'ok'
+        return WorkerResult(1, int(status == 'fail'), [
+            WorkerTest(test_classes[0], 'test0', status, 0.1, None)
+        ], 0.1, False)
+
+
+class TestJUnitSchemata(TestCase):
+
+    def test_exec_with_schemata_mutant(self):
+        junit = JUnit(None, 'target/classes')
+        junit.worker = FakeWorker()
+
+        mutant = Mutant(7, 'AOR', '+', '-', 'sum()', 10, 'a - b',
+                        'mutants/7')
+        mutant.schemata = 'mutants/schemata'
+
+        result = junit.exec_with_mutant('suite', 'suite/classes',
+                                        'br.ufal.Foo', 'br.ufal.Foo_ESTest',
+                                        mutant)
+
+        classpath, test_classes, mutant_id = junit.worker.requests[0]
+        self.assertTrue(JUnit.check_pass(result))
+        self.assertEqual(7, mutant_id)
+        self.assertIn('mutants/schemata', classpath.split(os.pathsep))
+        self.assertNotIn('mutants/7', classpath.split(os.pathsep))
+
+
+class TestJUnitFailFast(TestCase):
+
+    def setUp(self):
+        self.suites = [Suite('s1', 's1/classes', ['A_ESTest', 'B_ESTest']),
+                       Suite('s2', 's2/classes', ['C_ESTest'])]
+        self.mutant = Mutant(1, 'AOR', '+', '-', 'sum()', 10, 'a - b',
+                             'mutants/1')
+
+    def _run(self, fail_fast):
+        junit = JUnit(None, 'target/classes')
+        junit.worker = FakeWorker(killers={'A_ESTest'})
+
+        result = junit.exec_suites_with_mutant(self.suites, 'Foo',
+                                               self.mutant,
+                                               fail_fast=fail_fast)
+
+        return result, [r[1][0] for r in junit.worker.requests]
+
+    def test_full_matrix(self):
+        result, test_classes = self._run(fail_fast=False)
+
+        self.assertFalse(JUnit.check_pass(result))
+        self.assertEqual(['A_ESTest', 'B_ESTest', 'C_ESTest'], test_classes)
+
+    def test_fail_fast(self):
+        result, test_classes = self._run(fail_fast=True)
+
+        self.assertFalse(JUnit.check_pass(result))
+        self.assertEqual({'A_ESTest#test0'}, result.fail_test_set)
+        self.assertEqual(['A_ESTest'], test_classes)
+
+
+class TestJUnitTimeouts(TestCase):
+
+    def test_timeouts_from_original_run(self):
+        junit = JUnit(None, 'target/classes')
+        junit.worker = FakeWorker()
+        mutant = Mutant(1, 'AOR', '+', '-', 'sum()', 10, 'a - b',
+                        'mutants/1')
+
+        junit.exec('suite', 'suite/classes', 'br.ufal.Foo',
+                   'br.ufal.Foo_ESTest')
+        junit.exec_with_mutant('suite', 'suite/classes', 'br.ufal.Foo',
+                               'br.ufal.Foo_ESTest', mutant)
+        junit.exec_with_mutant('suite', 'other/classes', 'br.ufal.Foo',
+                               'br.ufal.Foo_ESTest', mutant)
+
+        self.assertEqual([(80, None), (11, 3), (80, 3)],
+                         junit.worker.timeouts)
+
+    def test_timeouts_without_worker(self):
+        java = FakeJava()
+        junit = JUnit(java, 'target/classes')
+        mutant = Mutant(1, 'AOR', '+', '-', 'sum()', 10, 'a - b',
+                        'mutants/1')
+
+        with patch('hunor.tools.junit2.Worker.classes_dir',
+                   lambda java: 'worker'):
+            junit.exec('suite', 'suite/classes', 'br.ufal.Foo',
+                       'br.ufal.Foo_ESTest')
+            junit.exec_with_mutant('suite', 'suite/classes', 'br.ufal.Foo',
+                                   'br.ufal.Foo_ESTest', mutant)
+
+        self.assertNotIn('-Dhunor.timeout=3000', java.runs[0])
+        self.assertIn('-Dhunor.timeout=3000', java.runs[1])
+
+
+class FakeJava:
+
+    def __init__(self):
+        self.runs = []
+
+    @staticmethod
+    def get_env():
+        return {}
+
+    def exec_java_quiet(self, cwd, env, timeout, *args):
+        self.runs.append(args)
+        results = [a for a in args if a.startswith('-Dhunor.results=')][0]
+        with open(results.split('=', 1)[1], 'w') as f:
+            f.write(json.dumps({'event': 'test', 'class': args[-1],
+                                'method': 'test0', 'status': 'ok',
+                                'time': 100, 'exception': None}) + '\n')
+            f.write(json.dumps({'event': 'done', 'run': 1, 'fail': 0,
+                                'time': 100}) + '\n')
+            f.close()
+        return 0
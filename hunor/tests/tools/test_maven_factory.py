@@ -0,0 +1,149 @@
+import os
+import shutil
+import tempfile
+import subprocess
+
+from unittest import TestCase
+from unittest.mock import patch
+
+from hunor.tools.maven_factory import Maven
+
+
+COMPILED = b'[INFO] Compiling 2 source files to {0}\n'
+
+# Other tests replace subprocess.check_output without restoring it.
+CHECK_OUTPUT = subprocess.check_output
+
+
+class FakeJava:
+
+    java = 'java'
+
+    @staticmethod
+    def get_env():
+        return {}
+
+
+class TestMavenBuildCache(TestCase):
+
+    def setUp(self):
+        self.project_dir = tempfile.mkdtemp()
+        self.classes_dir = os.path.join(self.project_dir, 'target', 'classes')
+        os.makedirs(self.classes_dir)
+        os.makedirs(os.path.join(self.project_dir, 'src'))
+        self.source = os.path.join(self.project_dir, 'src', 'Foo.java')
+        self._write_source('class Foo {}')
+        self.commands = []
+
+        for target, value in [
+                ('hunor.tools.build_cache.BUILD_DIR', tempfile.mkdtemp()),
+                ('hunor.tools.build_cache._java_version',
+                 lambda java: b'1.8.0'),
+                ('hunor.tools.maven_factory.subprocess.check_output',
+                 self._check_output)]:
+            patcher = patch(target, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _write_source(self, source):
+        with open(self.source, 'w') as f:
+            f.write(source)
+            f.close()
+
+    def _check_output(self, command, **_):
+        self.commands.append(command[1:])
+        if command[-1] == 'compile':
+            return COMPILED.replace(b'{0}', self.classes_dir.encode())
+        return b''
+
+    def test_skip_compile_when_unchanged(self):
+        maven = Maven(FakeJava(), maven_home='/opt/maven', offline=True)
+
+        first = maven.compile(self.project_dir, clean=True)
+        second = maven.compile(self.project_dir)
+
+        self.assertEqual(first, second)
+        self.assertEqual(self.classes_dir, second.classes_dir)
+        self.assertEqual([['-o', '-version'], ['-o', 'clean'],
+                          ['-o', 'compile']], self.commands)
+
+    def test_clean_skips_cache(self):
+        maven = Maven(FakeJava(), maven_home='/opt/maven')
+
+        maven.compile(self.project_dir)
+        maven.compile(self.project_dir, clean=True)
+
+        self.assertEqual(1, self.commands.count(['clean']))
+        self.assertEqual(2, self.commands.count(['compile']))
+
+    def test_compile_when_classes_replaced(self):
+        maven = Maven(FakeJava(), maven_home='/opt/maven')
+
+        maven.compile(self.project_dir)
+        # An outside clean and build leaves classes without the stamp.
+        shutil.rmtree(self.classes_dir)
+        os.makedirs(self.classes_dir)
+        maven.compile(self.project_dir)
+
+        self.assertEqual(2, self.commands.count(['compile']))
+
+    def test_compile_when_changed(self):
+        maven = Maven(FakeJava(), maven_home='/opt/maven')
+
+        maven.compile(self.project_dir, clean=True)
+        self._write_source('class Foo { int a; }')
+        maven.compile(self.project_dir, clean=True)
+
+        self.assertEqual(2, self.commands.count(['clean']))
+        self.assertEqual(2, self.commands.count(['compile']))
+
+    def test_incremental_keeps_classes(self):
+        maven = Maven(FakeJava(), maven_home='/opt/maven', incremental=True)
+
+        maven.compile(self.project_dir, clean=True)
+        self._write_source('class Foo { int a; }')
+        maven.compile(self.project_dir, clean=True)
+
+        self.assertNotIn(['clean'], self.commands)
+        self.assertEqual(2, self.commands.count(['compile']))
+
+
+class TestMavenDaemon(TestCase):
+
+    def setUp(self):
+        self.maven_home = tempfile.mkdtemp()
+        self.mvnd_home = tempfile.mkdtemp()
+        self.calls = os.path.join(self.maven_home, 'calls')
+
+        # The daemon answers -version but fails every build.
+        self._stub(self.mvnd_home, 'mvnd',
+                   '[ "$1" = "-version" ] || exit 1')
+        self._stub(self.maven_home, 'mvn',
+                   'echo "mvn $*" >> {0}'.format(self.calls))
+
+        for patcher in [
+                patch.dict(os.environ, {'MVND_HOME': self.mvnd_home}),
+                patch('hunor.tools.maven_factory.subprocess.check_output',
+                      CHECK_OUTPUT)]:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    @staticmethod
+    def _stub(home, name, script):
+        os.makedirs(os.path.join(home, 'bin'))
+        path = os.path.join(home, 'bin', name)
+        with open(path, 'w') as f:
+            f.write('#!/bin/sh\n' + script + '\n')
+            f.close()
+        os.chmod(path, 0o755)
+
+    def test_retry_with_mvn_when_daemon_fails(self):
+        maven = Maven(FakeJava(), maven_home=self.maven_home, daemon=True)
+
+        output = maven.exec(self.maven_home, 10, 'test')
+
+        self.assertEqual(b'', output)
+        self.assertIsNone(maven.daemon)
+        with open(self.calls) as f:
+            self.assertEqual('mvn test\n', f.read())
+            f.close()
@@ -0,0 +1,68 @@
+import os
+import json
+import time
+import tempfile
+
+from unittest import TestCase
+
+from hunor.tools.suite_cache import SuiteCache
+
+
+def _write(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        f.write(content)
+
+
+class TestSuiteCache(TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.classes = os.path.join(self.dir, 'target', 'classes')
+        self.config_file = os.path.join(self.dir, 'config.json')
+        _write(os.path.join(self.classes, 'br', 'ufal', 'Foo.class'), 'foo')
+        _write(self.config_file, json.dumps(
+            {'randoop': {'parameters': ['--time-limit=60']}}))
+        self.cache = SuiteCache(os.path.join(self.dir, 'cache'), 1024)
+
+    def _key(self, seed=1):
+        return SuiteCache.key(self.classes, self.config_file, 'br.ufal.Foo',
+                              'randoop', seed)
+
+    def _suite(self, name, size=10):
+        suite_dir = os.path.join(self.dir, 'tests', name)
+        _write(os.path.join(suite_dir, 'classes', 'FooTest.class'),
+               'x' * size)
+        return suite_dir
+
+    def test_key(self):
+        key = self._key()
+
+        self.assertEqual(key, self._key())
+        self.assertNotEqual(key, self._key(seed=2))
+
+        _write(os.path.join(self.classes, 'br', 'ufal', 'Foo.class'), 'bar')
+        self.assertNotEqual(key, self._key())
+
+    def test_put_get(self):
+        suite_dir = self._suite('randoop_1')
+        self.cache.put(self._key(), suite_dir, {'classes': ['FooTest']})
+
+        restore_dir = os.path.join(self.dir, 'other', 'randoop_1')
+        entry = self.cache.get(self._key(), restore_dir)
+
+        self.assertEqual(['FooTest'], entry['classes'])
+        self.assertTrue(os.path.exists(
+            os.path.join(restore_dir, 'classes', 'FooTest.class')))
+        self.assertIsNone(self.cache.get(self._key(seed=2), restore_dir))
+
+    def test_evict(self):
+        self.cache.put(self._key(1), self._suite('randoop_1', 400), {})
+        time.sleep(0.01)
+        self.cache.put(self._key(2), self._suite('randoop_2', 400), {})
+        time.sleep(0.01)
+        self.cache.get(self._key(1), os.path.join(self.dir, 'r'))
+        self.cache.put(self._key(3), self._suite('randoop_3', 400), {})
+
+        self.assertEqual(sorted([self._key(1), self._key(3)]),
+                         sorted(os.listdir(self.cache.cache_dir)))
@@ -0,0 +1,35 @@
+import os
+import tempfile
+
+from unittest import TestCase
+from concurrent.futures import ThreadPoolExecutor
+
+from hunor.tools.suite_generator import SuiteGenerator
+
+
+class FakeGenerator(SuiteGenerator):
+
+    def _exec_tool(self):
+        pass
+
+    def _test_classes(self):
+        return []
+
+    @staticmethod
+    def _get_tool_name():
+        return 'fake'
+
+
+class TestSuiteGenerator(TestCase):
+
+    def test_concurrent_suite_names(self):
+        tests_src = tempfile.mkdtemp()
+        os.mkdir(os.path.join(tests_src, 'fake_1'))
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            names = list(executor.map(
+                lambda _: FakeGenerator(None, None, tests_src,
+                                        'Foo').suite_name, range(32)))
+
+        self.assertEqual(32, len(set(names)))
+        self.assertNotIn('fake_1', names)
@@ -0,0 +1,67 @@
+import os
+import json
+import tempfile
+
+from unittest import TestCase
+from collections import namedtuple
+
+from hunor.tools.tce import TCE
+from hunor.tests.mutation import make_mutant
+
+
+Options = namedtuple('Options', ['config_file', 'mutants'])
+Build = namedtuple('Build', ['classes_dir'])
+
+# The fake optimizer maps each class to this, so 1 is equivalent.
+OPTIMIZED = {b'original': b'opt', b'mutant 1': b'opt', b'mutant 2': b'opt 2'}
+
+
+class TestTCE(TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        config_file = os.path.join(self.dir, 'config.json')
+        with open(config_file, 'w') as f:
+            f.write(json.dumps({'source': [self.dir]}))
+
+        self.tce = TCE(Options(config_file, self.dir), Build('classes'),
+                       {'directory': 'Foo/1', 'class': 'br.ufal.Foo'})
+        self.mutants = [make_mutant(str(i)) for i in (1, 2)]
+
+        self._write_class('ORIGINAL', b'original')
+        for mutant in self.mutants:
+            self._write_class(mutant.id, 'mutant {0}'.format(mutant.id)
+                              .encode())
+
+        self.runs = []
+        self.tce.run_soot_all = self._run_soot_all
+
+    def _write_class(self, mid, content, opt=False):
+        path = os.path.join(self.dir, 'Foo', '1', mid,
+                            *(['opt'] if opt else []), 'br', 'ufal',
+                            'Foo.class')
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(content)
+
+    def _run_soot_all(self, mids):
+        self.runs.append(mids)
+        for mid in mids:
+            with open(os.path.join(self.tce._override_file_dir(mid), 'br',
+                                   'ufal', 'Foo.class'), 'rb') as f:
+                self._write_class(mid, OPTIMIZED[f.read()], opt=True)
+
+    def test_run_all(self):
+        self.assertEqual({'1'}, self.tce.run_all(self.mutants))
+        self.assertEqual([['ORIGINAL', '1', '2']], self.runs)
+
+    def test_cached(self):
+        self.tce.run_all(self.mutants)
+        self._write_class('2', b'mutant 1')
+
+        self.assertEqual({'1', '2'}, self.tce.run_all(self.mutants))
+        self.assertEqual([['ORIGINAL', '1', '2'], ['2']], self.runs)
+
+    def test_no_survivors(self):
+        self.assertEqual(set(), self.tce.run_all([]))
+        self.assertEqual([], self.runs)
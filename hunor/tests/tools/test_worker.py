@@ -0,0 +1,98 @@
+import os
+import queue
+import tempfile
+
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+from hunor.tools.worker import Worker, WorkerException, read_results
+
+
+class TestReadResults(TestCase):
+
+    def setUp(self):
+        fd, self.results = tempfile.mkstemp(suffix='.jsonl')
+        os.close(fd)
+
+    def tearDown(self):
+        os.remove(self.results)
+
+    def _write(self, *lines):
+        with open(self.results, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(lines))
+            f.close()
+
+    def test_read_results(self):
+        self._write(
+            '{"event": "test", "class": "br.ufal.Foo_ESTest", '
+            '"method": "test0", "status": "ok", "time": 100, '
+            '"exception": null}',
+            '{"event": "test", "class": "br.ufal.Foo_ESTest", '
+            '"method": "sum_returnsZero(int)", "status": "fail", '
+            '"time": 20, "exception": "java.lang.AssertionError"}',
+            '{"event": "done", "run": 2, "fail": 1, "time": 500}')
+
+        result = read_results(self.results, 3)
+
+        self.assertEqual((2, 1, 0.5, False), (result.run_count,
+                                              result.fail_count,
+                                              result.run_time,
+                                              result.timeout))
+        self.assertEqual('sum_returnsZero(int)', result.tests[1].method)
+        self.assertEqual('java.lang.AssertionError',
+                         result.tests[1].exception)
+
+    def test_read_results_truncated(self):
+        self._write(
+            '{"event": "test", "class": "br.ufal.Foo_ESTest", '
+            '"method": "test0", "status": "ok", "time": 100, '
+            '"exception": null}',
+            '{"event": "test", "class": "br.ufal.Foo_ESTest", '
+            '"method": "test1", "status": "timeout", "time": 3000, '
+            '"exception": "java.lang.ThreadDeath"}',
+            '{"event": "test", "class": "br.ufal.Foo_E')
+
+        result = read_results(self.results, 3)
+
+        self.assertEqual((2, 1, 3), (result.run_count, result.fail_count,
+                                     result.run_time))
+        self.assertEqual(['test0', 'test1'],
+                         [t.method for t in result.tests])
+
+    def test_read_results_empty(self):
+        result = read_results(self.results, 3)
+
+        self.assertEqual((0, 0, []), result[:3])
+
+
+class TestWorker(TestCase):
+
+    def test_send_to_dead_worker(self):
+        worker = Worker(None)
+        process = MagicMock()
+        process.stdin.write.side_effect = BrokenPipeError()
+        worker.process = process
+
+        with self.assertRaises(WorkerException):
+            worker._send('run', '.', 'br.ufal.Foo_ESTest')
+
+        process.kill.assert_called_once_with()
+        self.assertIsNone(worker.process)
+
+    def test_compile_diagnostics(self):
+        worker = Worker(None)
+        worker.process = MagicMock()
+        worker.process.poll.return_value = None
+        worker.lines = queue.Queue()
+        for line in ['diagnostic\tFoo.java:3: error: \';\' expected\\n'
+                     '    int a = b\\n             ^',
+                     'compiled\tfail\t1']:
+            worker.lines.put(line)
+
+        result = worker.compile('classes', 'mutants/1',
+                                ['mutants/1/Foo.java'], 1)
+
+        self.assertFalse(result.success)
+        self.assertEqual(["Foo.java:3: error: ';' expected\n"
+                          "    int a = b\n             ^"],
+                         result.diagnostics)
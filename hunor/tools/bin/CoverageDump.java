@@ -0,0 +1,77 @@
+import java.io.File;
+import java.util.ArrayList;
+import java.util.LinkedHashSet;
+import java.util.List;
+import java.util.Set;
+
+import mockit.coverage.CallPoint;
+import mockit.coverage.data.CoverageData;
+import mockit.coverage.data.FileCoverageData;
+import mockit.coverage.lines.BranchCoverageData;
+import mockit.coverage.lines.LineCoverageData;
+import mockit.coverage.lines.PerFileLineCoverage;
+
+/**
+ * Prints the tests covering each line of a source file, read from the
+ * coverage.ser file JMockit writes with -Dcoverage-output=serial-append.
+ * The serial output keeps the call points of every line, like the HTML
+ * report, without rendering a page per class. Usage:
+ *
+ *   CoverageDump coverage.ser br/ufal/Foo.java
+ *
+ * Each call point is one line, with tab separated fields:
+ *
+ *   line  TestClass#method
+ */
+public class CoverageDump {
+
+    private static final String SEP = "\t";
+
+    public static void main(String[] args) throws Exception {
+        CoverageData data = CoverageData.readDataFromFile(new File(args[0]));
+        FileCoverageData file = data.getFileToFileDataMap().get(args[1]);
+
+        if (file == null) {
+            return;
+        }
+
+        PerFileLineCoverage lines = file.getLineCoverageData();
+
+        for (int line = 1; line <= lines.getLineCount(); line++) {
+            if (!lines.hasLineData(line)) {
+                continue;
+            }
+
+            for (String test : tests(lines.getLineData(line))) {
+                System.out.println(line + SEP + test);
+            }
+        }
+    }
+
+    private static Set<String> tests(LineCoverageData line) {
+        List<CallPoint> callPoints = new ArrayList<CallPoint>();
+
+        if (line.containsCallPoints()) {
+            callPoints.addAll(line.getCallPoints());
+        }
+
+        if (line.containsBranches()) {
+            for (BranchCoverageData branch : line.getBranches()) {
+                if (branch.containsCallPoints()) {
+                    callPoints.addAll(branch.getCallPoints());
+                }
+            }
+        }
+
+        Set<String> tests = new LinkedHashSet<String>();
+
+        for (CallPoint callPoint : callPoints) {
+            StackTraceElement ste = callPoint.getStackTraceElement();
+            String testClass = ste.getClassName();
+            tests.add(testClass.substring(testClass.lastIndexOf('.') + 1)
+                      + "#" + ste.getMethodName());
+        }
+
+        return tests;
+    }
+}
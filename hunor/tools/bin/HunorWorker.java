@@ -0,0 +1,567 @@
+import java.io.BufferedReader;
+import java.io.File;
+import java.io.FileDescriptor;
+import java.io.FileOutputStream;
+import java.io.IOException;
+import java.io.InputStreamReader;
+import java.io.PrintStream;
+import java.net.MalformedURLException;
+import java.net.URL;
+import java.net.URLClassLoader;
+import java.nio.charset.StandardCharsets;
+import java.security.Permission;
+import java.util.ArrayList;
+import java.util.Arrays;
+import java.util.HashMap;
+import java.util.HashSet;
+import java.util.List;
+import java.util.Map;
+import java.util.Set;
+
+import javax.tools.Diagnostic;
+import javax.tools.DiagnosticCollector;
+import javax.tools.JavaCompiler;
+import javax.tools.JavaFileObject;
+import javax.tools.StandardJavaFileManager;
+import javax.tools.ToolProvider;
+
+import org.junit.internal.TextListener;
+import org.junit.runner.Description;
+import org.junit.runner.Request;
+import org.junit.runner.Result;
+import org.junit.runner.Runner;
+import org.junit.runner.manipulation.Filter;
+import org.junit.runner.notification.Failure;
+import org.junit.runner.notification.RunListener;
+import org.junit.runner.notification.RunNotifier;
+import org.junit.runner.notification.StoppedByUserException;
+
+/**
+ * Long-lived JUnit runner used by hunor to avoid starting one JVM for each
+ * test class. Requests are read from stdin, one per line, with tab separated
+ * fields:
+ *
+ *   run      classpath  test_class [test_class ...]
+ *   mutant   mutant_id  classpath  test_class [test_class ...]
+ *   compile  classpath  output_dir  java_file [java_file ...]
+ *   failfast on|off
+ *   timeout  millis
+ *   quit
+ *
+ * A test class may be followed by a comma separated list of test methods,
+ * as in br.ufal.Foo_ESTest#test0,test3, to run only those tests. If any of
+ * them is not a test of the class (e.g. a setUp method, reached by every
+ * test), the whole class runs.
+ *
+ * Each executed test writes one "test" line and each run request ends with a
+ * "done" line. With failfast on, later runs stop at the first failing test.
+ * Test classes are loaded by a fresh class loader, so the static state of
+ * the program under test never leaks between requests.
+ *
+ * Tests run on their own thread group. With a timeout set, a watchdog stops
+ * every thread of the group once a test runs for longer than that, and the
+ * test is reported with the "timeout" status. A mutant stuck in a loop does
+ * not cost the whole JVM. If a thread survives the stop, the worker exits
+ * after answering, so hunor starts a new one.
+ *
+ * A mutant request runs the tests against a conditional mutation (schemata)
+ * build, in the style of Major: the classpath holds every mutant of the
+ * target and major.mutation.Config.__M_NO selects the one to execute. When
+ * called with arguments the worker is a drop-in replacement for JUnitCore
+ * that selects the mutant given by the hunor.mutant system property, stops
+ * at the first failure when hunor.failfast is true and takes the test
+ * timeout, in milliseconds, from hunor.timeout. With hunor.results set, the
+ * results go to that file instead of stdout, one JSON object per line with
+ * the same fields as the "test" and "done" lines.
+ *
+ * A compile request writes one "diagnostic" line for each compile error,
+ * with backslashes, tabs and line breaks escaped as \\, \t and \n, then
+ * one "compiled" line with the status and the number of errors. The system
+ * Java compiler and its file manager are kept between requests, so only the
+ * first compilation pays for loading javac.
+ */
+public class HunorWorker {
+
+    private static final String SEP = "\t";
+    private static final String MUTANT_CONFIG = "major.mutation.Config";
+    private static final String MUTANT_FIELD = "__M_NO";
+    private static final String MUTANT_PROPERTY = "hunor.mutant";
+    private static final String FAIL_FAST_PROPERTY = "hunor.failfast";
+    private static final String TIMEOUT_PROPERTY = "hunor.timeout";
+    private static final String RESULTS_PROPERTY = "hunor.results";
+    private static final long WATCHDOG_POLL = 100;
+
+    private static boolean failFast = false;
+    private static long testTimeout = 0;
+    private static volatile boolean leaked = false;
+    private static JavaCompiler compiler;
+    private static StandardJavaFileManager fileManager;
+
+    public static void main(String[] args) throws Exception {
+        if (args.length > 0) {
+            String results = System.getProperty(RESULTS_PROPERTY);
+            if (results != null) {
+                run(new JsonListener(new PrintStream(
+                        new FileOutputStream(results), true, "UTF-8")),
+                        System.getProperty(MUTANT_PROPERTY), null, args);
+                System.exit(0);
+            }
+
+            ClassLoader loader = HunorWorker.class.getClassLoader();
+            selectMutant(loader, System.getProperty(MUTANT_PROPERTY));
+
+            Result result = runTests(request(loader, args),
+                    new TextListener(System.out),
+                    Boolean.getBoolean(FAIL_FAST_PROPERTY),
+                    Long.getLong(TIMEOUT_PROPERTY, 0));
+
+            System.exit(result.wasSuccessful() ? 0 : 1);
+        }
+
+        PrintStream out = new PrintStream(
+                new FileOutputStream(FileDescriptor.out), true, "UTF-8");
+        BufferedReader in = new BufferedReader(
+                new InputStreamReader(System.in, "UTF-8"));
+
+        // Tests must not write into the protocol channel nor stop the JVM.
+        System.setOut(System.err);
+        System.setSecurityManager(new NoExitSecurityManager());
+
+        String line;
+        while ((line = in.readLine()) != null) {
+            String[] request = line.split(SEP);
+
+            if ("quit".equals(request[0])) {
+                break;
+            } else if ("run".equals(request[0]) && request.length > 2) {
+                run(new ResultListener(out), null, request[1],
+                        Arrays.copyOfRange(request, 2, request.length));
+            } else if ("mutant".equals(request[0]) && request.length > 3) {
+                run(new ResultListener(out), request[1], request[2],
+                        Arrays.copyOfRange(request, 3, request.length));
+            } else if ("compile".equals(request[0]) && request.length > 3) {
+                compile(out, request);
+            } else if ("failfast".equals(request[0]) && request.length > 1) {
+                failFast = "on".equals(request[1]);
+            } else if ("timeout".equals(request[0]) && request.length > 1) {
+                testTimeout = Long.parseLong(request[1]);
+            } else {
+                out.println("error" + SEP + "invalid request: " + request[0]);
+            }
+
+            if (leaked) {
+                // A timed out test left threads running, hunor starts a new
+                // worker for the next request.
+                break;
+            }
+        }
+
+        Runtime.getRuntime().halt(0);
+    }
+
+    private static void run(ResultListener listener, String mutant,
+                            String classpath, String[] testClasses) {
+        long start = System.currentTimeMillis();
+        ClassLoader contextLoader = Thread.currentThread()
+                .getContextClassLoader();
+        URLClassLoader loader = null;
+
+        try {
+            // Without a classpath the tests are already on the JVM's one.
+            ClassLoader parent = HunorWorker.class.getClassLoader();
+            if (classpath != null) {
+                loader = new URLClassLoader(toURLs(classpath), parent);
+                Thread.currentThread().setContextClassLoader(loader);
+            }
+            selectMutant(loader != null ? loader : parent, mutant);
+
+            Result result = runTests(
+                    request(loader != null ? loader : parent, testClasses),
+                    listener, classpath == null
+                            ? Boolean.getBoolean(FAIL_FAST_PROPERTY)
+                            : failFast,
+                    classpath == null ? Long.getLong(TIMEOUT_PROPERTY, 0)
+                            : testTimeout);
+
+            listener.done(result.getRunCount(), result.getFailureCount(),
+                    System.currentTimeMillis() - start);
+        } catch (Throwable t) {
+            listener.print(testClasses[testClasses.length - 1],
+                    "initializationError", "fail", 0, t);
+            listener.done(0, 1, System.currentTimeMillis() - start);
+        } finally {
+            Thread.currentThread().setContextClassLoader(contextLoader);
+            close(loader);
+        }
+    }
+
+    private static Result runTests(Request request, RunListener listener,
+                                   boolean failFast, long testTimeout)
+            throws InterruptedException {
+        final Runner runner = request.getRunner();
+        final RunNotifier notifier = new RunNotifier();
+        Result result = new Result();
+        Watchdog watchdog = new Watchdog();
+
+        notifier.addFirstListener(result.createListener());
+        notifier.addListener(watchdog);
+        notifier.addListener(listener);
+        if (failFast) {
+            notifier.addListener(new StopListener(notifier));
+        }
+
+        notifier.fireTestRunStarted(runner.getDescription());
+
+        // Threads started by the tests, like the ones of JUnit's own
+        // @Test(timeout) support, join this group and are stopped with it.
+        ThreadGroup group = new ThreadGroup("hunor-tests");
+        Thread tests = new Thread(group, new Runnable() {
+            @Override
+            public void run() {
+                try {
+                    runner.run(notifier);
+                } catch (StoppedByUserException e) {
+                    // Stopped at the first failure, the result is known.
+                }
+            }
+        }, "hunor-tests");
+        tests.setDaemon(true);
+        tests.start();
+        watchdog.watch(tests, group, testTimeout);
+
+        if (watchdog.fired) {
+            Watchdog.stop(group);
+            Thread.sleep(WATCHDOG_POLL);
+            leaked = group.activeCount() > 0;
+        }
+
+        notifier.fireTestRunFinished(result);
+
+        return result;
+    }
+
+    private static Request request(ClassLoader loader, String[] testClasses)
+            throws ClassNotFoundException {
+        Class<?>[] classes = new Class<?>[testClasses.length];
+        Map<String, Set<String>> methods = new HashMap<String, Set<String>>();
+
+        for (int i = 0; i < testClasses.length; i++) {
+            String[] test = testClasses[i].split("#", 2);
+            classes[i] = Class.forName(test[0], false, loader);
+            if (test.length > 1) {
+                Set<String> selected = new HashSet<String>(
+                        Arrays.asList(test[1].split(",")));
+                if (testMethods(classes[i]).containsAll(selected)) {
+                    methods.put(test[0], selected);
+                }
+            }
+        }
+
+        Request request = Request.classes(classes);
+        return methods.isEmpty() ? request
+                : request.filterWith(new MethodFilter(methods));
+    }
+
+    private static Set<String> testMethods(Class<?> testClass) {
+        Set<String> tests = new HashSet<String>();
+        List<Description> descriptions = new ArrayList<Description>();
+        descriptions.add(Request.aClass(testClass).getRunner()
+                .getDescription());
+
+        while (!descriptions.isEmpty()) {
+            Description description = descriptions.remove(0);
+            if (description.isTest()) {
+                tests.add(description.getMethodName());
+            }
+            descriptions.addAll(description.getChildren());
+        }
+        return tests;
+    }
+
+    private static void selectMutant(ClassLoader loader, String mutant)
+            throws Exception {
+        if (mutant != null) {
+            Class.forName(MUTANT_CONFIG, true, loader).getField(MUTANT_FIELD)
+                    .setInt(null, Integer.parseInt(mutant));
+        }
+    }
+
+    private static void compile(PrintStream out, String[] request) {
+        try {
+            if (compiler == null) {
+                compiler = ToolProvider.getSystemJavaCompiler();
+                if (compiler == null) {
+                    out.println("error" + SEP + "java compiler not found");
+                    return;
+                }
+                fileManager = compiler.getStandardFileManager(null, null,
+                        StandardCharsets.UTF_8);
+            }
+
+            List<File> files = new ArrayList<File>();
+            for (int i = 3; i < request.length; i++) {
+                files.add(new File(request[i]));
+            }
+
+            DiagnosticCollector<JavaFileObject> diagnostics =
+                    new DiagnosticCollector<JavaFileObject>();
+            List<String> options = Arrays.asList("-nowarn", "-classpath",
+                    request[1], "-d", request[2]);
+
+            boolean success = compiler.getTask(null, fileManager, diagnostics,
+                    options, null,
+                    fileManager.getJavaFileObjectsFromFiles(files)).call();
+
+            int errors = 0;
+            for (Diagnostic<? extends JavaFileObject> d
+                    : diagnostics.getDiagnostics()) {
+                if (d.getKind() == Diagnostic.Kind.ERROR) {
+                    errors++;
+                    out.println("diagnostic" + SEP + escape(d.toString()));
+                }
+            }
+
+            out.println("compiled" + SEP + (success ? "ok" : "fail") + SEP
+                    + errors);
+        } catch (Throwable t) {
+            out.println("diagnostic" + SEP + escape(t.toString()));
+            out.println("compiled" + SEP + "fail" + SEP + 1);
+        }
+    }
+
+    private static String escape(String text) {
+        return text.replace("\\", "\\\\").replace("\t", "\\t")
+                .replace("\r", "").replace("\n", "\\n");
+    }
+
+    private static URL[] toURLs(String classpath)
+            throws MalformedURLException {
+        String[] entries = classpath.split(File.pathSeparator);
+        URL[] urls = new URL[entries.length];
+
+        for (int i = 0; i < entries.length; i++) {
+            urls[i] = new File(entries[i]).toURI().toURL();
+        }
+
+        return urls;
+    }
+
+    private static void close(URLClassLoader loader) {
+        if (loader != null) {
+            try {
+                loader.close();
+            } catch (IOException e) {
+                e.printStackTrace();
+            }
+        }
+    }
+
+    private static class ResultListener extends RunListener {
+
+        protected final PrintStream out;
+        private long started;
+        private Failure failure;
+
+        ResultListener(PrintStream out) {
+            this.out = out;
+        }
+
+        @Override
+        public void testStarted(Description description) {
+            started = System.currentTimeMillis();
+            failure = null;
+        }
+
+        @Override
+        public void testFailure(Failure failure) {
+            if (failure.getDescription().getMethodName() == null) {
+                // Class level failures (e.g. @BeforeClass) have no test.
+                print(failure.getDescription(), "fail", 0, failure);
+            } else {
+                this.failure = failure;
+            }
+        }
+
+        @Override
+        public void testFinished(Description description) {
+            String status = "ok";
+            if (failure != null) {
+                status = failure.getException() instanceof ThreadDeath
+                        ? "timeout" : "fail";
+            }
+            print(description, status, System.currentTimeMillis() - started,
+                    failure);
+            failure = null;
+        }
+
+        @Override
+        public void testIgnored(Description description) {
+            print(description, "ignored", 0, null);
+        }
+
+        private void print(Description description, String status,
+                           long runTime, Failure failure) {
+            print(description.getClassName(), description.getMethodName(),
+                    status, runTime,
+                    failure == null ? null : failure.getException());
+        }
+
+        void print(String testClass, String method, String status,
+                   long runTime, Throwable exception) {
+            out.println("test" + SEP + testClass + SEP + method + SEP
+                    + status + SEP + runTime + SEP
+                    + (exception == null ? ""
+                       : exception.getClass().getName()));
+        }
+
+        void done(int runCount, int failCount, long runTime) {
+            out.println("done" + SEP + runCount + SEP + failCount + SEP
+                    + runTime);
+        }
+    }
+
+    private static class JsonListener extends ResultListener {
+
+        JsonListener(PrintStream out) {
+            super(out);
+        }
+
+        @Override
+        void print(String testClass, String method, String status,
+                   long runTime, Throwable exception) {
+            out.println("{\"event\": \"test\", \"class\": " + json(testClass)
+                    + ", \"method\": " + json(method)
+                    + ", \"status\": " + json(status)
+                    + ", \"time\": " + runTime
+                    + ", \"exception\": " + json(exception == null ? null
+                            : exception.getClass().getName()) + "}");
+        }
+
+        @Override
+        void done(int runCount, int failCount, long runTime) {
+            out.println("{\"event\": \"done\", \"run\": " + runCount
+                    + ", \"fail\": " + failCount + ", \"time\": " + runTime
+                    + "}");
+        }
+
+        private static String json(String value) {
+            if (value == null) {
+                return "null";
+            }
+
+            StringBuilder json = new StringBuilder("\"");
+            for (char c : value.toCharArray()) {
+                if (c == '"' || c == '\\') {
+                    json.append('\\').append(c);
+                } else if (c < 0x20) {
+                    json.append(String.format("\\u%04x", (int) c));
+                } else {
+                    json.append(c);
+                }
+            }
+            return json.append('"').toString();
+        }
+    }
+
+    private static class Watchdog extends RunListener {
+
+        private volatile long started = 0;
+        private boolean fired = false;
+
+        @Override
+        public void testStarted(Description description) {
+            started = System.currentTimeMillis();
+        }
+
+        @Override
+        public void testFinished(Description description) {
+            started = 0;
+        }
+
+        void watch(Thread tests, ThreadGroup group, long timeout)
+                throws InterruptedException {
+            while (tests.isAlive()) {
+                tests.join(timeout > 0 ? Math.min(timeout, WATCHDOG_POLL) : 0);
+
+                long begin = started;
+                if (timeout > 0 && begin > 0
+                        && System.currentTimeMillis() - begin > timeout) {
+                    // Rearm, a test that swallows the stop gets another one.
+                    started = System.currentTimeMillis();
+                    fired = true;
+                    stop(group);
+                }
+            }
+        }
+
+        @SuppressWarnings("deprecation")
+        private static void stop(ThreadGroup group) {
+            try {
+                group.stop();
+            } catch (UnsupportedOperationException e) {
+                // Newer JVMs cannot stop threads, the caller's deadline
+                // kills the whole JVM instead.
+            }
+        }
+    }
+
+    private static class StopListener extends RunListener {
+
+        private final RunNotifier notifier;
+
+        StopListener(RunNotifier notifier) {
+            this.notifier = notifier;
+        }
+
+        @Override
+        public void testFailure(Failure failure) {
+            notifier.pleaseStop();
+        }
+    }
+
+    private static class MethodFilter extends Filter {
+
+        private final Map<String, Set<String>> methods;
+
+        MethodFilter(Map<String, Set<String>> methods) {
+            this.methods = methods;
+        }
+
+        @Override
+        public boolean shouldRun(Description description) {
+            if (!description.isTest()) {
+                for (Description child : description.getChildren()) {
+                    if (shouldRun(child)) {
+                        return true;
+                    }
+                }
+                return false;
+            }
+
+            Set<String> selected = methods.get(description.getClassName());
+            return selected == null
+                    || selected.contains(description.getMethodName());
+        }
+
+        @Override
+        public String describe() {
+            return "methods " + methods;
+        }
+    }
+
+    private static class NoExitSecurityManager extends SecurityManager {
+
+        @Override
+        public void checkPermission(Permission perm) {
+        }
+
+        @Override
+        public void checkPermission(Permission perm, Object context) {
+        }
+
+        @Override
+        public void checkExit(int status) {
+            throw new SecurityException("System.exit() called by a test.");
+        }
+    }
+}
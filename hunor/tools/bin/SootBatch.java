@@ -0,0 +1,52 @@
+import java.io.BufferedReader;
+import java.io.FileInputStream;
+import java.io.InputStreamReader;
+import java.util.ArrayList;
+import java.util.Arrays;
+import java.util.List;
+
+import soot.G;
+
+/**
+ * Runs Soot over several versions of a class in a single JVM, hunor uses it
+ * to optimize the original program and the mutants of a target for TCE.
+ * The batch file given as argument holds one job per line, with tab
+ * separated fields:
+ *
+ *   classpath  output_dir  class_name  [soot_option ...]
+ *
+ * Each job writes one "optimized" line with ok or fail and its output
+ * directory. Soot keeps its state in singletons, G.reset() clears them
+ * before every job so the versions never see each other.
+ */
+public class SootBatch {
+
+    private static final String SEP = "\t";
+
+    public static void main(String[] args) throws Exception {
+        BufferedReader in = new BufferedReader(new InputStreamReader(
+                new FileInputStream(args[0]), "UTF-8"));
+
+        String line;
+        while ((line = in.readLine()) != null) {
+            String[] job = line.split(SEP);
+            String status = "ok";
+
+            try {
+                List<String> options = new ArrayList<String>(Arrays.asList(
+                        "-cp", job[0], "-d", job[1], "-O", job[2]));
+                options.addAll(Arrays.asList(job).subList(3, job.length));
+
+                G.reset();
+                soot.Main.main(options.toArray(new String[options.size()]));
+            } catch (Throwable t) {
+                t.printStackTrace();
+                status = "fail";
+            }
+
+            System.out.println("optimized" + SEP + status + SEP + job[1]);
+        }
+
+        in.close();
+    }
+}
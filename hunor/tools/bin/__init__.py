@@ -14,8 +14,13 @@ MUJAVA = os.path.join(PATH, 'mujava.jar')
 COMMONSIO = os.path.join(PATH, 'commons-io-2.4.jar')
 OPENJAVA = os.path.join(PATH, 'openjava.jar')
 SOOT = os.path.join(PATH, 'soot-3.3.0-jar-with-dependencies.jar')
+WORKER = os.path.join(PATH, 'HunorWorker.java')
+SOOT_BATCH = os.path.join(PATH, 'SootBatch.java')
+COVERAGE_DUMP = os.path.join(PATH, 'CoverageDump.java')
+MAJOR_CONFIG = os.path.join(PATH, 'major', 'config', 'config.jar')
 
 
 __all__ = ['JUNIT', 'HAMCREST', 'EVOSUITE', 'EVOSUITE_RUNTIME',
            'JMOCKIT', 'RANDOOP', 'SAFIRA', 'MUJAVA', 'COMMONSIO',
-           'OPENJAVA', 'SOOT']
+           'OPENJAVA', 'SOOT', 'WORKER', 'SOOT_BATCH',
+           'COVERAGE_DUMP', 'MAJOR_CONFIG']
@@ -0,0 +1,103 @@
+import os
+import json
+import hashlib
+import subprocess
+
+
+BUILD_DIR = os.path.join(os.path.expanduser('~'), '.hunor', 'build')
+STAMP_FILE = '.hunor-build'
+CHUNK_SIZE = 1024 * 1024
+
+_java_versions = {}
+
+
+def fingerprint(project_dir, java):
+    project_dir = os.path.abspath(project_dir)
+    key = hashlib.sha256(_java_version(java))
+
+    sources = [os.path.join(project_dir, 'pom.xml')]
+    for root, _, files in os.walk(os.path.join(project_dir, 'src')):
+        sources += [os.path.join(root, file) for file in files]
+
+    for source in sorted(sources):
+        if os.path.isfile(source):
+            key.update(os.path.relpath(source, project_dir).encode('utf-8')
+                       + b'\0')
+            key.update(_file_digest(source))
+
+    return key.hexdigest()
+
+
+def read_build(project_dir, key):
+    build_file = _build_file(project_dir)
+
+    if not os.path.exists(build_file):
+        return None
+
+    with open(build_file) as f:
+        entry = json.loads(f.read())
+        f.close()
+
+    # A clean or an outside build since the last one leaves the classes
+    # without our stamp.
+    if (entry['fingerprint'] != key
+            or _read_stamp(entry['build']['classes_dir']) != key):
+        return None
+
+    return entry['build']
+
+
+def write_build(project_dir, key, build):
+    os.makedirs(BUILD_DIR, exist_ok=True)
+
+    if os.path.isdir(build['classes_dir']):
+        with open(os.path.join(build['classes_dir'], STAMP_FILE), 'w') as f:
+            f.write(key)
+            f.close()
+
+    with open(_build_file(project_dir), 'w') as f:
+        f.write(json.dumps({'project_dir': os.path.abspath(project_dir),
+                            'fingerprint': key, 'build': build}, indent=2))
+        f.close()
+
+
+def _read_stamp(classes_dir):
+    stamp_file = os.path.join(classes_dir, STAMP_FILE)
+
+    if not os.path.exists(stamp_file):
+        return None
+
+    with open(stamp_file) as f:
+        stamp = f.read()
+        f.close()
+
+    return stamp
+
+
+def _build_file(project_dir):
+    digest = hashlib.sha1(
+        os.path.abspath(project_dir).encode('utf-8')).hexdigest()[:12]
+
+    return os.path.join(BUILD_DIR, digest + '.json')
+
+
+def _java_version(java):
+    if java not in _java_versions:
+        try:
+            _java_versions[java] = subprocess.check_output(
+                [java, '-version'], stderr=subprocess.STDOUT)
+        except (OSError, subprocess.CalledProcessError):
+            _java_versions[java] = java.encode('utf-8')
+
+    return _java_versions[java]
+
+
+def _file_digest(path):
+    digest = hashlib.sha256()
+
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+        f.close()
+
+    return digest.digest()
@@ -0,0 +1,144 @@
+import os
+import re
+import json
+import subprocess
+
+from html.parser import HTMLParser
+
+from hunor.tools.bin import JMOCKIT, COVERAGE_DUMP
+from hunor.tools.worker import compiled_classes_dir
+from hunor.utils import generate_classpath
+
+
+COVERAGE_FILE = 'coverage.json'
+SERIAL_FILE = 'coverage.ser'
+CHUNK_SIZE = 64 * 1024
+DUMP_TIMEOUT = 60
+
+_cache = {}
+
+
+class ReportParser(HTMLParser):
+
+    def __init__(self):
+        super().__init__()
+        self.lines = {}
+        self._row = None
+        self._field = None
+        self._text = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'tr':
+            self._row = {'line': None, 'callpoints': False, 'tests': set()}
+        elif self._row is not None:
+            if tag == 'td':
+                classes = (dict(attrs).get('class') or '').split()
+                if 'line' in classes:
+                    self._start_field('line')
+                if 'callpoints-count' in classes:
+                    self._row['callpoints'] = True
+            elif tag == 'li':
+                self._end_li()
+                self._start_field('li')
+
+    def handle_endtag(self, tag):
+        if self._row is None:
+            return
+
+        if tag == 'td' and self._field == 'line':
+            self._row['line'] = ''.join(self._text).strip()
+            self._field = None
+        elif tag in ('li', 'ol', 'ul'):
+            self._end_li()
+        elif tag == 'tr':
+            self._end_li()
+            if self._row['line'] and self._row['callpoints']:
+                self.lines.setdefault(int(self._row['line']), set()).update(
+                    self._row['tests'])
+            self._row = None
+
+    def handle_data(self, data):
+        if self._field is not None:
+            self._text.append(data)
+
+    def _start_field(self, field):
+        self._field = field
+        self._text = []
+
+    def _end_li(self):
+        if self._field == 'li':
+            test = _extract_li_id(''.join(self._text))
+            if test is not None:
+                self._row['tests'].add(test)
+            self._field = None
+
+
+def read_report(report_html_path):
+    parser = ReportParser()
+
+    with open(report_html_path) as html:
+        for chunk in iter(lambda: html.read(CHUNK_SIZE), ''):
+            parser.feed(chunk)
+        html.close()
+
+    parser.close()
+
+    return parser.lines
+
+
+def read_serial(java, serial_path, source_file):
+    classpath = generate_classpath([
+        compiled_classes_dir(java, COVERAGE_DUMP, [JMOCKIT]), JMOCKIT])
+
+    output = subprocess.check_output(
+        [java.java, '-classpath', classpath, 'CoverageDump', serial_path,
+         source_file], stderr=subprocess.DEVNULL, timeout=DUMP_TIMEOUT)
+
+    return parse_dump(output.decode('utf-8'))
+
+
+def parse_dump(output):
+    lines = {}
+
+    for row in output.splitlines():
+        row = row.split('\t')
+        if len(row) == 2:
+            lines.setdefault(int(row[0]), set()).add(row[1])
+
+    return lines
+
+
+def write_coverage(output_dir, lines):
+    path = os.path.join(output_dir, COVERAGE_FILE)
+
+    with open(path, 'w') as f:
+        f.write(json.dumps({str(line): sorted(lines[line]) for line in lines}))
+        f.close()
+
+    _cache[path] = (os.path.getmtime(path), lines)
+
+
+def read_coverage(output_dir):
+    path = os.path.join(output_dir, COVERAGE_FILE)
+
+    if not os.path.exists(path):
+        return None
+
+    mtime = os.path.getmtime(path)
+
+    if path not in _cache or _cache[path][0] != mtime:
+        with open(path) as f:
+            lines = json.loads(f.read())
+            f.close()
+        _cache[path] = (mtime, {int(line): set(lines[line]) for line in lines})
+
+    return _cache[path][1]
+
+
+def _extract_li_id(li):
+    # Any method, non test ones (e.g. setUp) included, the runner falls back
+    # to the whole class for those.
+    test = re.findall(r'([A-Za-z0-9_$]+)#([A-Za-z0-9_$]+):', li)
+    if test:
+        return '{0}#{1}'.format(*test[0])
+    return None
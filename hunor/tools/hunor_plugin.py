@@ -1,4 +1,5 @@
 import os
+import json
 import shutil
 import logging
 import subprocess
@@ -29,14 +30,19 @@ class HunorPlugin:
         return '{0}:{1}:{2}:{3}'.format(GROUP_ID, ARTIFACT_ID, VERSION, goal)
 
     @staticmethod
-    def _includes(file):
-        return '-Dhunor.includes=**{0}{1}'.format(os.sep, file)
+    def _includes(files):
+        if isinstance(files, str):
+            files = [files]
 
-    def gen(self, class_file, analyze=False, debug=False):
+        return '-Dhunor.includes={0}'.format(
+            ','.join('**{0}{1}'.format(os.sep, file) for file in files))
+
+    def gen(self, class_file, analyze=False, debug=False, timeout=TIMEOUT):
+        # class_file may also be a list, generated in one plugin execution.
         self._clean_result_dir()
         maven = MavenFactory.get_instance()
 
-        params = (self.project_dir, TIMEOUT,
+        params = (self.project_dir, timeout,
                   self._plugin_ref('mujava-generate'),
                   '-Dhunor.enableRules={0}'.format(
                       'true' if self.is_enable_reduce else 'false'),
@@ -56,11 +62,10 @@ class HunorPlugin:
 
         return self._extract_time(output),
 
-    def _analyse(self, skip_tests=False, debug=False, split_reduced_dir=False):
+    def _analyse(self, skip_tests=False, debug=False, split_reduced_dir=False,
+                 timeout=TIMEOUT):
         maven = MavenFactory.get_instance()
 
-        timeout = TIMEOUT
-
         if not skip_tests:
             timeout = 24 * 60 * 60
 
@@ -91,6 +96,40 @@ class HunorPlugin:
 
         return self.subsuming(class_name, count)
 
+    def generate_all(self, class_files):
+        # One Maven boot for every file, targets are split by class after.
+        timeout = TIMEOUT * max(len(class_files), 1)
+        complete = True
+
+        try:
+            self.gen(class_files, timeout=timeout)
+        except subprocess.TimeoutExpired:
+            logger.warning('Mutant generation timed out for %i files.',
+                           len(class_files))
+            complete = False
+
+        try:
+            self._analyse(skip_tests=True, split_reduced_dir=True,
+                          timeout=timeout)
+        except subprocess.TimeoutExpired:
+            logger.warning('Mutant analysis timed out for %i files.',
+                           len(class_files))
+            complete = False
+
+        path = os.path.join(self.mutants_dir, 'plugin_targets.json')
+
+        if not complete and not os.path.exists(path):
+            return {}
+
+        targets = split_targets(read_plugin_targets(path), class_files)
+
+        # After a timeout a file without targets may never have been
+        # reached, it stays pending for the next run.
+        if not complete:
+            targets = {f: targets[f] for f in targets if targets[f]}
+
+        return targets
+
     def subsuming(self, class_name, count=0):
         try:
             self._analyse(skip_tests=True, split_reduced_dir=True)
@@ -100,8 +139,14 @@ class HunorPlugin:
         return self.read_targets_json(class_name, count)
 
     def read_targets_json(self, class_name, count=0):
+        return self.to_targets(
+            class_name,
+            read_json(os.path.join(self.mutants_dir, 'plugin_targets.json')),
+            count)
+
+    @staticmethod
+    def to_targets(class_name, t, count=0):
         targets = []
-        t = read_json(os.path.join(self.mutants_dir, 'plugin_targets.json'))
 
         for target in t:
             mutant = None
@@ -174,3 +219,46 @@ class HunorPlugin:
                 for data in line.split(','):
                     result += float(str(data.split(':')[1]).strip()),
                 return result
+
+
+def class_name(class_file):
+    return class_file.split('.')[0].replace(os.sep, '.')
+
+
+def read_plugin_targets(path):
+    # Target ids are only known to be unique within a class, a batched run
+    # may repeat one and a dict would keep only the last. Every object is
+    # read as a list of pairs, the mutants are flat and turn back into dicts.
+    with open(path) as f:
+        plugin_targets = json.load(f, object_pairs_hook=list)
+
+    return [(target, [dict(m) for m in mutants])
+            for target, mutants in plugin_targets]
+
+
+def split_targets(plugin_targets, class_files):
+    classes = {class_name(f): f for f in class_files}
+    targets = {f: {} for f in class_files}
+
+    for target, mutants in plugin_targets:
+        for m in mutants:
+            class_file = _class_file(m['targetClass'], classes)
+            if class_file is None:
+                logger.warning('No class found for target {0} ({1}).'
+                               .format(target, m['targetClass']))
+            else:
+                targets[class_file].setdefault(target, []).append(m)
+
+    return targets
+
+
+def _class_file(target_class, classes):
+    # Inner classes, Foo$Inner or Foo.Inner, belong to the file of Foo.
+    name = target_class.split('$')[0]
+
+    while name not in classes:
+        name, _, inner = name.rpartition('.')
+        if not name or not inner[:1].isupper():
+            return None
+
+    return classes[name]
@@ -59,6 +59,13 @@ class Java:
     def exec_java(self, cwd, env, timeout, *args):
         return Java._exec(self.java, cwd, env, timeout, *args)
 
+    def exec_java_quiet(self, cwd, env, timeout, *args):
+        # Output is discarded instead of buffered, for runs that report
+        # their results through a file.
+        return subprocess.run([self.java] + list(args), cwd=cwd, env=env,
+                              timeout=timeout, stdout=subprocess.DEVNULL,
+                              stderr=subprocess.DEVNULL).returncode
+
     def _version_javac(self):
         return self.run_javac(None, '-version')
 
@@ -98,8 +105,8 @@ class Java:
         return env
 
     def exec_java_all(self, java_files, cwd, env, timeout, *args):
-        for java_file in java_files:
-            self.exec_javac(java_file, cwd, env, timeout, *args)
+        return Java._exec(self.javac, cwd, env, timeout,
+                          *(list(args) + list(java_files)))
 
 
 class JavaNotFoundException(SystemExit, Exception):
@@ -1,12 +1,15 @@
 import os
-import re
 import copy
 import subprocess
 import shutil
+import tempfile
 import time
 
-from bs4 import BeautifulSoup
-
+from hunor.tools.coverage import read_report, read_coverage, read_serial
+from hunor.tools.coverage import write_coverage, SERIAL_FILE
+from hunor.tools.timeouts import TimeoutProfile
+from hunor.tools.bin import MAJOR_CONFIG
+from hunor.tools.worker import Worker, MAIN_CLASS, read_results
 from hunor.utils import generate_classpath
 
 
@@ -17,103 +20,192 @@ HAMCREST = os.sep.join([PATH, 'bin', 'hamcrest-core-1.3.jar'])
 EVOSUITE = os.sep.join([PATH, 'bin', 'evosuite-standalone-runtime-1.0.6.jar'])
 JMOCKIT = os.sep.join([PATH, 'bin', 'jmockit-1.40-marcio.1.jar'])
 
+COVERAGE_REPORT_DIR = 'coverage-report'
+
 
 class JUnit:
 
-    def __init__(self, jdk, sut_class, classpath, source_dir):
+    def __init__(self, jdk, sut_class, classpath, source_dir,
+                 select_tests=True):
         self.jdk = jdk
         self.sut_class = sut_class
         self.classpath = classpath
         self.source_dir = source_dir
+        self.select_tests = select_tests
+        self.profile = TimeoutProfile()
 
     def _run_test(self, test_suite, test_classes_dir, test_class,
-                  mutant_classpath='', timeout=(60 * 3)):
+                  mutant_classpath='', timeout=(60 * 3), coverage=True,
+                  profile=None, schemata=None, mutant_id=None):
+
+        # A schemata build holds every mutant, the worker main selects one
+        # through major.mutation.Config.__M_NO.
+        schemata_classpath = ([schemata, MAJOR_CONFIG] if schemata is not None
+                              else [])
 
-        classpath = generate_classpath([
+        classpath = [
             JMOCKIT, JUNIT, HAMCREST, EVOSUITE,
             test_classes_dir,
-            mutant_classpath,
+            mutant_classpath
+        ] + schemata_classpath + [
             self.classpath,
-        ])
-
-        coverage_source_dirs = self.source_dir
-
-        if os.path.exists(os.path.join(mutant_classpath,
-                          self.sut_class.replace('.', os.sep) + '.java')):
-            coverage_source_dirs = mutant_classpath
-
-        command = [
-            self.jdk.java,
-            '-classpath', classpath,
-            '-Dcoverage-classes=' + self.sut_class,
-            '-Dcoverage-output=html',
-            '-Dcoverage-metrics=line',
-            '-Dcoverage-srcDirs=' + coverage_source_dirs,
-            'org.junit.runner.JUnitCore', test_class
+            Worker.classes_dir(self.jdk)
         ]
 
+        classpath = generate_classpath(classpath)
+
+        command = [self.jdk.java, '-classpath', classpath]
+
+        if schemata is not None:
+            command.append('-Dhunor.mutant={0}'.format(mutant_id))
+
+        # Every test class of the suite appends its call points to the same
+        # coverage.ser, read once after the last class.
+        if coverage:
+            command += [
+                '-Dcoverage-classes=' + self.sut_class,
+                '-Dcoverage-output=serial-append',
+                '-Dcoverage-outputDir=' + COVERAGE_REPORT_DIR,
+                '-Dcoverage-metrics=line'
+            ]
+
+        # The worker main runs single test methods too and reports each
+        # test to a JSON lines file.
+        fd, results = tempfile.mkstemp(prefix='hunor_', suffix='.jsonl')
+        os.close(fd)
+
+        # The original program run records the test times, mutant runs
+        # stop tests running far longer than those.
+        test_timeout = None if profile is not None else (
+            self.profile.test_timeout())
+        if test_timeout is not None:
+            command.append('-Dhunor.timeout={0}'.format(
+                int(test_timeout * 1000)))
+
+        command += ['-Dhunor.results=' + results, MAIN_CLASS, test_class]
+
         start = time.time()
         try:
-            output = subprocess.check_output(command, shell=False,
-                                             cwd=test_suite,
-                                             stderr=subprocess.DEVNULL,
-                                             timeout=timeout)
-            return (_extract_results_ok(output.decode('unicode_escape')),
-                    time.time() - start)
-        except subprocess.CalledProcessError as e:
-            return (_extract_results(e.output.decode('unicode_escape')),
-                    time.time() - start)
+            subprocess.run(command, shell=False, cwd=test_suite,
+                           stdout=subprocess.DEVNULL,
+                           stderr=subprocess.DEVNULL, timeout=timeout)
+            result = read_results(results, time.time() - start)
+            if profile is not None:
+                for test in result.tests:
+                    self.profile.record_test(
+                        (profile, test.test_class, test.method),
+                        test.run_time)
+            return _counts(result), time.time() - start
         except subprocess.TimeoutExpired:
             elapsed_time = time.time() - start
             print("# ERROR: Run JUnit tests timed out. {0} seconds".format(
                 elapsed_time
             ))
             return (0, 0, set()), elapsed_time
+        finally:
+            os.remove(results)
 
     def _run_test_suite(self, test_suite, mutant_classpath, mutation_line=0,
-                        original_path=None, timeout=(60 * 3)):
+                        original_path=None, timeout=(60 * 3), schemata=None,
+                        mutant_id=None):
         total = 0
         fail = 0
         fail_tests = set()
-        coverage = 0
-        coverage_tests = set()
         elapsed_time = 0
 
+        # Each mutant runs in its own directory, so parallel runs never share
+        # a coverage report.
+        work_dir = os.path.join(mutant_classpath, test_suite.id)
+        coverage_report_dir = os.path.join(work_dir, COVERAGE_REPORT_DIR)
+
+        if os.path.exists(coverage_report_dir):
+            shutil.rmtree(coverage_report_dir)
+        os.makedirs(work_dir, exist_ok=True)
+
+        # Line coverage is only collected when running the original program,
+        # mutants reuse its coverage map.
+        collect_coverage = original_path is None
+        lines = {}
+        selection = None
+
+        if not collect_coverage:
+            lines = self._original_coverage(original_path, test_suite)
+
+            # Only tests that reach the mutated line can kill the mutant, the
+            # others are counted as passing, like in the original program.
+            if self.select_tests and test_suite.tests_total > 0:
+                if lines:
+                    selection = _select_tests(test_suite.classes,
+                                              lines.get(mutation_line, set()))
+                else:
+                    # No coverage to select from, a missing map must not
+                    # make every mutant survive.
+                    print('WARNING: no line coverage for {0}, running all '
+                          'tests.'.format(test_suite.id))
+
         for test_class in test_suite.classes:
-            (t, f, f_s), e_t = self._run_test(test_suite.source_dir,
+            # Mutants get a timeout scaled from the original program run.
+            key = (test_suite.id, test_class)
+            class_timeout = timeout
+            if not collect_coverage:
+                class_timeout = self.profile.class_timeout(key, timeout)
+
+            if selection is not None:
+                if test_class not in selection:
+                    continue
+                test_class = '{0}#{1}'.format(
+                    test_class, ','.join(selection[test_class]))
+
+            (t, f, f_s), e_t = self._run_test(work_dir,
                                               test_suite.classes_dir,
                                               test_class,
                                               mutant_classpath=mutant_classpath,
-                                              timeout=timeout)
+                                              timeout=class_timeout,
+                                              coverage=collect_coverage,
+                                              profile=(test_suite.id
+                                                       if collect_coverage
+                                                       else None),
+                                              schemata=schemata,
+                                              mutant_id=mutant_id)
+
+            if collect_coverage:
+                if e_t < class_timeout:
+                    self.profile.record_class(key, e_t)
+            elif t == 0 and e_t >= class_timeout:
+                test_suite.maybe_in_loop = True
 
             total += t
             fail += f
             elapsed_time += e_t
             fail_tests = fail_tests.union(f_s)
-            coverage_src = test_suite.source_dir
 
-            if original_path is not None:
-                coverage_src = os.path.join(original_path, test_suite.id)
+        if selection is not None:
+            # Every test of the suite counts, a selected class may also have
+            # run whole when a covering method was not a test.
+            total = test_suite.tests_total
+
+        if collect_coverage:
+            lines = self._read_line_coverage(work_dir)
+            write_coverage(work_dir, lines)
+
+        coverage_tests = set(lines.get(mutation_line, set()))
 
-            c, c_t = self._count_line_coverage(coverage_src, mutation_line)
-            coverage += c
-            coverage_tests = coverage_tests.union(c_t)
-            coverage_report_dir = os.path.join(test_suite.source_dir,
-                                               'coverage-report')
-            coverage_report_dst_dir = os.path.join(
-                    mutant_classpath, test_suite.id, 'coverage-report')
+        return (total, fail, fail_tests, len(coverage_tests), coverage_tests,
+                elapsed_time)
 
-            if os.path.exists(coverage_report_dst_dir):
-                shutil.rmtree(coverage_report_dst_dir)
+    def _original_coverage(self, original_path, test_suite):
+        original_dir = os.path.join(original_path, test_suite.id)
+        lines = read_coverage(original_dir)
 
-            if os.path.exists(coverage_report_dir):
-                shutil.copytree(coverage_report_dir, coverage_report_dst_dir)
+        if lines is None:
+            lines = self._read_line_coverage(original_dir)
+            write_coverage(original_dir, lines)
 
-        return total, fail, fail_tests, coverage, coverage_tests, elapsed_time
+        return lines
 
     def run_test_suites(self, test_suites, mutant_classpath, mutation_line=0,
-                        original_path=None):
-        suites = copy.deepcopy(test_suites)
+                        original_path=None, schemata=None, mutant_id=None):
+        suites = {t: copy.copy(test_suites[t]) for t in test_suites}
         for t in suites:
             if suites[t].is_valid:
                 test_suite = suites[t]
@@ -122,12 +214,14 @@ class JUnit:
                     (total, fail, fail_tests, coverage, coverage_tests,
                      elapsed_time) = self._run_test_suite(
                         test_suite, mutant_classpath, mutation_line,
-                        original_path, timeout=test_suites[t].elapsed_time * 3)
+                        original_path, timeout=test_suites[t].elapsed_time * 3,
+                        schemata=schemata, mutant_id=mutant_id)
                 else:
                     (total, fail, fail_tests, coverage, coverage_tests,
                      elapsed_time) = self._run_test_suite(
                         test_suite, mutant_classpath, mutation_line,
-                        original_path)
+                        original_path, schemata=schemata,
+                        mutant_id=mutant_id)
 
                 test_suite.fail = (fail != 0)
                 test_suite.coverage = coverage
@@ -137,6 +231,8 @@ class JUnit:
                 test_suite.coverage_tests = self._prefix(test_suite,
                                                          coverage_tests)
                 test_suite.elapsed_time = elapsed_time
+                if test_suite.maybe_in_loop:
+                    test_suite.fail = True
                 if test_suite.tests_total == 0:
                     test_suite.is_valid = False
                     if (test_suites[t].elapsed_time is not None
@@ -146,6 +242,23 @@ class JUnit:
 
         return suites
 
+    def original_results(self, test_suites, mutation_line, original_path):
+        suites = {t: copy.copy(test_suites[t]) for t in test_suites}
+        for t in suites:
+            if suites[t].is_valid:
+                test_suite = suites[t]
+                lines = self._original_coverage(original_path, test_suite)
+                coverage_tests = set(lines.get(mutation_line, set()))
+
+                test_suite.fail = False
+                test_suite.coverage = len(coverage_tests)
+                test_suite.fail_tests_total = 0
+                test_suite.fail_tests = set()
+                test_suite.coverage_tests = self._prefix(test_suite,
+                                                         coverage_tests)
+
+        return suites
+
     @staticmethod
     def _prefix(test_suite, ids):
         result = set()
@@ -153,72 +266,50 @@ class JUnit:
             result.add('{0}_{1}'.format(test_suite.prefix, i))
         return result
 
-    def _count_line_coverage(self, output_dir, mutation_line):
+    def _read_line_coverage(self, output_dir):
+        report_dir = os.path.join(output_dir, COVERAGE_REPORT_DIR)
+        serial_path = os.path.join(report_dir, SERIAL_FILE)
 
-        report_html_path = os.path.join(
-            output_dir, 'coverage-report',
-            self.sut_class.replace('.', os.sep) + '.html')
+        if os.path.exists(serial_path):
+            try:
+                return read_serial(self.jdk, serial_path,
+                                   self.sut_class.replace('.', '/') + '.java')
+            except (OSError, subprocess.SubprocessError) as e:
+                print('# ERROR: Reading coverage {0}: {1}'.format(
+                    serial_path, e))
+                return {}
 
-        tests = set()
+        # Runs from older versions left a HTML report.
+        report_html_path = os.path.join(
+            report_dir, self.sut_class.replace('.', os.sep) + '.html')
 
         if os.path.exists(report_html_path):
-            with open(report_html_path) as html:
-                soup = BeautifulSoup(html, 'html.parser')
-                for tr in soup.find_all('tr'):
-                    td_line = tr.find_all('td', class_='line')
-                    td_count = tr.find_all('td', class_='callpoints-count')
-                    if td_line and td_count:
-                        if mutation_line == int(td_line[0].string):
-                            for li in tr.find_all('li'):
-                                method_name = _extract_li_id(li.string)
-                                if method_name is not None:
-                                    tests.add(method_name)
-                html.close()
-
-        return len(tests), tests
-
-
-def _extract_results_ok(output):
-    result = re.findall(r'OK \([0-9]* tests?\)', output)
-    if len(result) > 0:
-        result = result[0].replace('(', '')
-        r = [int(s) for s in result.split() if s.isdigit()]
-
-        return r[0], 0, set()
-    return 0, 0, set()
-
-
-def _extract_results(output):
-    if len(re.findall(r'initializationError', output)) == 0:
-        result = re.findall(r'Tests run: [0-9]*,[ ]{2}Failures: [0-9]*', output)
-        if len(result) > 0:
-            result = result[0]
-            result = result.replace(',', ' ')
-            r = [int(s) for s in result.split() if s.isdigit()]
-            tests_fail = _extract_test_id(output)
-            return r[0], r[1], tests_fail
-    return 0, 0, set()
-
-
-def _extract_test_id(output):
-    tests_fail = set()
-    for test in re.findall(r'\.test[0-9]+\([A-Za-z0-9_]+\.java:[0-9]+\)', output):
-        i = re.findall(r'\d+', test)
-        file = re.findall(r'\(.+?(?=\.)', test)[0][1:]
-        test_case = re.findall(r'\..+?(?=\()', test)[0][1:]
-
-        if len(i) > 0:
-            tests_fail.add('{0}#{1}'.format(file, test_case, int(i[-1])))
-        else:
-            print("*** ERROR: Error in regex of junit output.")
-
-    return tests_fail
-
-
-def _extract_li_id(li):
-    try:
-        file = re.findall(r'[A-Za-z0-9_]+#', li)[0][:-1]
-        test_case = re.findall(r'#test[0-9]+:', li)[0][1:-1]
-        return '{0}#{1}'.format(file, test_case)
-    except IndexError:
-        return None
+            return read_report(report_html_path)
+
+        return {}
+
+
+def _select_tests(classes, tests):
+    selection = {}
+
+    for test in sorted(tests):
+        test_class, method = test.split('#')
+        for c in classes:
+            if c.split('.')[-1] == test_class:
+                selection.setdefault(c, []).append(method)
+
+    return selection
+
+
+def _counts(result):
+    fail_tests = set()
+
+    for test in result.tests:
+        if test.method == 'initializationError':
+            return 0, 0, set()
+
+        if test.status in ('fail', 'timeout'):
+            fail_tests.add('{0}#{1}'.format(test.test_class.split('.')[-1],
+                                            test.method))
+
+    return result.run_count, result.fail_count, fail_tests
@@ -1,12 +1,17 @@
-import re
+import os
 import time
 import logging
+import tempfile
 import subprocess
 
 from collections import namedtuple
 
 
 from hunor.tools.bin import JUNIT, HAMCREST, JMOCKIT, EVOSUITE_RUNTIME
+from hunor.tools.bin import MAJOR_CONFIG
+from hunor.tools.timeouts import TimeoutProfile
+from hunor.tools.worker import Worker, WorkerException, MAIN_CLASS
+from hunor.tools.worker import read_results
 from hunor.utils import generate_classpath
 
 
@@ -23,25 +28,38 @@ Coverage = namedtuple('Coverage', ['call_points', 'test_cases', 'executions',
 
 class JUnit:
 
-    def __init__(self, java, classpath):
+    def __init__(self, java, classpath, use_worker=False):
         self.java = java
         self.classpath = classpath
+        self.worker = Worker(java) if use_worker else None
+        self.profile = TimeoutProfile()
 
-    def exec_suites_with_mutant(self, suites, sut_class, mutant):
+    def close(self):
+        if self.worker:
+            self.worker.close()
+
+    def exec_suites_with_mutant(self, suites, sut_class, mutant,
+                                fail_fast=False):
         result = JUnitResult(0, 0, set(), 0, None, False)
         for suite in suites:
             result = self.update_result(result, self.exec_suite_with_mutant(
-                suite, sut_class, mutant))
+                suite, sut_class, mutant, fail_fast))
+            if fail_fast and not self.check_pass(result):
+                break
         return result
 
-    def exec_suite_with_mutant(self, suite, sut_class, mutant):
+    def exec_suite_with_mutant(self, suite, sut_class, mutant,
+                               fail_fast=False):
         result = JUnitResult(0, 0, set(), 0, None, False)
         for test_class in suite.test_classes:
             result = self.update_result(result,
                                         self.exec_with_mutant(
                                             suite.suite_dir,
                                             suite.suite_classes_dir,
-                                            sut_class, test_class, mutant))
+                                            sut_class, test_class, mutant,
+                                            fail_fast=fail_fast))
+            if fail_fast and not self.check_pass(result):
+                break
         return result
 
     def exec_suite(self, suite, sut_class):
@@ -83,92 +101,156 @@ class JUnit:
 
     def exec(self, suite_dir, suite_classes_dir, sut_class, test_class,
              timeout=TIMEOUT):
-        classpath = generate_classpath([
-            JMOCKIT, JUNIT, HAMCREST, EVOSUITE_RUNTIME,
-            suite_classes_dir,
-            self.classpath
-        ])
+        # Runs on the original program, its run times bound the mutant runs.
+        result = None
 
-        return self._exec(suite_dir, sut_class, test_class, classpath, '.',
-                          timeout)
+        if self.worker:
+            result = self._exec_worker([suite_classes_dir, self.classpath],
+                                       test_class, timeout,
+                                       profile=suite_classes_dir)
 
-    def exec_with_mutant(self, suite_dir, suite_classes_dir, sut_class,
-                         test_class, mutant, timeout=TIMEOUT):
-        classpath = generate_classpath([
-            JMOCKIT, JUNIT, HAMCREST, EVOSUITE_RUNTIME,
-            suite_classes_dir,
-            mutant.path,
-            self.classpath
-        ])
+        if result is None:
+            result = self._exec(suite_dir, sut_class, test_class,
+                                [suite_classes_dir, self.classpath], '.',
+                                timeout, profile=suite_classes_dir)
+
+        if not result.timeout:
+            self.profile.record_class((suite_classes_dir, test_class),
+                                      result.run_time)
 
-        return self._exec(suite_dir, sut_class, test_class, classpath,
-                          mutant.path, timeout)
+        return result
+
+    def exec_with_mutant(self, suite_dir, suite_classes_dir, sut_class,
+                         test_class, mutant, timeout=None, fail_fast=False):
+        if timeout is None:
+            timeout = self.profile.class_timeout(
+                (suite_classes_dir, test_class), TIMEOUT)
+
+        if mutant.schemata is not None:
+            return self._exec_schemata(suite_dir, suite_classes_dir, sut_class,
+                                       test_class, mutant, timeout, fail_fast)
+
+        if self.worker:
+            result = self._exec_worker(
+                [suite_classes_dir, mutant.path, self.classpath], test_class,
+                timeout, fail_fast=fail_fast)
+            if result is not None:
+                return result
+
+        return self._exec(suite_dir, sut_class, test_class,
+                          [suite_classes_dir, mutant.path, self.classpath],
+                          mutant.path, timeout, self._properties(fail_fast))
+
+    def _exec_schemata(self, suite_dir, suite_classes_dir, sut_class,
+                       test_class, mutant, timeout=TIMEOUT, fail_fast=False):
+        # Every mutant shares the same build, only the selected id changes.
+        classpath = [suite_classes_dir, mutant.schemata, MAJOR_CONFIG,
+                     self.classpath]
+
+        if self.worker:
+            result = self._exec_worker(classpath, test_class, timeout,
+                                       mutant=mutant.id, fail_fast=fail_fast)
+            if result is not None:
+                return result
+
+        return self._exec(
+            suite_dir, sut_class, test_class, classpath, '.', timeout,
+            ['-Dhunor.mutant={0}'.format(mutant.id)]
+            + self._properties(fail_fast))
+
+    def _properties(self, fail_fast):
+        properties = []
+
+        if fail_fast:
+            properties.append('-Dhunor.failfast=true')
+
+        test_timeout = self.profile.test_timeout()
+        if test_timeout is not None:
+            properties.append('-Dhunor.timeout={0}'.format(
+                int(test_timeout * 1000)))
+
+        return properties
 
     def _exec(self, suite_dir, sut_class, test_class, classpath,
-              cov_src_dirs='.', timeout=TIMEOUT):
+              cov_src_dirs='.', timeout=TIMEOUT, properties=None,
+              profile=None):
+        # The worker main reports each test to a JSON lines file, read
+        # once the JVM exits, instead of JUnitCore output on stdout.
+        fd, results = tempfile.mkstemp(prefix='hunor_', suffix='.jsonl')
+        os.close(fd)
 
         params = (
-            '-classpath', classpath,
+            '-classpath', generate_classpath([
+                JMOCKIT, JUNIT, HAMCREST, EVOSUITE_RUNTIME,
+                Worker.classes_dir(self.java)
+            ] + classpath),
             '-Dcoverage-classes=' + sut_class,
             '-Dcoverage-output=html',
             '-Dcoverage-metrics=line',
             '-Dcoverage-srcDirs=' + cov_src_dirs,
-            'org.junit.runner.JUnitCore', test_class
+            '-Dhunor.results=' + results,
+            *(properties or []),
+            MAIN_CLASS, test_class
         )
 
         start = time.time()
         try:
-            output = self.java.exec_java(suite_dir, self.java.get_env(),
-                                         timeout, *params)
-            return JUnitResult(
-                *JUnit._extract_results_ok(output.decode('unicode_escape')),
-                time.time() - start, None, False
-            )
-        except subprocess.CalledProcessError as e:
-            return JUnitResult(
-                *JUnit._extract_results(e.output.decode('unicode_escape')),
-                time.time() - start, None, False
-            )
+            self.java.exec_java_quiet(suite_dir, self.java.get_env(),
+                                      timeout, *params)
+            result = read_results(results, time.time() - start)
+            self._record_tests(profile, result)
+            return JUnit._to_result(result)
         except subprocess.TimeoutExpired:
             elapsed_time = time.time() - start
             logger.warning("Run JUnit tests timed out. {0} seconds".format(
                 elapsed_time))
             return JUnitResult(0, 0, set(), 0, None, True)
+        finally:
+            os.remove(results)
 
-    @staticmethod
-    def _extract_results_ok(output):
-        result = re.findall(r'OK \([0-9]* tests?\)', output)
-        if len(result) > 0:
-            result = result[0].replace('(', '')
-            r = [int(s) for s in result.split() if s.isdigit()]
-            return r[0], 0, set()
+    def _exec_worker(self, classpath, test_class, timeout=TIMEOUT,
+                     mutant=None, fail_fast=False, profile=None):
+        # JUnit and Hamcrest are already loaded by the worker JVM.
+        classpath = generate_classpath([EVOSUITE_RUNTIME] + classpath)
 
-        return 0, 0, set()
+        try:
+            result = self.worker.run(
+                classpath, [test_class], timeout, mutant=mutant,
+                fail_fast=fail_fast,
+                test_timeout=(None if profile is not None
+                              else self.profile.test_timeout()))
+        except WorkerException:
+            logger.warning('JUnit worker failed, running %s in a new JVM.',
+                           test_class, exc_info=True)
+            return None
+
+        self._record_tests(profile, result)
+
+        return JUnit._to_result(result)
+
+    def _record_tests(self, profile, result):
+        # Only runs on the original program bound the per test timeouts.
+        if profile is not None and not result.timeout:
+            for test in result.tests:
+                self.profile.record_test(
+                    (profile, test.test_class, test.method), test.run_time)
 
     @staticmethod
-    def _extract_results(output):
-        if len(re.findall(r'initializationError', output)) == 0:
-            result = re.findall(r'Tests run: [0-9]*,[ ]{2}Failures: [0-9]*',
-                                output)
-            if len(result) > 0:
-                result = result[0].replace(',', ' ')
-                r = [int(s) for s in result.split() if s.isdigit()]
-                return r[0], r[1], JUnit._extract_test_id(output)
+    def _to_result(result):
+        if result.timeout:
+            return JUnitResult(0, 0, set(), 0, None, True)
 
-        return 0, 0, set()
+        fail_test_set = set()
+        maybe_in_loop = False
+        for test in result.tests:
+            if test.method == 'initializationError':
+                return JUnitResult(0, 0, set(), result.run_time, None, False)
 
-    @staticmethod
-    def _extract_test_id(output):
-        tests_fail = set()
-        for test in re.findall(r'\.test[0-9]+\([A-Za-z0-9_]+\.java:[0-9]+\)',
-                               output):
-            i = re.findall(r'\d+', test)
-            file = re.findall(r'\(.+?(?=\.)', test)[0][1:]
-            test_case = re.findall(r'\..+?(?=\()', test)[0][1:]
-
-            if len(i) > 0:
-                tests_fail.add('{0}#{1}'.format(file, test_case, int(i[-1])))
-            else:
-                logger.error('Error in regex of junit output.')
-
-        return tests_fail
+            if test.status in ('fail', 'timeout'):
+                fail_test_set.add('{0}#{1}'.format(
+                    test.test_class.split('.')[-1], test.method))
+                maybe_in_loop = maybe_in_loop or test.status == 'timeout'
+
+        return JUnitResult(result.run_count, result.fail_count,
+                           fail_test_set, result.run_time, None,
+                           maybe_in_loop)
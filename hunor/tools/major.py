@@ -3,19 +3,22 @@ import subprocess
 import shutil
 
 from hunor.mutation.mutant import Mutant
+from hunor.tools.bin import MAJOR_CONFIG
 from hunor.utils import generate_classpath
 
 PATH = os.path.dirname(os.path.abspath(__file__))
 
 MAJOR = os.sep.join([PATH, 'bin', 'major', 'bin', 'javac'])
+SCHEMATA_DIR = 'schemata'
 
 
 class Major:
 
-    def __init__(self, mutants_dir, jdk=None, classpath=None):
+    def __init__(self, mutants_dir, jdk=None, classpath=None, schemata=False):
         self.mutants_dir = mutants_dir
         self.jdk = jdk
         self.classpath = classpath
+        self.schemata = schemata
 
     def read_log(self):
         mutants_data = {}
@@ -35,10 +38,18 @@ class Major:
                     transformation=data[6],
                     path=self._mutant_dir(data[0])
                 )
+                if self.schemata:
+                    mutants_data[int(data[0])].schemata = (
+                        self._schemata_dir())
             log.close()
 
         return mutants_data
 
+    def _schemata_dir(self):
+        schemata_dir = os.path.join(os.path.abspath(self.mutants_dir),
+                                    SCHEMATA_DIR)
+        return schemata_dir if os.path.exists(schemata_dir) else None
+
     def _mutant_dir(self, mid):
         return os.path.join(os.path.abspath(self.mutants_dir), str(mid))
 
@@ -83,6 +94,28 @@ class Major:
 
         self._exec(parameters, cwd=source_dir)
 
+    def compile_schemata(self, java_file, source_dir, classpath,
+                         operators='ALL'):
+        schemata_dir = os.path.join(os.path.abspath(self.mutants_dir),
+                                    SCHEMATA_DIR)
+
+        if os.path.exists(schemata_dir):
+            shutil.rmtree(schemata_dir)
+        os.makedirs(schemata_dir)
+
+        # Major compiles every mutant into the class, selected at runtime by
+        # major.mutation.Config.__M_NO, and writes mutants.log to the cwd.
+        parameters = [
+            '-XMutator:' + operators,
+            '-cp', generate_classpath([classpath, MAJOR_CONFIG, self.jdk.rt]),
+            '-d', schemata_dir,
+            os.path.abspath(os.path.join(source_dir, java_file))
+        ]
+
+        self._exec(parameters, cwd=self.mutants_dir)
+
+        return schemata_dir
+
     def generate(self, classes_dir, source_dir, java_file):
         self._exec_major(java_file, source_dir, classes_dir)
         return []
@@ -1,6 +1,8 @@
 import os
 import subprocess
 
+from hunor.tools.build_cache import fingerprint, read_build, write_build
+
 
 class Maven:
 
@@ -45,16 +47,21 @@ class Maven:
         try:
             project_dir = os.path.abspath(project_dir)
             if not self.no_compile:
+                key = fingerprint(project_dir, self.jdk.java)
+                build = read_build(project_dir, key)
+
+                if build is not None:
+                    print('SUCCESS: {0} up to date.'.format(project_dir))
+                    return build['classes_dir']
+
                 self._run(project_dir, 'compile', timeout)
                 print('SUCCESS: {0} compiled!'.format(project_dir))
 
-            if os.path.exists(os.path.join(project_dir, 'target')):
-                return os.path.join(project_dir, 'target', 'classes')
-            elif os.path.exists(os.path.join(project_dir, 'build')):
-                return os.path.join(project_dir, 'build', 'classes')
-            else:
-                print("ERROR: Maven classes directory not found.")
-                raise SystemExit
+                classes_dir = _classes_dir(project_dir)
+                write_build(project_dir, key, {'classes_dir': classes_dir})
+                return classes_dir
+
+            return _classes_dir(project_dir)
         except subprocess.CalledProcessError as e:
             print(e.output.decode('unicode_escape'))
             raise SystemError
@@ -76,6 +83,16 @@ class Maven:
             print("# ERROR: Run JUnit tests timed out.")
 
 
+def _classes_dir(project_dir):
+    if os.path.exists(os.path.join(project_dir, 'target')):
+        return os.path.join(project_dir, 'target', 'classes')
+    elif os.path.exists(os.path.join(project_dir, 'build')):
+        return os.path.join(project_dir, 'build', 'classes')
+    else:
+        print("ERROR: Maven classes directory not found.")
+        raise SystemExit
+
+
 def _extract_results_ok(output):
     print(output)
 
@@ -1,11 +1,13 @@
 import os
 import re
+import shutil
 import logging
 import subprocess
 
 from collections import namedtuple
 
 from hunor.args import arg_parser_gen, to_options_gen
+from hunor.tools.build_cache import fingerprint, read_build, write_build
 from hunor.tools.java_factory import JavaFactory
 
 
@@ -20,16 +22,29 @@ MavenResults = namedtuple('MavenResults', ['source_files', 'classes_dir'])
 
 class Maven:
 
-    def __init__(self, java, maven_home=None, skip_compile=False):
+    def __init__(self, java, maven_home=None, skip_compile=False,
+                 daemon=False, offline=False, incremental=False):
         self.maven_home = maven_home
         self.java = java
         self.skip_compile = skip_compile
+        self.daemon = _find_mvnd() if daemon else None
+        self.offline = offline
+        self.incremental = incremental
+
+        if daemon and not self.daemon:
+            logger.warning('Maven daemon (mvnd) not found, using mvn.')
 
         self._set_home()
         self._check()
 
     @property
     def mvn(self):
+        if self.daemon:
+            return self.daemon
+        return self.plain_mvn
+
+    @property
+    def plain_mvn(self):
         return os.path.join(self.maven_home, 'bin', 'mvn')
 
     def _check(self):
@@ -46,7 +61,7 @@ class Maven:
                 self.maven_home = os.environ['MAVEN_HOME']
             elif 'MVN_HOME' in os.environ and os.environ['MVN_HOME']:
                 self.maven_home = os.environ['MVN_HOME']
-            else:
+            elif not self.daemon:
                 logger.critical('MAVEN_HOME undefined.')
                 raise MavenNotFoundException()
 
@@ -59,14 +74,32 @@ class Maven:
     def exec(self, cwd, timeout, *args):
         return self._exec_mvn(cwd, self.java.get_env(), timeout, *args)
 
-    def _exec_mvn(self, cwd, env, timeout, *args):
+    def _exec_mvn(self, cwd, env, timeout, *args, mvn=None):
+        mvn = mvn or self.mvn
         try:
-            command = [self.mvn] + list(args)
+            command = ([mvn] + (['-o'] if self.offline else [])
+                       + list(args))
 
             return subprocess.check_output(command, cwd=cwd, env=env,
                                            timeout=timeout,
                                            stderr=subprocess.STDOUT)
+        except OSError as e:
+            if mvn == self.daemon and self.maven_home:
+                logger.warning('MAVEN: daemon failed to start, using mvn.',
+                               exc_info=True)
+                self.daemon = None
+                return self._exec_mvn(cwd, env, timeout, *args)
+            logger.error('MAVEN: not found.', exc_info=True)
+            raise e
         except subprocess.CalledProcessError as e:
+            if mvn == self.daemon and self.maven_home:
+                logger.warning('MAVEN: daemon failed with arguments {0}, '
+                               'retrying with mvn.'.format(args))
+                output = self._exec_mvn(cwd, env, timeout, *args,
+                                        mvn=self.plain_mvn)
+                # The same build passed without the daemon, it is broken.
+                self.daemon = None
+                return output
             logger.error('MAVEN: call process error with arguments {0}.'
                          .format(args), exc_info=True)
             logger.error(e.output.decode('unicode_escape'))
@@ -75,9 +108,6 @@ class Maven:
             logger.error('MAVEN: timeout with arguments {0}.'.format(args),
                          exc_info=True)
             raise e
-        except FileNotFoundError as e:
-            logger.error('MAVEN: not found.', exc_info=True)
-            raise e
 
     def clean(self, project_dir, timeout):
         logger.info("Cleaning up project with maven...")
@@ -85,16 +115,37 @@ class Maven:
                               'clean').decode('unicode_escape')
 
     def compile(self, project_dir, timeout=TIMEOUT, clean=False):
+        # Incremental builds leave stale classes to the compiler plugin.
+        clean = clean and not self.incremental
+        key = fingerprint(project_dir, self.java.java)
+
+        # A clean build always runs, the cache only records it.
+        last_build = None if clean else read_build(project_dir, key)
+
+        if last_build is not None:
+            logger.info("Sources unchanged, skipping compile.")
+            return MavenResults(last_build.get('source_files', 0),
+                                last_build['classes_dir'])
+
         if clean:
             self.clean(project_dir, TIMEOUT)
 
         logger.info("Compiling the project with maven...")
-        return self.extract_results(
-            self._exec_mvn(project_dir, self.java.get_env(), timeout,
-                           'compile').decode('unicode_escape'))
+        output = self._exec_mvn(project_dir, self.java.get_env(), timeout,
+                                'compile').decode('unicode_escape')
+
+        if 'Nothing to compile' in output:
+            build = MavenResults(0, os.path.join(
+                os.path.abspath(project_dir), 'target', 'classes'))
+        else:
+            build = self.extract_results(output)
+
+        write_build(project_dir, key, build._asdict())
+
+        return build
 
     def test(self, project_dir, timeout=TIMEOUT, clean=False):
-        if clean:
+        if clean and not self.incremental:
             self.clean(project_dir, TIMEOUT)
 
         logger.info("Testing the project with maven...")
@@ -127,5 +178,17 @@ class MavenFactory:
         if not cls.maven:
             options = to_options_gen(arg_parser_gen())
             cls.maven = Maven(java=JavaFactory.get_instance(),
-                              maven_home=options.maven_home)
+                              maven_home=options.maven_home,
+                              daemon=options.is_enable_maven_daemon,
+                              offline=options.is_maven_offline,
+                              incremental=options.is_enable_incremental_build)
         return cls.maven
+
+
+def _find_mvnd():
+    if os.environ.get('MVND_HOME'):
+        mvnd = os.path.join(os.environ['MVND_HOME'], 'bin', 'mvnd')
+        if os.access(mvnd, os.X_OK):
+            return mvnd
+
+    return shutil.which('mvnd')
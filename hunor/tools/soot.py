@@ -1,8 +1,14 @@
+import os
+import tempfile
+
 from hunor.tools.java_factory import JavaFactory
-from hunor.tools.bin import SOOT
+from hunor.tools.bin import SOOT, SOOT_BATCH
+from hunor.tools.worker import compiled_classes_dir
 from hunor.utils import generate_classpath
 
 TIMEOUT = 30
+MAIN_CLASS = 'SootBatch'
+SEP = '\t'
 
 
 class Soot:
@@ -26,3 +32,38 @@ class Soot:
 
         return self.java.exec_java(self.cwd, self.java.get_env(),
                                    TIMEOUT, *params)
+
+    def exec_all(self, jobs, jimple=True):
+        # Jobs are (classpath, class_file, dest_dir), all run in one JVM.
+        fd, batch_file = tempfile.mkstemp(suffix='.soot')
+
+        try:
+            with os.fdopen(fd, 'w') as f:
+                for classpath, class_file, dest_dir in jobs:
+                    fields = [generate_classpath([classpath, self.java.rt]),
+                              dest_dir, class_file]
+                    if jimple:
+                        fields += ['-f', 'jimple']
+                    f.write(SEP.join(fields) + '\n')
+                f.close()
+
+            output = self.java.exec_java(
+                self.cwd, self.java.get_env(), TIMEOUT * len(jobs),
+                '-classpath', generate_classpath([
+                    compiled_classes_dir(self.java, SOOT_BATCH, [SOOT]), SOOT
+                ]), MAIN_CLASS, batch_file)
+        finally:
+            os.remove(batch_file)
+
+        return _extract_optimized(output.decode('unicode_escape'))
+
+
+def _extract_optimized(output):
+    optimized = set()
+
+    for line in output.split('\n'):
+        fields = line.rstrip('\r').split(SEP)
+        if len(fields) == 3 and fields[0] == 'optimized' and fields[1] == 'ok':
+            optimized.add(fields[2])
+
+    return optimized
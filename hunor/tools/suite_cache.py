@@ -0,0 +1,137 @@
+import os
+import json
+import shutil
+import hashlib
+import tempfile
+
+from hunor.utils import config, get_files
+
+
+ENTRY_FILE = 'entry.json'
+SUITE_DIR = 'suite'
+CHUNK_SIZE = 1024 * 1024
+
+_digests = {}
+
+
+class SuiteCache:
+
+    def __init__(self, cache_dir, quota):
+        self.cache_dir = os.path.abspath(cache_dir)
+        self.quota = quota
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    @staticmethod
+    def key(classpath, config_file, sut_class, tool, seed):
+        key = hashlib.sha256()
+
+        for value in [tool, str(seed), sut_class,
+                      json.dumps(config(config_file)[tool]['parameters'])]:
+            key.update(value.encode('utf-8') + b'\0')
+
+        for entry in classpath.split(os.pathsep):
+            key.update(_path_digest(entry).encode('utf-8'))
+
+        return key.hexdigest()
+
+    def get(self, key, suite_dir):
+        entry_dir = os.path.join(self.cache_dir, key)
+        entry_file = os.path.join(entry_dir, ENTRY_FILE)
+
+        if not os.path.exists(entry_file):
+            return None
+
+        with open(entry_file) as f:
+            entry = json.loads(f.read())
+            f.close()
+
+        if os.path.exists(suite_dir):
+            shutil.rmtree(suite_dir)
+
+        try:
+            shutil.copytree(os.path.join(entry_dir, SUITE_DIR), suite_dir)
+            # The entry mtime is the last use, for LRU eviction.
+            os.utime(entry_file)
+        except OSError:
+            # Evicted by another process while copying.
+            shutil.rmtree(suite_dir, ignore_errors=True)
+            return None
+
+        return entry
+
+    def put(self, key, suite_dir, entry):
+        entry_dir = os.path.join(self.cache_dir, key)
+
+        if os.path.exists(entry_dir):
+            return
+
+        tmp_dir = tempfile.mkdtemp(dir=self.cache_dir, prefix='.')
+
+        try:
+            shutil.copytree(suite_dir, os.path.join(tmp_dir, SUITE_DIR))
+            with open(os.path.join(tmp_dir, ENTRY_FILE), 'w') as f:
+                f.write(json.dumps(entry, indent=2))
+                f.close()
+            os.rename(tmp_dir, entry_dir)
+        except OSError:
+            # Another process stored the same suite first.
+            if not os.path.exists(entry_dir):
+                raise
+        finally:
+            if os.path.exists(tmp_dir):
+                shutil.rmtree(tmp_dir)
+
+        self.evict()
+
+    def evict(self):
+        entries = []
+        total = 0
+
+        for key in os.listdir(self.cache_dir):
+            entry_file = os.path.join(self.cache_dir, key, ENTRY_FILE)
+            if os.path.exists(entry_file):
+                size = _dir_size(os.path.join(self.cache_dir, key))
+                entries.append((os.path.getmtime(entry_file), size, key))
+                total += size
+
+        for _, size, key in sorted(entries):
+            if total <= self.quota:
+                break
+            shutil.rmtree(os.path.join(self.cache_dir, key),
+                          ignore_errors=True)
+            total -= size
+
+
+def _path_digest(path):
+    if not os.path.exists(path):
+        return ''
+
+    if os.path.isdir(path):
+        digest = hashlib.sha256()
+        for class_file in sorted(get_files(path, ext='.class')):
+            digest.update(class_file.encode('utf-8') + b'\0')
+            digest.update(_file_digest(os.path.join(path, class_file))
+                          .encode('utf-8'))
+        return digest.hexdigest()
+
+    return _file_digest(path)
+
+
+def _file_digest(path):
+    stat = os.stat(path)
+    cache_key = (path, stat.st_size, stat.st_mtime_ns)
+
+    if cache_key not in _digests:
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+                digest.update(chunk)
+            f.close()
+        _digests[cache_key] = digest.hexdigest()
+
+    return _digests[cache_key]
+
+
+def _dir_size(path):
+    return sum(os.path.getsize(os.path.join(path, f))
+               for f in get_files(path))
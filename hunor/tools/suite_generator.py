@@ -91,15 +91,24 @@ class SuiteGenerator(ABC):
                            self._get_timeout())
 
     def _make_src_dir(self):
+        # The directory was reserved by _set_suite_name, it is ours.
         self.suite_dir = os.path.join(self.tests_src, self.suite_name)
-        self._create_dirs(self.suite_dir)
+        self._create_dirs(self.suite_dir, False)
 
     def _set_suite_name(self):
         self._create_dirs(self.tests_src, False)
         src_dirs = [file for file in os.listdir(self.tests_src)
                     if file.startswith(self._get_tool_name())]
-        result = '{0}_{1}'.format(self._get_tool_name(), len(src_dirs) + 1)
-        return result
+        i = len(src_dirs) + 1
+
+        # mkdir is atomic, concurrent generators never get the same name.
+        while True:
+            result = '{0}_{1}'.format(self._get_tool_name(), i)
+            try:
+                os.mkdir(os.path.join(self.tests_src, result))
+                return result
+            except FileExistsError:
+                i += 1
 
     @staticmethod
     def _create_dirs(path, remove_if_exists=True):
@@ -1,15 +1,20 @@
 import os
-import subprocess
+import hashlib
 import logging
+import subprocess
 
 from hunor.tools.soot import Soot
 
 from hunor.utils import config
 from hunor.utils import generate_classpath
 from hunor.utils import class_to_dir
+from hunor.utils import read_json
+from hunor.utils import write_json
 
 logger = logging.getLogger()
 
+CACHE_FILE = 'tce'
+
 
 class TCE:
 
@@ -21,39 +26,103 @@ class TCE:
             os.sep.join(config(options.config_file)['source']))
         self.classes_dir = mvn_build.classes_dir
 
-    def run_soot(self, mid="ORIGINAL"):
-        override_file_dir = os.path.abspath(
+    def _override_file_dir(self, mid="ORIGINAL"):
+        return os.path.abspath(
             os.path.join(self.options.mutants, self.target['directory'], mid))
 
-        with_override_file_classpath = generate_classpath([
-            override_file_dir,
+    def _classpath(self, mid="ORIGINAL"):
+        return generate_classpath([
+            self._override_file_dir(mid),
             self.classes_dir
         ])
 
-        soot = Soot(self.project_dir, with_override_file_classpath)
-        soot.exec(self.target['class'], os.path.join(override_file_dir, 'opt'),
+    def run_soot(self, mid="ORIGINAL"):
+        soot = Soot(self.project_dir, self._classpath(mid))
+        soot.exec(self.target['class'],
+                  os.path.join(self._override_file_dir(mid), 'opt'),
                   jimple=False)
 
+    def run_soot_all(self, mids):
+        soot = Soot(self.project_dir, self.classes_dir)
+        return soot.exec_all(
+            [(self._classpath(mid), self.target['class'],
+              os.path.join(self._override_file_dir(mid), 'opt'))
+             for mid in mids], jimple=False)
+
     def run(self, mutant):
-        original_file = self.optimized_file()
-        mutant_file = self.optimized_file(mutant.id)
+        return mutant.id in self.run_all([mutant])
+
+    def run_all(self, mutants):
+        # Optimized classes are compared by digest. The digests are cached
+        # with the digest of the class they came from, so only new or
+        # changed versions go through Soot.
+        if not mutants:
+            return set()
+
+        cache = self._read_cache()
+        mids = [mid for mid in ['ORIGINAL'] + [m.id for m in mutants]
+                if mid not in cache
+                or cache[mid]['input'] != self._input_digest(mid)]
+
+        if mids:
+            logger.debug('Optimizing %i classes with Soot.', len(mids))
+            for mid in mids:
+                if os.path.exists(self.optimized_file(mid)):
+                    os.remove(self.optimized_file(mid))
+
+            completed = True
+            try:
+                self.run_soot_all(mids)
+            except (subprocess.CalledProcessError,
+                    subprocess.TimeoutExpired):
+                logger.warning('Soot failed for target %s.',
+                               self.target['directory'], exc_info=True)
+                completed = False
 
-        if not os.path.exists(original_file):
-            self.run_soot()
+            for mid in mids:
+                cache[mid] = {'input': self._input_digest(mid),
+                              'output': _digest(self.optimized_file(mid))}
 
-        self.run_soot(mutant.id)
+            # An interrupted batch is tried again in the next run.
+            if completed:
+                self._write_cache(cache)
 
-        return TCE._diff(original_file, mutant_file)
+        original = cache['ORIGINAL']['output']
 
-    @staticmethod
-    def _diff(a, b):
-        try:
-            subprocess.check_output("diff {0} {1}".format(a, b), shell=True)
-            return True
-        except subprocess.CalledProcessError:
-            return False
+        return {m.id for m in mutants if original is not None
+                and cache[m.id]['output'] == original}
+
+    def _input_digest(self, mid):
+        return _digest(os.path.join(
+            self._override_file_dir(mid),
+            class_to_dir(self.target['class']) + '.class'))
+
+    def _cache_dir(self):
+        return os.path.join(self.options.mutants, self.target['directory'])
+
+    def _read_cache(self):
+        cache_file = os.path.join(self._cache_dir(), CACHE_FILE + '.json')
+
+        if os.path.exists(cache_file):
+            return read_json(cache_file)
+
+        return {}
+
+    def _write_cache(self, cache):
+        write_json(cache, CACHE_FILE, self._cache_dir())
 
     def optimized_file(self, mid="ORIGINAL"):
         return os.path.abspath(
             os.path.join(self.options.mutants, self.target['directory'], mid,
                          'opt', class_to_dir(self.target['class']) + '.class'))
+
+
+def _digest(path):
+    if not os.path.exists(path):
+        return None
+
+    with open(path, 'rb') as f:
+        digest = hashlib.sha256(f.read()).hexdigest()
+        f.close()
+
+    return digest
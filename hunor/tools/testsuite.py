@@ -1,9 +1,12 @@
 import os
 import copy
 
+from concurrent.futures import ThreadPoolExecutor
+
 from hunor.tools.randoop import Randoop
 from hunor.tools.evosuite import Evosuite
-from hunor.utils import read_json, write_json
+from hunor.tools.suite_cache import SuiteCache
+from hunor.utils import read_json, update_json
 
 
 class TestSuiteResult:
@@ -43,14 +46,15 @@ class TestSuiteResult:
         return self.coverage_tests.intersection(self.fail_tests)
 
     def copy_without_excluded(self, excluded):
-        result = copy.deepcopy(self)
+        result = copy.copy(self)
         result.fail_tests = result.fail_tests.difference(excluded)
         return result
 
 
 def generate_test_suites(jdk, classpath, config_file, sut_class, output,
                          is_randoop_disabled, is_evosuite_disabled,
-                         project_dir, suites_evosuite, suites_randoop, junit):
+                         project_dir, suites_evosuite, suites_randoop, junit,
+                         jobs=1, suite_cache=None):
 
     reuse_tests = os.path.join(output, '..')
     saved_suites = {}
@@ -68,7 +72,8 @@ def generate_test_suites(jdk, classpath, config_file, sut_class, output,
     if sut_class in saved_suites.keys():
         valid_suites = []
         for s in saved_suites[sut_class]:
-            if os.path.exists(s['source_dir']):
+            if (os.path.exists(s['source_dir'])
+                    and _is_fresh(s, classpath, config_file, sut_class)):
                 valid_suites.append(s)
         if len(valid_suites) > 0:
             saved_suites[sut_class] = valid_suites
@@ -78,82 +83,33 @@ def generate_test_suites(jdk, classpath, config_file, sut_class, output,
     if sut_class not in saved_suites.keys():
         saved_suites[sut_class] = []
 
+        suites = []
         if not is_randoop_disabled:
-            for i in range(suites_randoop):
-                test_suite_name = '{0}_{1}'.format('randoop', i + 1)
-                randoop = Randoop(jdk, classpath, config_file, tests_dir,
-                                  sut_class, project_dir,
-                                  test_suite_name=test_suite_name)
-                source_dir, classes_dir, classes = randoop.generate()
-
-                test_suite = TestSuiteResult(
-                    tid=test_suite_name,
-                    source_dir=source_dir,
-                    classes_dir=classes_dir,
-                    classes=classes,
-                    prefix='{0}_{1}'.format('RAN', i + 1)
-                )
-
-                checked_test_suites = junit.run_test_suites(
-                    {test_suite_name: test_suite}, classpath)
-
-                if (not checked_test_suites[test_suite_name].maybe_in_loop
-                        and not checked_test_suites[test_suite_name].fail
-                        and checked_test_suites[test_suite_name].is_valid):
-                    test_suites[test_suite_name] = test_suite
-
-                    saved_suites[sut_class].append({
-                        'tid': test_suite_name,
-                        'source_dir': source_dir,
-                        'classes_dir': classes_dir,
-                        'classes': classes,
-                        'prefix': '{0}_{1}'.format('RAN', i + 1)
-                    })
-                else:
-                    print('# ERROR: invalid suite. FAIL: {0}, LOOP: {1}, '
-                          'FAILED TESTES: {2}'.format(
-                            checked_test_suites[test_suite_name].fail,
-                            checked_test_suites[test_suite_name].maybe_in_loop,
-                            checked_test_suites[test_suite_name].fail_tests
-                          ))
-
+            suites += [('randoop', 'RAN', i + 1)
+                       for i in range(suites_randoop)]
         if not is_evosuite_disabled:
-            for i in range(suites_evosuite):
-                test_suite_name = '{0}_{1}'.format('evosuite', i + 1)
-                evosuite = Evosuite(jdk, classpath, config_file, tests_dir,
-                                    sut_class, test_suite_name=test_suite_name)
-                source_dir, classes_dir, classes = evosuite.generate()
-
-                test_suite = TestSuiteResult(
-                    tid=test_suite_name,
-                    source_dir=source_dir,
-                    classes_dir=classes_dir,
-                    classes=classes,
-                    prefix='{0}_{1}'.format('EVO', i + 1)
-                )
-
-                checked_test_suites = junit.run_test_suites(
-                    {test_suite_name: test_suite}, classpath)
-
-                if (not checked_test_suites[test_suite_name].maybe_in_loop
-                        and not checked_test_suites[test_suite_name].fail
-                        and checked_test_suites[test_suite_name].is_valid):
-                    test_suites[test_suite_name] = test_suite
-
+            suites += [('evosuite', 'EVO', i + 1)
+                       for i in range(suites_evosuite)]
+
+        def _generate(suite):
+            return _generate_test_suite(jdk, classpath, config_file,
+                                        tests_dir, sut_class, project_dir,
+                                        junit, suite_cache, *suite)
+
+        # Each suite has its own output dir, so generation and validation of
+        # different suites are independent.
+        with ThreadPoolExecutor(max_workers=max(jobs, 1)) as executor:
+            for test_suite, key in executor.map(_generate, suites):
+                if test_suite is not None:
+                    test_suites[test_suite.id] = test_suite
                     saved_suites[sut_class].append({
-                        'tid': test_suite_name,
-                        'source_dir': source_dir,
-                        'classes_dir': classes_dir,
-                        'classes': classes,
-                        'prefix': '{0}_{1}'.format('EVO', i + 1)
+                        'tid': test_suite.id,
+                        'source_dir': test_suite.source_dir,
+                        'classes_dir': test_suite.classes_dir,
+                        'classes': test_suite.classes,
+                        'prefix': test_suite.prefix,
+                        'key': key
                     })
-                else:
-                    print('# ERROR: invalid suite. FAIL: {0}, LOOP: {1}, '
-                          'FAILED TESTES: {2}'.format(
-                            checked_test_suites[test_suite_name].fail,
-                            checked_test_suites[test_suite_name].maybe_in_loop,
-                            checked_test_suites[test_suite_name].fail_tests
-                          ))
     else:
         for t in saved_suites[sut_class]:
             test_suites[t['tid']] = TestSuiteResult(
@@ -165,6 +121,87 @@ def generate_test_suites(jdk, classpath, config_file, sut_class, output,
             )
 
     if reuse_tests:
-        write_json(saved_suites, name='saved_suites', output_dir=reuse_tests)
+        def _update(saved):
+            saved[sut_class] = saved_suites[sut_class]
+            return saved
+
+        update_json(os.path.join(reuse_tests, 'saved_suites.json'), _update)
 
     return test_suites
+
+
+def _is_fresh(saved_suite, classpath, config_file, sut_class):
+    if saved_suite.get('key') is None:
+        return True
+
+    tool, seed = saved_suite['tid'].rsplit('_', 1)
+
+    return saved_suite['key'] == SuiteCache.key(classpath, config_file,
+                                                sut_class, tool, seed)
+
+
+def _generate_test_suite(jdk, classpath, config_file, tests_dir, sut_class,
+                         project_dir, junit, suite_cache, name, prefix, i):
+    test_suite_name = '{0}_{1}'.format(name, i)
+    suite_dir = os.path.join(tests_dir, test_suite_name)
+    key = None
+
+    if suite_cache is not None:
+        key = SuiteCache.key(classpath, config_file, sut_class, name, i)
+        entry = suite_cache.get(key, suite_dir)
+
+        if entry is not None:
+            print('TEST SUITE: {0} found in cache.'.format(test_suite_name))
+            if not entry['is_valid']:
+                return None, key
+            return TestSuiteResult(
+                tid=test_suite_name,
+                source_dir=os.path.join(suite_dir, entry['source_dir']),
+                classes_dir=os.path.join(suite_dir, entry['classes_dir']),
+                classes=entry['classes'],
+                prefix='{0}_{1}'.format(prefix, i)
+            ), key
+
+    if name == 'randoop':
+        generator = Randoop(jdk, classpath, config_file, tests_dir, sut_class,
+                            project_dir, test_suite_name=test_suite_name)
+    else:
+        generator = Evosuite(jdk, classpath, config_file, tests_dir,
+                             sut_class, test_suite_name=test_suite_name)
+
+    source_dir, classes_dir, classes = generator.generate()
+
+    test_suite = TestSuiteResult(
+        tid=test_suite_name,
+        source_dir=source_dir,
+        classes_dir=classes_dir,
+        classes=classes,
+        prefix='{0}_{1}'.format(prefix, i)
+    )
+
+    checked_test_suites = junit.run_test_suites(
+        {test_suite_name: test_suite}, classpath)
+
+    is_valid = (not checked_test_suites[test_suite_name].maybe_in_loop
+                and not checked_test_suites[test_suite_name].fail
+                and checked_test_suites[test_suite_name].is_valid)
+
+    if suite_cache is not None:
+        suite_cache.put(key, suite_dir, {
+            'source_dir': os.path.relpath(source_dir, suite_dir),
+            'classes_dir': os.path.relpath(classes_dir, suite_dir),
+            'classes': classes,
+            'is_valid': is_valid
+        })
+
+    if is_valid:
+        return test_suite, key
+
+    print('# ERROR: invalid suite. FAIL: {0}, LOOP: {1}, '
+          'FAILED TESTES: {2}'.format(
+            checked_test_suites[test_suite_name].fail,
+            checked_test_suites[test_suite_name].maybe_in_loop,
+            checked_test_suites[test_suite_name].fail_tests
+          ))
+
+    return None, key
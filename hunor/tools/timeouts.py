@@ -0,0 +1,43 @@
+import math
+
+
+FACTOR = 10
+PERCENTILE = 99
+TEST_FLOOR = 2
+CLASS_FLOOR = 10
+
+
+class TimeoutProfile:
+
+    def __init__(self, factor=FACTOR, test_floor=TEST_FLOOR,
+                 class_floor=CLASS_FLOOR):
+        self.factor = factor
+        self.test_floor = test_floor
+        self.class_floor = class_floor
+        self.tests = {}
+        self.classes = {}
+
+    def record_test(self, key, run_time):
+        self.tests[key] = max(self.tests.get(key, 0), run_time)
+
+    def record_class(self, key, run_time):
+        self.classes[key] = max(self.classes.get(key, 0), run_time)
+
+    def test_timeout(self):
+        if not self.tests:
+            return None
+
+        return (self.factor * percentile(self.tests.values(), PERCENTILE)
+                + self.test_floor)
+
+    def class_timeout(self, key, default):
+        if key not in self.classes:
+            return default
+
+        return min(self.factor * self.classes[key] + self.class_floor,
+                   default)
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[max(math.ceil(p / 100 * len(values)) - 1, 0)]
@@ -0,0 +1,259 @@
+import os
+import re
+import json
+import time
+import queue
+import shutil
+import hashlib
+import logging
+import tempfile
+import threading
+import subprocess
+
+from collections import namedtuple
+
+from hunor.tools.bin import JUNIT, HAMCREST, WORKER
+from hunor.utils import generate_classpath
+
+
+logger = logging.getLogger()
+
+MAIN_CLASS = 'HunorWorker'
+COMPILE_TIMEOUT = 60
+SEP = '\t'
+_ESCAPES = {'n': '\n', 't': '\t'}
+
+WorkerTest = namedtuple('WorkerTest', ['test_class', 'method', 'status',
+                                       'run_time', 'exception'])
+WorkerResult = namedtuple('WorkerResult', ['run_count', 'fail_count', 'tests',
+                                           'run_time', 'timeout'])
+CompileResult = namedtuple('CompileResult', ['success', 'diagnostics'])
+
+
+class Worker:
+
+    def __init__(self, java):
+        self.java = java
+        self.process = None
+        self.lines = None
+        self.fail_fast = False
+        self.test_timeout = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def classes_dir(java):
+        return compiled_classes_dir(java, WORKER, [JUNIT, HAMCREST])
+
+    def start(self):
+        classpath = generate_classpath([Worker.classes_dir(self.java), JUNIT,
+                                        HAMCREST])
+
+        self.process = subprocess.Popen(
+            [self.java.java, '-classpath', classpath, MAIN_CLASS],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL, universal_newlines=True, bufsize=1)
+        self.lines = queue.Queue()
+        self.fail_fast = False
+        self.test_timeout = 0
+
+        reader = threading.Thread(target=Worker._read,
+                                  args=(self.process.stdout, self.lines))
+        reader.daemon = True
+        reader.start()
+
+        logger.debug('JUnit worker started (pid %i).', self.process.pid)
+
+    @staticmethod
+    def _read(stream, lines):
+        for line in stream:
+            lines.put(line.rstrip('\n'))
+        lines.put(None)
+
+    def is_alive(self):
+        return self.process is not None and self.process.poll() is None
+
+    def run(self, classpath, test_classes, timeout, mutant=None,
+            fail_fast=False, test_timeout=None):
+        with self._lock:
+            if not self.is_alive():
+                self.start()
+
+            if fail_fast != self.fail_fast:
+                self._send('failfast', 'on' if fail_fast else 'off')
+                self.fail_fast = fail_fast
+
+            # The worker stops tests running longer than this, in millis.
+            test_timeout = int((test_timeout or 0) * 1000)
+            if test_timeout != self.test_timeout:
+                self._send('timeout', str(test_timeout))
+                self.test_timeout = test_timeout
+
+            start = time.time()
+            if mutant is None:
+                self._send('run', classpath, *test_classes)
+            else:
+                self._send('mutant', str(mutant), classpath, *test_classes)
+
+            tests = []
+            try:
+                while True:
+                    remaining = timeout - (time.time() - start)
+                    line = self.lines.get(timeout=max(remaining, 0))
+
+                    if line is None:
+                        self._kill()
+                        raise WorkerException('JUnit worker died.')
+
+                    fields = line.split(SEP)
+
+                    if fields[0] == 'test':
+                        tests.append(WorkerTest(fields[1], fields[2],
+                                                fields[3],
+                                                int(fields[4]) / 1000,
+                                                fields[5] or None))
+                    elif fields[0] == 'done':
+                        return WorkerResult(int(fields[1]), int(fields[2]),
+                                            tests, int(fields[3]) / 1000,
+                                            False)
+                    elif fields[0] == 'error':
+                        raise WorkerException(fields[1])
+            except queue.Empty:
+                logger.warning('JUnit worker timed out. %i seconds', timeout)
+                self._kill()
+                return WorkerResult(0, 0, tests, time.time() - start, True)
+
+    def compile(self, classpath, output_dir, java_files, timeout):
+        with self._lock:
+            if not self.is_alive():
+                self.start()
+
+            start = time.time()
+            self._send('compile', classpath, output_dir, *java_files)
+
+            diagnostics = []
+            try:
+                while True:
+                    remaining = timeout - (time.time() - start)
+                    line = self.lines.get(timeout=max(remaining, 0))
+
+                    if line is None:
+                        self._kill()
+                        raise WorkerException('JUnit worker died.')
+
+                    fields = line.split(SEP)
+
+                    if fields[0] == 'diagnostic':
+                        diagnostics.append(_unescape(fields[1]))
+                    elif fields[0] == 'compiled':
+                        return CompileResult(fields[1] == 'ok', diagnostics)
+                    elif fields[0] == 'error':
+                        raise WorkerException(fields[1])
+            except queue.Empty:
+                logger.warning('Compilation timed out. %i seconds', timeout)
+                self._kill()
+                diagnostics.append(
+                    'compilation timed out after {0} seconds'.format(timeout))
+                return CompileResult(False, diagnostics)
+
+    def _send(self, *fields):
+        try:
+            self.process.stdin.write(SEP.join(fields) + '\n')
+            self.process.stdin.flush()
+        except OSError:
+            # Died after the last request, stdin is a broken pipe.
+            self._kill()
+            raise WorkerException('JUnit worker died.')
+
+    def _kill(self):
+        if self.process is not None:
+            self.process.kill()
+            self.process.wait()
+            self.process = None
+
+    def close(self):
+        with self._lock:
+            if self.is_alive():
+                try:
+                    self._send('quit')
+                    self.process.wait(timeout=COMPILE_TIMEOUT)
+                except (WorkerException, subprocess.TimeoutExpired):
+                    self._kill()
+            self.process = None
+
+
+def _unescape(text):
+    # HunorWorker escapes each diagnostic to keep it on one protocol line.
+    return re.sub(r'\\(.)', lambda m: _ESCAPES.get(m.group(1), m.group(1)),
+                  text)
+
+
+def read_results(path, run_time):
+    # Written by the worker main with hunor.results, one JSON object a line.
+    tests = []
+    done = None
+
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            try:
+                event = json.loads(line)
+            except ValueError:
+                # Last line cut short by a killed JVM.
+                logger.warning('Invalid JUnit result line: %s', line.strip())
+                continue
+
+            if event.get('event') == 'test':
+                tests.append(WorkerTest(event['class'], event['method'],
+                                        event['status'],
+                                        event['time'] / 1000,
+                                        event['exception']))
+            elif event.get('event') == 'done':
+                done = event
+
+    if done is None:
+        return WorkerResult(
+            sum(1 for t in tests if t.status != 'ignored'),
+            sum(1 for t in tests if t.status in ('fail', 'timeout')),
+            tests, run_time, False)
+
+    return WorkerResult(done['run'], done['fail'], tests,
+                        done['time'] / 1000, False)
+
+
+def compiled_classes_dir(java, source, classpath):
+    # Classes compiled by one JDK may not load in an older one, the compiler
+    # is part of the key.
+    digest = hashlib.sha1(os.path.realpath(java.javac).encode('utf-8'))
+    with open(source, 'rb') as f:
+        digest.update(f.read())
+    digest = digest.hexdigest()[:12]
+
+    classes_dir = os.path.join(os.path.expanduser('~'), '.hunor',
+                               'worker', digest)
+
+    if not os.path.exists(classes_dir):
+        _compile(java, source, classpath, classes_dir)
+
+    return classes_dir
+
+
+def _compile(java, source, classpath, classes_dir):
+    os.makedirs(os.path.dirname(classes_dir), exist_ok=True)
+    tmp_dir = tempfile.mkdtemp(dir=os.path.dirname(classes_dir))
+
+    try:
+        subprocess.check_output(
+            [java.javac, '-classpath', generate_classpath(classpath),
+             '-d', tmp_dir, source],
+            stderr=subprocess.STDOUT, timeout=COMPILE_TIMEOUT)
+        os.rename(tmp_dir, classes_dir)
+    except OSError:
+        # Another process compiled the same source first.
+        if not os.path.exists(classes_dir):
+            raise
+    finally:
+        if os.path.exists(tmp_dir):
+            shutil.rmtree(tmp_dir)
+
+
+class WorkerException(Exception):
+    pass
@@ -1,6 +1,8 @@
 import os
 import re
 import json
+import fcntl
+import tempfile
 
 
 def get_java_files(path):
@@ -53,6 +55,27 @@ def read_json(path):
     return config(path)
 
 
+def update_json(path, update):
+    with open(path + '.lock', 'w') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+
+        obj = update(read_json(path) if os.path.exists(path) else {})
+
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path) or '.',
+                                   suffix='.json')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                f.write(json.dumps(obj, indent=2))
+            os.replace(tmp, path)
+        except BaseException:
+            os.remove(tmp)
+            raise
+
+        fcntl.flock(lock, fcntl.LOCK_UN)
+
+    return obj
+
+
 def list_to_set(l):
     s = set()
     for e in l: